@@ -0,0 +1,80 @@
+"""
+Benchmark: pure-Python vs NumPy analysis engine on a numeric-heavy table.
+
+Usage:
+    python benchmarks/bench_analysis.py [--rows N] [--cols C] [--repeat R]
+
+Prints best-of-R wall times for both engines in the same quantile mode (none, then the KLL
+sketch both engines use):
+- end-to-end: analysis.analyze() on the row dicts, including column extraction and type
+  inference, which both engines share;
+- kernel: one column's ColumnState update on values already pulled out of the rows, after a
+  first small batch has committed the column's dtype (the steady state of a long run).
+"""
+
+import argparse
+import random
+import time
+from typing import Any
+
+from mfda import analysis
+
+
+def make_records(rows: int, cols: int, seed: int = 0) -> list[dict[str, Any]]:
+    rng = random.Random(seed)  # noqa: S311 - synthetic data
+    names = [f"c{i}" for i in range(cols)]
+    return [
+        {n: (None if rng.random() < 0.05 else rng.gauss(100, 15)) for n in names}
+        for _ in range(rows)
+    ]
+
+
+def best_of(repeat: int, fn: Any) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def end_to_end(records: list[dict[str, Any]], options: analysis.AnalysisOptions) -> None:
+    analysis.finalize(analysis.analyze_partial(records, options))  # what analyze() runs
+
+
+def kernel(column: list[Any], options: analysis.AnalysisOptions) -> None:
+    state = analysis.ColumnState.create(options)
+    state.update(column[:100])  # commits the dtype, as the first batch of a run does
+    if options.engine == "numpy":
+        state.update_numpy(column)
+    else:
+        state.update(column)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    records = make_records(args.rows, args.cols)
+    column = [r["c0"] for r in records]
+    print(f"rows={args.rows} cols={args.cols} (5% nulls, float64)")
+
+    for qs in ((), (0.5, 0.99)):
+        label = "no quantiles" if not qs else "quantiles " + ",".join(map(str, qs))
+        times = {}
+        for engine in analysis.ENGINES:
+            options = analysis.AnalysisOptions(quantiles=qs, engine=engine)
+            full = best_of(args.repeat, lambda o=options: end_to_end(records, o))
+            kern = best_of(args.repeat, lambda o=options: kernel(column, o))
+            times[engine] = (full, kern)
+        (py, kp), (vec, kv) = times["python"], times["numpy"]
+        print(f"[{label}]")
+        print(f"  end-to-end python={py:.3f}s numpy={vec:.3f}s speedup={py / vec:.1f}x")
+        print(f"  kernel     python={kp:.4f}s numpy={kv:.4f}s speedup={kp / kv:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,73 @@
 Analysis layer
 
 Computes small, deterministic summaries:
-- Numeric columns: count, nulls, distinct, min, max, mean
-- Categorical columns: count, nulls, distinct, top-k (by frequency desc, then value asc)
+- Numeric columns: count, nulls, distinct, min, max, mean, std, optional quantiles
+- Categorical columns: count, nulls, distinct, top-k (by frequency desc, then value asc);
+  inferred bool columns are categorical (true/false counts)
+- Temporal columns (inferred datetime): min/max (UTC), span, largest gap between consecutive
+  rows, out-of-order rows, and rows per time bucket (`temporal_bucket` seconds)
 
 Notes:
 - Null policy: treat missing/None as nulls and exclude them from numeric stats.
 - Distinct excludes nulls.
 - Top-k ties broken by value (ascending).
+- infer_types=True (default) classifies each column once from a probe sample of its first
+  batch (see dtypes.py) and parses values to that dtype, so string-encoded numbers (CSV) get
+  numeric stats. Values that fail to parse are reported as `invalid`, separate from nulls.
+  Partials of the same rows reuse that dtype (analyze_partial(column_types=...); worker
+  shards are classified before splitting), so the result does not depend on sharding.
+  Datetime columns are summarized as temporal instead of building a value Counter. When a
+  datetime shard merges with a numeric or text shard the column becomes a string column
+  with counts only: its distinct count and top-k are unavailable (None / []).
+- top_k_mode="exact" counts every value and selects top-k with a heap;
+  top_k_mode="approx" uses fixed-memory sketches (Space-Saving + Count-Min for top-k,
+  HyperLogLog for distinct), and reports `top_error` as the max overcount of any top entry.
+- Quantiles (e.g. p50/p99) come from a KLL sketch: bounded memory, nearest-rank, with rank
+  error controlled by `quantile_k` (exact while a column has fewer than `quantile_k` values).
+- engine="numpy" computes numeric columns with vectorized reductions over int64/float64 arrays
+  and keeps exact distinct counts and top-k in sorted value/count arrays (ArrayCounter);
+  approx mode feeds the sketches one np.unique count per value, and quantiles come from the
+  same KLL sketch, fed whole sorted batches (update_sorted). Batches that already hold
+  ints/floats of the column's committed dtype are not parsed value by value. Results match
+  the python engine except for float rounding and KLL/Space-Saving estimates (same bounds):
+  batches with a float NaN or ints beyond int64 take the python path.
+
+Mergeable partials:
+- Each column accumulates into a ColumnState (counts, sum, M2, min/max, frequency counter or
+  sketches). States from different row shards merge exactly (counts, min/max, exact top-k) or
+  within the sketches' bounds (approx top-k, quantiles).
+- analyze_partial() -> PartialAnalysis.merge() -> finalize() is the same pipeline analyze()
+  runs; workers > 1 fans row shards out to a process pool and reduces the partials in order.
+  Callers that analyze many batches pass one worker_pool() to every call as `executor`.
+
+Correlation:
+- correlation() builds a Pearson or Spearman matrix over numeric columns with pairwise-complete
+  null handling. Co-moments (pair counts, sums, sums of squares, cross products) are
+  accumulated per batch with matrix products in a mergeable CorrelationState, so the cost is
+  a few BLAS calls per batch instead of a Python loop per column pair.
+- Spearman ranks each column over all of its non-null values (average ranks for ties), then
+  correlates the ranks; ranks are not recomputed per pair.
 """
 
+import functools
+import math
 from collections import Counter
-from dataclasses import dataclass
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Any
 
+import numpy as np
+
+from mfda import dtypes
+from mfda.sketches import HeavyHitters, KLLSketch, top_k_exact
+
+TOP_K_MODES = ("exact", "approx")
+ENGINES = ("python", "numpy")
+CORRELATION_METHODS = ("pearson", "spearman")
+
 
 @dataclass
 class NumericSummary:
@@ -22,9 +76,13 @@ class NumericSummary:
     count: int  # non-null count
     nulls: int
     distinct: int  # excluding nulls
-    min: float | int
-    max: float | int
-    mean: float
+    min: float | int | None  # None when the column has no non-null values
+    max: float | int | None
+    mean: float | None
+    quantiles: dict[float, float | None] = field(default_factory=dict)
+    std: float | None = None  # sample standard deviation; None with fewer than 2 values
+    dtype: str | None = None  # logical dtype when types are inferred
+    invalid: int = 0  # non-null values that failed to parse as `dtype`
 
 
 @dataclass
@@ -32,8 +90,31 @@ class CategoricalSummary:
     column: str
     count: int  # non-null count
     nulls: int
-    distinct: int  # excluding nulls
+    distinct: int | None  # excluding nulls; None when values were not counted (see Notes)
     top: list[tuple[str, int]]  # sorted by freq desc, then value asc
+    top_error: int = 0  # approx mode: each top count is at most this much above the true count
+    dtype: str | None = None
+    invalid: int = 0
+
+
+@dataclass
+class TemporalSummary:
+    column: str
+    count: int  # non-null count
+    nulls: int
+    min: datetime | None  # UTC
+    max: datetime | None
+    span_seconds: float | None
+    max_gap_seconds: float | None  # largest jump forward between consecutive rows (input order)
+    out_of_order: int  # rows earlier than the row before them
+    bucket_seconds: int
+    buckets: int  # buckets from min to max inclusive, empty ones included
+    empty_buckets: int
+    rows_per_bucket_min: int
+    rows_per_bucket_mean: float | None
+    rows_per_bucket_max: int
+    dtype: str = "datetime"
+    invalid: int = 0
 
 
 @dataclass
@@ -42,49 +123,722 @@ class AnalysisReport:
     columns: int
     numeric: list[NumericSummary]
     categorical: list[CategoricalSummary]
+    temporal: list[TemporalSummary] = field(default_factory=list)
 
 
-def analyze(
-    records: list[dict[str, Any]],
-    *,
-    top_k: int = 3,
-) -> AnalysisReport:
-    rows = len(records)
-    columns = len({k for r in records for k in r})
+@dataclass(frozen=True)
+class AnalysisOptions:
+    top_k_mode: str = "exact"
+    top_k_capacity: int = 1024
+    quantiles: tuple[float, ...] = ()
+    quantile_k: int = 200
+    engine: str = "python"
+    infer_types: bool = True
+    temporal_bucket: int = 3600  # seconds per rows-per-bucket bin of temporal columns
 
-    numeric_stats = []
-    categorical_stats = []
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "quantiles", tuple(self.quantiles))
+        if self.temporal_bucket < 1:
+            raise ValueError("temporal_bucket must be >= 1 second")
+        if self.top_k_mode not in TOP_K_MODES:
+            raise ValueError(f"Unknown top-k mode: {self.top_k_mode}")
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unknown analysis engine: {self.engine}")
+        if any(not 0 <= q <= 1 for q in self.quantiles):
+            raise ValueError("quantiles must be between 0 and 1")
 
-    all_columns = {k for r in records for k in r}
-    for col in all_columns:
-        values = [r.get(col) for r in records]
+
+class TemporalState:
+    """Mergeable timestamp statistics (UTC epoch seconds); merge partials in input order."""
+
+    def __init__(self, bucket: int = 3600) -> None:
+        self.bucket = bucket
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.first: float | None = None
+        self.last: float | None = None
+        self.max_gap = 0.0
+        self.out_of_order = 0
+        self.buckets: Counter[int] = Counter()
+
+    def _gaps(self, diffs: Any) -> None:
+        if diffs.size:
+            self.max_gap = max(self.max_gap, float(diffs.max()))
+            self.out_of_order += int((diffs < 0).sum())
+
+    def update(self, values: Sequence[datetime]) -> None:
+        if not values:
+            return
+        ts = np.fromiter((v.timestamp() for v in values), dtype=np.float64, count=len(values))
+        head = ts if self.last is None else np.concatenate(([self.last], ts))
+        self._gaps(np.diff(head))
+        if self.first is None:
+            self.first = float(ts[0])
+        self.last = float(ts[-1])
+        self.min = min(self.min, float(ts.min()))
+        self.max = max(self.max, float(ts.max()))
+        keys, counts = np.unique(np.floor_divide(ts, self.bucket), return_counts=True)
+        self.buckets.update(dict(zip(keys.astype(np.int64).tolist(), counts.tolist(), strict=True)))
+        self.count += len(values)
+
+    def merge(self, other: "TemporalState") -> None:
+        if other.first is None or other.last is None:
+            return
+        if self.last is not None:
+            self._gaps(np.array([other.first - self.last]))
+        else:
+            self.first = other.first
+        self.last = other.last
+        self.max_gap = max(self.max_gap, other.max_gap)
+        self.out_of_order += other.out_of_order
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.buckets.update(other.buckets)
+        self.count += other.count
+
+    def summarize(self, column: str, nulls: int, invalid: int) -> TemporalSummary:
+        if not self.count:
+            return TemporalSummary(
+                column,
+                0,
+                nulls,
+                None,
+                None,
+                None,
+                None,
+                0,
+                self.bucket,
+                0,
+                0,
+                0,
+                None,
+                0,
+                invalid=invalid,
+            )
+        span = int(self.max // self.bucket - self.min // self.bucket) + 1
+        empty = span - len(self.buckets)
+        return TemporalSummary(
+            column,
+            self.count,
+            nulls,
+            datetime.fromtimestamp(self.min, timezone.utc),
+            datetime.fromtimestamp(self.max, timezone.utc),
+            self.max - self.min,
+            self.max_gap if self.count > 1 else None,
+            self.out_of_order,
+            self.bucket,
+            span,
+            empty,
+            0 if empty else min(self.buckets.values()),
+            self.count / span,
+            max(self.buckets.values()),
+            invalid=invalid,
+        )
+
+
+class ArrayCounter:
+    """Exact value counts of numeric batches as sorted NumPy arrays (the numpy engine's Counter).
+
+    Batches are counted with np.unique and kept pending until they hold as many values as
+    the counted ones (at least 65536), then folded in with one np.unique + bincount.
+    """
+
+    def __init__(self, dtype: Any) -> None:
+        self.dtype = np.dtype(dtype)
+        self.values = np.empty(0, dtype=self.dtype)
+        self.counts = np.empty(0, dtype=np.int64)
+        self._pending: list[tuple[Any, Any]] = []
+        self._pending_size = 0
+
+    def _add(self, values: Any, counts: Any) -> None:
+        self._pending.append((values, counts))
+        self._pending_size += values.size
+        if self._pending_size >= max(self.values.size, 1 << 16):
+            self._compact()
+
+    def _compact(self) -> None:
+        if not self._pending:
+            return
+        values = np.concatenate([self.values] + [v for v, _ in self._pending])
+        counts = np.concatenate([self.counts] + [c for _, c in self._pending])
+        self.values, inverse = np.unique(values, return_inverse=True)
+        self.counts = np.bincount(inverse, weights=counts, minlength=self.values.size)
+        self.counts = self.counts.astype(np.int64)
+        self._pending, self._pending_size = [], 0
+
+    def update(self, data: Any) -> None:
+        self._add(*np.unique(data, return_counts=True))
+
+    def merge(self, other: "ArrayCounter") -> None:
+        other._compact()
+        self._add(other.values, other.counts)
+
+    def approx_bytes(self) -> int:
+        return self.values.nbytes + self.counts.nbytes + 16 * self._pending_size
+
+    def __len__(self) -> int:
+        self._compact()
+        return int(self.values.size)
+
+    def items(self) -> Iterable[tuple[Any, int]]:
+        self._compact()
+        return zip(self.values.tolist(), self.counts.tolist(), strict=True)
+
+    def top(self, k: int) -> list[tuple[Any, int]]:
+        self._compact()
+        keep = slice(None)
+        if 0 < k < self.values.size:
+            keep = self.counts >= np.partition(self.counts, -k)[-k]
+        candidates = zip(self.values[keep].tolist(), self.counts[keep].tolist(), strict=True)
+        return top_k_exact(dict(candidates), k)
+
+
+@dataclass
+class ColumnState:
+    """Mergeable partial statistics for one column over some subset of rows."""
+
+    count: int = 0  # non-null values seen
+    numeric: bool = True  # every non-null value so far is int/float
+    total: float = 0.0
+    m2: float = 0.0  # sum of squared deviations from the mean
+    min: Any = None
+    max: Any = None
+    freq: Counter[Any] | None = None  # exact mode
+    array_freq: ArrayCounter | None = None  # exact mode, numpy engine: rows after freq's
+    heavy: HeavyHitters | None = None  # approx mode
+    kll: KLLSketch | None = None  # quantiles
+    typed: bool = False  # classify and parse values (options.infer_types)
+    dtype: str | None = None  # committed on the first batch with non-null values
+    invalid: int = 0  # values that failed to parse as dtype
+    datetime_format: str = "iso"
+    temporal_bucket: int = 3600
+    temporal: TemporalState | None = None  # datetime columns (replaces freq/heavy)
+
+    @classmethod
+    def create(cls, options: AnalysisOptions) -> "ColumnState":
+        state = cls()
+        if options.top_k_mode == "approx":
+            state.heavy = HeavyHitters(options.top_k_capacity)
+        else:
+            state.freq = Counter()
+        if options.quantiles:
+            state.kll = KLLSketch(options.quantile_k)
+        state.typed = options.infer_types
+        state.temporal_bucket = options.temporal_bucket
+        return state
+
+    def _add_moments(self, n: int, total: float, m2: float, lo: Any, hi: Any) -> None:
+        # Chan et al. pairwise update of (count, sum, M2)
+        if self.count:
+            delta = total / n - self.total / self.count
+            self.m2 += m2 + delta * delta * self.count * n / (self.count + n)
+            self.min = min(self.min, lo)
+            self.max = max(self.max, hi)
+        else:
+            self.m2 = m2
+            self.min, self.max = lo, hi
+        self.total += total
+
+    def _drop_numeric(self) -> None:
+        self.numeric = False
+        self.kll = None
+
+    def commit(self, dtype: str, datetime_format: str = "iso") -> None:
+        """Parse values as `dtype` from now on, e.g. as decided by an earlier partial."""
+        self.dtype = dtype
+        if dtype == "bool":
+            self._drop_numeric()  # summarized as true/false counts, not as 0/1 numbers
+        if dtype == "datetime":
+            self.datetime_format = datetime_format
+            self._start_temporal(TemporalState(self.temporal_bucket))
+
+    def classify(self, values: list[Any]) -> None:
+        """Commit the dtype the probe of `values` classifies as (none when all null)."""
+        dtype = dtypes.classify(values)
+        if dtype is not None:
+            fmt = dtypes.detect_datetime_format(values) if dtype == "datetime" else None
+            self.commit(dtype, fmt or "iso")
+
+    def _coerce(self, values: list[Any]) -> list[Any]:
+        if not self.typed:
+            return values
+        if self.dtype is None:
+            self.classify(values)
+            if self.dtype is None:
+                return values
+        values, failures, self.dtype = dtypes.coerce(values, self.dtype, self.datetime_format)
+        self.invalid += failures
+        return values
+
+    def _start_temporal(self, temporal: TemporalState) -> None:
+        self._drop_numeric()
+        self.temporal = temporal
+        self._drop_values()
+
+    def _drop_values(self) -> None:
+        self.freq = None
+        self.array_freq = None
+        self.heavy = None
+
+    def _flush_array_freq(self) -> None:
+        if self.array_freq is not None and self.freq is not None:
+            self.freq.update(dict(self.array_freq.items()))
+        self.array_freq = None
+
+    def _merge_array_freq(self, other: ArrayCounter | None) -> None:
+        if other is None or self.freq is None:
+            return
+        if self.array_freq is not None and self.array_freq.dtype != other.dtype:
+            self._flush_array_freq()
+        if self.array_freq is None:
+            self.array_freq = ArrayCounter(other.dtype)
+        self.array_freq.merge(other)
+
+    def update(self, values: list[Any]) -> None:
+        """Add one batch of raw column values (None = null)."""
+        self._update(self._coerce(values))
+
+    def _update(self, values: list[Any]) -> None:
         non_null = [v for v in values if v is not None]
+        if not non_null:
+            return
+        if self.temporal is not None:
+            self.temporal.update(non_null)
+            self.count += len(non_null)
+            return
+        if self.numeric and not all(isinstance(v, (int, float)) for v in non_null):  # noqa: UP038
+            self._drop_numeric()
+        if self.numeric:
+            n = len(non_null)
+            total = sum(non_null)
+            mean = total / n
+            m2 = sum((v - mean) ** 2 for v in non_null)
+            self._add_moments(n, total, m2, min(non_null), max(non_null))
+            if self.kll is not None:
+                self.kll.update(non_null)
+        if self.freq is not None:
+            self._flush_array_freq()  # Counter keys are first-seen (3 vs 3.0)
+            self.freq.update(non_null)
+        elif self.heavy is not None:
+            self.heavy.update(non_null)
+        self.count += len(non_null)
+
+    def _parsed(self, types: set[type]) -> bool:
+        # values of these types are what _coerce() would return for the committed dtype
+        if not types or not types <= {int, float}:
+            return False
+        return not self.typed or self.dtype == "float" or (self.dtype == "int" and types == {int})
+
+    def _array(self, values: list[Any], types: set[type]) -> Any:
+        # the non-null values as the int64/float64 array update() would see them; None when
+        # they are not all ints/floats, overflow int64 or hold a NaN (update() counts NaN)
+        if not types or not types <= {int, float}:
+            return None
+        nulls = values.count(None)
+        if types == {int} and self.dtype != "float":
+            try:
+                return np.array([v for v in values if v is not None], dtype=np.int64)
+            except OverflowError:
+                return None
+        arr = np.array(values, dtype=np.float64)  # None -> nan
+        missing = np.isnan(arr)
+        if int(missing.sum()) != nulls:
+            return None
+        return arr[~missing] if nulls else arr
+
+    def update_numpy(self, values: list[Any]) -> None:
+        """Vectorized update; falls back to update() for batches it cannot hold exactly."""
+        if self.typed and self.dtype is None:
+            self.classify(values)
+        types = set(map(type, values)) - {type(None)}
+        if not self._parsed(types):
+            values = self._coerce(values)
+            types = set(map(type, values)) - {type(None)}
+        data = self._array(values, types) if self.numeric else None
+        if data is None:
+            self._update(values)
+            return
+        n = int(data.size)
+        lo, hi = data.min().item(), data.max().item()
+        if data.dtype.kind == "i" and max(-lo, hi) * n >= 2**63:
+            total = sum(data.tolist())  # the int64 sum could wrap around
+        else:
+            total = data.sum().item()
+        m2 = float(((data - total / n) ** 2).sum())
+        self._add_moments(n, total, m2, lo, hi)
+        if self.freq is not None:
+            if self.array_freq is None or self.array_freq.dtype != data.dtype:
+                self._flush_array_freq()
+                self.array_freq = ArrayCounter(data.dtype)
+            self.array_freq.update(data)
+        elif self.heavy is not None:
+            keys, counts = np.unique(data, return_counts=True)
+            self.heavy.update_counts(zip(keys.tolist(), counts.tolist(), strict=True))
+        if self.kll is not None:
+            self.kll.update_sorted(np.sort(data).tolist())
+        self.count += n
 
-        if all(isinstance(v, (int, float)) for v in non_null):  # noqa: UP038
-            # numeric branch
-            count = len(non_null)
-            nulls = rows - count
-            distinct = len(set(non_null))
-            if count > 0:
-                min_val = min(non_null)
-                max_val = max(non_null)
-                mean = sum(non_null) / count
+    def merge(self, other: "ColumnState") -> None:
+        if self.dtype is None or other.dtype is None:
+            self.dtype = self.dtype or other.dtype
+        elif self.dtype != other.dtype:
+            # shards committed differently: ints widen to float, anything else is a string
+            self.dtype = "float" if {self.dtype, other.dtype} <= {"int", "float"} else "string"
+        self.invalid += other.invalid
+        if other.count == 0:
+            return
+        if self.count == 0 and other.temporal is not None and self.temporal is None:
+            self.datetime_format = other.datetime_format
+            self._start_temporal(TemporalState(other.temporal.bucket))
+        if self.temporal is not None and other.temporal is not None:
+            self.temporal.merge(other.temporal)
+        elif self.temporal is not None or other.temporal is not None:
+            # datetimes in one shard, numbers or text in the other: a string column whose
+            # values were not all counted, so only counts survive
+            self.temporal = None
+            self._drop_numeric()
+            self._drop_values()
+        elif other.freq is None and other.heavy is None:
+            self._drop_values()  # other is such a demoted column
+        if self.numeric and other.numeric:
+            self._add_moments(other.count, other.total, other.m2, other.min, other.max)
+            if self.kll is not None and other.kll is not None:
+                self.kll.merge(other.kll)
+        else:
+            self._drop_numeric()
+        if self.freq is not None and other.freq is not None:
+            if other.freq:
+                self._flush_array_freq()
+                self.freq.update(other.freq)
+            self._merge_array_freq(other.array_freq)
+        elif self.heavy is not None and other.heavy is not None:
+            self.heavy.merge(other.heavy)
+        self.count += other.count
+
+    def summarize(
+        self, column: str, rows: int, top_k: int, quantiles: Sequence[float]
+    ) -> NumericSummary | CategoricalSummary | TemporalSummary:
+        nulls = rows - self.count - self.invalid
+        if self.temporal is not None:
+            return self.temporal.summarize(column, nulls, self.invalid)
+        if self.freq is None and self.heavy is None:  # demoted from a temporal merge
+            return CategoricalSummary(
+                column, self.count, nulls, None, [], 0, self.dtype, self.invalid
+            )
+        if self.array_freq is not None and self.freq:
+            self._flush_array_freq()
+        freq = self.array_freq if self.array_freq is not None else self.freq
+        distinct = len(freq) if freq is not None else self._heavy().distinct()
+        if not self.numeric:
+            if self.array_freq is not None:
+                top, top_error = self.array_freq.top(top_k), 0
+            elif self.freq is not None:
+                top, top_error = top_k_exact(self.freq, top_k), 0
             else:
-                min_val = max_val = mean = None
-            numeric_stats.append(
-                NumericSummary(col, count, nulls, distinct, min_val, max_val, mean)
+                top, top_error = self._heavy().top(top_k)
+            return CategoricalSummary(
+                column, self.count, nulls, distinct, top, top_error, self.dtype, self.invalid
+            )
+
+        if self.count == 0:
+            return NumericSummary(
+                column, 0, nulls, distinct, None, None, None, dtype=self.dtype, invalid=self.invalid
             )
+        std = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else None
+        summary = NumericSummary(
+            column,
+            self.count,
+            nulls,
+            distinct,
+            self.min,
+            self.max,
+            self.total / self.count,
+            std=std,
+            dtype=self.dtype,
+            invalid=self.invalid,
+        )
+        if quantiles and self.kll is not None:
+            summary.quantiles = dict(zip(quantiles, self.kll.quantiles(quantiles), strict=True))
+        return summary
+
+    def approx_bytes(self) -> int:
+        """Rough in-memory size, for callers that keep many partials (see groupby.py)."""
+        size = 200
+        if self.freq is not None:
+            size += 100 * len(self.freq)
+        if self.array_freq is not None:
+            size += self.array_freq.approx_bytes()
+        if self.heavy is not None:
+            size += self.heavy.approx_bytes()
+        if self.kll is not None:
+            size += self.kll.approx_bytes()
+        if self.temporal is not None:
+            size += 100 * len(self.temporal.buckets)
+        return size
+
+    def _heavy(self) -> HeavyHitters:
+        assert self.heavy is not None
+        return self.heavy
+
+
+@dataclass
+class PartialAnalysis:
+    """Column states for a set of rows; merge partials, then finalize() into a report."""
+
+    rows: int
+    states: dict[str, ColumnState]
+    options: AnalysisOptions
+
+    def column_types(self) -> dict[str, tuple[str, str]]:
+        """Committed (dtype, datetime_format) per column, to seed later partials with."""
+        return {c: (s.dtype, s.datetime_format) for c, s in self.states.items() if s.dtype}
+
+    def approx_bytes(self) -> int:
+        return sum(s.approx_bytes() for s in self.states.values())
+
+    def merge(self, other: "PartialAnalysis") -> None:
+        if other.options != self.options:
+            raise ValueError("cannot merge partial analyses built with different options")
+        for col, state in other.states.items():
+            mine = self.states.get(col)
+            if mine is None:
+                self.states[col] = state
+            else:
+                mine.merge(state)
+        self.rows += other.rows
+
+
+def worker_pool(workers: int) -> AbstractContextManager[Executor | None]:
+    """One process pool for a run of analyze_partial() calls; None (no pool) for 1 worker."""
+    return ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext()
+
 
+def analyze_partial(
+    records: Sequence[dict[str, Any]],
+    options: AnalysisOptions | None = None,
+    *,
+    workers: int = 1,
+    executor: Executor | None = None,
+    column_types: Mapping[str, tuple[str, str]] | None = None,
+) -> PartialAnalysis:
+    """Column states for `records`, split into `workers` shards when workers > 1.
+
+    Shards run on `executor` when given, so callers analyzing many batches can start one
+    process pool for all of them; otherwise a pool is created for this call. `column_types`
+    (PartialAnalysis.column_types() of earlier rows) fixes the columns' types, so a column is
+    classified once however its rows are split; with workers > 1 the other columns are
+    classified from all of `records` before sharding.
+    """
+    options = options or AnalysisOptions()
+    seeded = dict(column_types or {})
+    if workers > 1 and len(records) > workers:
+        if options.infer_types:
+            for col in dict.fromkeys(k for r in records for k in r):
+                if col not in seeded:
+                    probe = ColumnState.create(options)
+                    probe.classify([r.get(col) for r in records])
+                    if probe.dtype is not None:
+                        seeded[col] = (probe.dtype, probe.datetime_format)
+        size = math.ceil(len(records) / workers)
+        shards = [records[i : i + size] for i in range(0, len(records), size)]
+        task = functools.partial(analyze_partial, column_types=seeded)
+        if executor is not None:
+            parts = list(executor.map(task, shards, [options] * len(shards)))
         else:
-            # categorical branch
-            count = len(non_null)
-            nulls = rows - count
-            distinct = len(set(non_null))
-            freq = Counter(non_null)
-            sorted_items = sorted(freq.items(), key=lambda kv: (-kv[1], str(kv[0])))
-            top = sorted_items[:top_k]
-            categorical_stats.append(CategoricalSummary(col, count, nulls, distinct, top))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(task, shards, [options] * len(shards)))
+        result = parts[0]
+        for part in parts[1:]:
+            result.merge(part)
+        return result
 
+    states: dict[str, ColumnState] = {}
+    for r in records:
+        for k in r:
+            if k not in states:
+                states[k] = ColumnState.create(options)
+                if options.infer_types and k in seeded:
+                    states[k].commit(*seeded[k])
+    for col, state in states.items():
+        values = [r.get(col) for r in records]
+        if options.engine == "numpy":
+            state.update_numpy(values)
+        else:
+            state.update(values)
+    return PartialAnalysis(len(records), states, options)
+
+
+def finalize(partial: PartialAnalysis, *, top_k: int = 3) -> AnalysisReport:
+    numeric_stats: list[NumericSummary] = []
+    categorical_stats: list[CategoricalSummary] = []
+    temporal_stats: list[TemporalSummary] = []
+    for col, state in partial.states.items():
+        summary = state.summarize(col, partial.rows, top_k, partial.options.quantiles)
+        if isinstance(summary, NumericSummary):
+            numeric_stats.append(summary)
+        elif isinstance(summary, TemporalSummary):
+            temporal_stats.append(summary)
+        else:
+            categorical_stats.append(summary)
     return AnalysisReport(
-        rows=rows, columns=columns, numeric=numeric_stats, categorical=categorical_stats
+        rows=partial.rows,
+        columns=len(partial.states),
+        numeric=numeric_stats,
+        categorical=categorical_stats,
+        temporal=temporal_stats,
+    )
+
+
+def analyze(
+    records: list[dict[str, Any]],
+    *,
+    top_k: int = 3,
+    top_k_mode: str = "exact",
+    top_k_capacity: int = 1024,
+    quantiles: Sequence[float] = (),
+    quantile_k: int = 200,
+    engine: str = "python",
+    infer_types: bool = True,
+    workers: int = 1,
+) -> AnalysisReport:
+    options = AnalysisOptions(
+        top_k_mode, top_k_capacity, tuple(quantiles), quantile_k, engine, infer_types
     )
+    return finalize(analyze_partial(records, options, workers=workers), top_k=top_k)
+
+
+def analyze_many(
+    shards: Iterable[list[dict[str, Any]]],
+    *,
+    top_k: int = 3,
+    top_k_mode: str = "exact",
+    top_k_capacity: int = 1024,
+    quantiles: Sequence[float] = (),
+    quantile_k: int = 200,
+    engine: str = "python",
+    infer_types: bool = True,
+    workers: int = 1,
+) -> AnalysisReport:
+    """Analyze several shards (e.g. the files of a multi-part dataset) into one report."""
+    options = AnalysisOptions(
+        top_k_mode, top_k_capacity, tuple(quantiles), quantile_k, engine, infer_types
+    )
+    result = PartialAnalysis(0, {}, options)
+    with worker_pool(workers) as pool:
+        for shard in shards:
+            part = analyze_partial(
+                shard, options, workers=workers, executor=pool, column_types=result.column_types()
+            )
+            result.merge(part)
+    return finalize(result, top_k=top_k)
+
+
+@dataclass
+class CorrelationMatrix:
+    method: str
+    columns: list[str]
+    values: list[list[float | None]]  # None where undefined (< 2 pairs or constant column)
+    counts: list[list[int]]  # pairwise-complete row counts
+
+
+class CorrelationState:
+    """Mergeable co-moment sums for a fixed list of columns."""
+
+    def __init__(self, p: int) -> None:
+        self.n = np.zeros((p, p))
+        self.sx = np.zeros((p, p))  # sx[i, j]: sum of x_i over rows where i and j are present
+        self.sxx = np.zeros((p, p))
+        self.sxy = np.zeros((p, p))
+
+    def update(self, x: Any) -> None:
+        """Add a (rows x p) float array batch; NaN marks nulls."""
+        present = ~np.isnan(x)
+        m = present.astype(np.float64)
+        x0 = np.where(present, x, 0.0)
+        self.n += m.T @ m
+        self.sx += x0.T @ m
+        self.sxx += (x0 * x0).T @ m
+        self.sxy += x0.T @ x0
+
+    def merge(self, other: "CorrelationState") -> None:
+        self.n += other.n
+        self.sx += other.sx
+        self.sxx += other.sxx
+        self.sxy += other.sxy
+
+    def matrix(self) -> Any:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = self.sxy - self.sx * self.sx.T / self.n
+            var = self.sxx - self.sx * self.sx / self.n
+            r = cov / np.sqrt(var * var.T)
+        r[(self.n < 2) | ~np.isfinite(r)] = np.nan
+        return np.clip(r, -1.0, 1.0)
+
+
+def _average_ranks(col: Any) -> Any:
+    out = np.full(col.shape, np.nan)
+    present = ~np.isnan(col)
+    _, inverse, counts = np.unique(col[present], return_inverse=True, return_counts=True)
+    starts = np.cumsum(counts) - counts
+    out[present] = (starts + (counts + 1) / 2.0)[inverse]
+    return out
+
+
+def numeric_columns(records: Sequence[dict[str, Any]], *, infer_types: bool = False) -> list[str]:
+    """Columns whose non-null values are all int/float, or classify as int/float if inferred."""
+    if infer_types:
+        cols = dict.fromkeys(k for r in records for k in r)
+        # classify from rows spread evenly over the records, like dtypes' own probe; only a
+        # column with no value in those rows is classified from all of them
+        probe = records[:: max(1, len(records) // dtypes.PROBE_SIZE)]
+        kinds = {c: dtypes.classify([r.get(c) for r in probe]) for c in cols}
+        for c in [c for c, kind in kinds.items() if kind is None]:
+            kinds[c] = dtypes.classify([r.get(c) for r in records])
+        return [c for c, kind in kinds.items() if kind in ("int", "float")]
+    types: dict[str, set[type]] = {}
+    for r in records:
+        for k, v in r.items():
+            types.setdefault(k, set()).add(type(v))
+    return [
+        col
+        for col, ts in types.items()
+        if all(issubclass(t, (int, float)) for t in ts - {type(None)})  # noqa: UP038
+    ]
+
+
+def correlation(
+    records: Sequence[dict[str, Any]],
+    *,
+    columns: Sequence[str] | None = None,
+    method: str = "pearson",
+    batch_rows: int = 50_000,
+    infer_types: bool = True,
+) -> CorrelationMatrix:
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"Unknown correlation method: {method}")
+    if columns is not None:
+        cols = list(columns)
+    else:
+        cols = numeric_columns(records, infer_types=infer_types)
+    state = CorrelationState(len(cols))
+    data = [[r.get(c) for r in records] for c in cols]
+    if infer_types:
+        # string-encoded numbers parse to floats; anything unparseable is treated as null
+        data = [dtypes.coerce(values, "float")[0] for values in data]
+    x = np.array(data, dtype=np.float64).T.reshape(len(records), len(cols))
+    if cols and method == "pearson":
+        for i in range(0, len(records), batch_rows):
+            state.update(x[i : i + batch_rows])
+    elif cols:
+        state.update(np.column_stack([_average_ranks(x[:, j]) for j in range(len(cols))]))
+
+    r = state.matrix()
+    values = [[None if np.isnan(v) else float(v) for v in row] for row in r]
+    counts = [[int(v) for v in row] for row in state.n]
+    return CorrelationMatrix(method, cols, values, counts)
+
+
+def quantile_label(q: float) -> str:
+    """Render a quantile as a percentile label, e.g. 0.5 -> "p50", 0.999 -> "p99.9"."""
+    return f"p{q * 100:g}"
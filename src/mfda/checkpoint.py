@@ -0,0 +1,183 @@
+"""
+Checkpointed validation of large files
+
+A long `validate` run normally starts over from row zero when it is interrupted. Here the
+validation plan (every rule's accumulators, see validation.ValidationPlan) is pickled to a
+state directory every `checkpoint_seconds`, together with:
+- the byte offset up to which rows have been consumed and the number of those rows,
+- a fingerprint of that prefix (see incremental.fingerprint),
+- the CSV header (so a resumed run can parse rows that start mid-file),
+- a key of the schema and validation options.
+
+validate_checkpointed(..., resume=True) reopens the checkpoint and continues parsing at the
+saved offset. Unique rules that spilled keep their partitions under `<state_dir>/spill`; a
+checkpoint records the partition sizes and resuming truncates them back, so rows read after
+the checkpoint are not counted twice.
+
+Notes:
+- Only uncompressed CSV/TSV and JSONL files are supported (offsets must be seekable).
+- A checkpoint for another file, a changed prefix, or a different schema/options is
+  ignored and the file is validated from the start.
+- The second pass of two-pass rules (bloom unique mode, two-pass outliers) is not
+  checkpointed; an interrupted second pass restarts from the end of the first.
+- The checkpoint and spill files are removed once the run completes.
+- The state file is a pickle written by mfda itself; do not load state files from
+  untrusted sources.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import pickle
+import shutil
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from mfda import validation
+from mfda.errors import ConfigurationError
+from mfda.incremental import INCREMENTAL_FORMATS, fingerprint
+from mfda.readers import csv_reader, json_reader
+
+STATE_VERSION = 1
+STATE_FILE = "validate.ckpt"
+SPILL_DIR = "spill"
+
+
+@dataclass
+class ValidationCheckpoint:
+    version: int
+    path: str
+    fmt: str
+    key: str  # digest of the schema and options the plan was compiled with
+    offset: int | None  # None before the first batch (offset of the first data row)
+    fingerprint: str
+    header: list[str] | None
+    plan: validation.ValidationPlan
+
+
+@dataclass
+class CheckpointedResult:
+    report: validation.ValidationReport
+    resumed: bool  # False when the file was validated from the start
+    resumed_rows: int  # rows taken from the checkpoint instead of being read again
+    checkpoints: int  # checkpoints written by this run
+
+
+def load_checkpoint(state_path: str | Path) -> ValidationCheckpoint | None:
+    try:
+        with open(state_path, "rb") as fp:
+            state = pickle.load(fp)  # noqa: S301 - local state written by save_checkpoint
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    if not isinstance(state, ValidationCheckpoint) or state.version != STATE_VERSION:
+        return None
+    return state
+
+
+def save_checkpoint(state: ValidationCheckpoint, state_path: str | Path) -> None:
+    state.plan.sync()
+    tmp = f"{state_path}.tmp"
+    with open(tmp, "wb") as fp:
+        pickle.dump(state, fp, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, state_path)
+
+
+def _usable(state: ValidationCheckpoint | None, path: Path, fmt: str, key: str) -> bool:
+    if state is None or state.offset is None:
+        return False
+    if state.path != str(path.resolve()) or state.fmt != fmt or state.key != key:
+        return False
+    if path.stat().st_size < state.offset:
+        return False
+    return fingerprint(path, state.offset) == state.fingerprint
+
+
+def _batches(
+    path: Path, fmt: str, offset: int | None, header: list[str] | None, batch_rows: int
+) -> Iterator[tuple[list[dict[str, Any]], int]]:
+    if fmt == "jsonl":
+        return json_reader.iter_batches(path, offset=offset or 0, batch_rows=batch_rows)
+    return csv_reader.iter_batches(path, offset=offset, header=header, batch_rows=batch_rows)
+
+
+def _records(path: Path, fmt: str, header: list[str] | None) -> Iterator[dict[str, Any]]:
+    batches = _batches(path, fmt, None, header, 10_000)
+    return itertools.chain.from_iterable(batch for batch, _ in batches)
+
+
+def validate_checkpointed(
+    path: str | Path,
+    schema: validation.Schema,
+    state_dir: str | Path,
+    *,
+    fmt: str,
+    resume: bool = False,
+    checkpoint_seconds: float = 60.0,
+    batch_rows: int = 10_000,
+    max_issues: int | None = None,
+    **options: Any,
+) -> CheckpointedResult:
+    """validation.validate() over a file, checkpointing the rule state to state_dir.
+
+    `options` are passed to validation.compile_plan (max_examples, example_mode,
+    unique_max_keys, unique_mode, unique_expected_keys, index_dir).
+    """
+    if fmt not in INCREMENTAL_FORMATS:
+        raise ConfigurationError(f"checkpointed validation supports csv, tsv and jsonl, not {fmt}")
+    p = Path(path)
+    if p.suffix.lower() in {".gz", ".zip"}:
+        raise ConfigurationError("checkpointed validation needs an uncompressed file")
+    if max_issues is not None and max_issues < 1:
+        raise ValueError("max_issues must be >= 1")
+    if checkpoint_seconds < 0:
+        raise ValueError("checkpoint_seconds must be >= 0")
+    state_root = Path(state_dir)
+    state_path = state_root / STATE_FILE
+    spill_root = state_root / SPILL_DIR
+    blob = json.dumps([schema, options, max_issues], sort_keys=True, default=str)
+    key = hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    state = load_checkpoint(state_path) if resume else None
+    if state is not None and _usable(state, p, fmt, key):
+        state.plan.restore()
+        resumed = True
+    else:
+        # a stale or unwanted checkpoint and its spill partitions are of no use any more
+        state_path.unlink(missing_ok=True)
+        shutil.rmtree(spill_root, ignore_errors=True)
+        spill_root.mkdir(parents=True)
+        header = None
+        if fmt != "jsonl":
+            header, _ = csv_reader.read_header(p)
+        plan = validation.compile_plan(schema, spill_dir=str(spill_root), **options)
+        state = ValidationCheckpoint(
+            STATE_VERSION, str(p.resolve()), fmt, key, None, "", header, plan
+        )
+        resumed = False
+
+    plan = state.plan
+    resumed_rows = plan.row_count if resumed else 0
+    checkpoints = 0
+    stopped = False
+    last = time.monotonic()
+    for batch, end in _batches(p, fmt, state.offset, state.header, batch_rows):
+        plan.update(batch)
+        state.offset = end
+        if max_issues is not None and plan.violations() >= max_issues:
+            stopped = True
+            break
+        if time.monotonic() - last >= checkpoint_seconds:
+            state.fingerprint = fingerprint(p, end)
+            save_checkpoint(state, state_path)
+            checkpoints += 1
+            last = time.monotonic()
+
+    plan.verify(_records(p, fmt, state.header), batch_rows=batch_rows)
+    report = plan.report(stopped_early=stopped)
+    state_path.unlink(missing_ok=True)
+    shutil.rmtree(spill_root, ignore_errors=True)
+    return CheckpointedResult(report, resumed, resumed_rows, checkpoints)
@@ -12,14 +12,554 @@ first N records (preview)
 """
 
 import argparse
+import functools
+import itertools
 import json
 import sys
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, TextIO
 
-from mfda import analysis, validation
-from mfda.dispatch import choose_reader, detect_format
-from mfda.errors import ConfigurationError, FileFormatError
-from mfda.visualization import save_bar_counts, save_histogram
+from mfda import (
+    analysis,
+    checkpoint,
+    groupby,
+    histogram,
+    incremental,
+    sampling,
+    timebucket,
+    validation,
+)
+from mfda.dispatch import choose_reader, detect_format, stream_batches, stream_records
+from mfda.errors import ConfigurationError, FileFormatError, SchemaError
+from mfda.visualization import (
+    chart_data,
+    render_charts,
+    save_bar_counts,
+    save_heatmap,
+    save_histogram,
+    save_time_series,
+)
+
+
+def _add_top_k_mode_args(sub: argparse.ArgumentParser) -> None:
+    sub.add_argument(
+        "--top-k-mode",
+        choices=analysis.TOP_K_MODES,
+        default="exact",
+        help="exact counting, or fixed-memory approximate heavy hitters",
+    )
+    sub.add_argument(
+        "--top-k-capacity",
+        type=int,
+        default=1024,
+        help="counters kept by --top-k-mode approx (count error <= rows / capacity)",
+    )
+
+
+def _parse_quantiles(text: str) -> list[float]:
+    try:
+        qs = [float(part) for part in text.split(",") if part.strip()]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"invalid quantile list: {text}") from e
+    if not qs or any(not 0 <= q <= 1 for q in qs):
+        raise argparse.ArgumentTypeError("quantiles must be comma-separated values in [0, 1]")
+    return qs
+
+
+def _add_quantile_args(sub: argparse.ArgumentParser) -> None:
+    sub.add_argument(
+        "--quantiles",
+        type=_parse_quantiles,
+        help="comma-separated quantiles for numeric columns, e.g. 0.5,0.9,0.99",
+    )
+    sub.add_argument(
+        "--quantile-k",
+        type=int,
+        default=200,
+        help="quantile sketch size; larger k means lower rank error and more memory",
+    )
+
+
+def _add_engine_arg(sub: argparse.ArgumentParser) -> None:
+    sub.add_argument(
+        "--engine",
+        choices=analysis.ENGINES,
+        default="python",
+        help="numeric kernels: pure Python, or vectorized NumPy reductions",
+    )
+
+
+def _add_infer_types_arg(sub: argparse.ArgumentParser) -> None:
+    sub.add_argument(
+        "--no-infer-types",
+        dest="infer_types",
+        action="store_false",
+        help="keep raw value types instead of classifying columns (string numbers stay "
+        "categorical)",
+    )
+
+
+def _add_workers_arg(sub: argparse.ArgumentParser) -> None:
+    sub.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes for row-sharded work (partial results are merged into one)",
+    )
+
+
+def _add_group_by_args(sub: argparse.ArgumentParser) -> None:
+    sub.add_argument("--by", metavar="COL", help="also summarize each group of this column")
+    sub.add_argument(
+        "--max-groups",
+        type=int,
+        default=10_000,
+        help="groups aggregated in memory before further groups spill to disk",
+    )
+    sub.add_argument(
+        "--max-group-memory",
+        type=int,
+        default=groupby.MAX_GROUP_BYTES // (1024 * 1024),
+        metavar="MB",
+        help="estimated memory of in-memory group states before further groups spill",
+    )
+
+
+def _parse_bucket(text: str) -> int:
+    try:
+        return timebucket.parse_bucket(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def _add_time_bucket_args(sub: argparse.ArgumentParser) -> None:
+    sub.add_argument(
+        "--time-bucket",
+        type=_parse_bucket,
+        metavar="WIDTH",
+        help="also summarize rows per time bucket of --time-col, e.g. 15m, 1h, 1d",
+    )
+    sub.add_argument("--time-col", metavar="COL", help="timestamp column for --time-bucket")
+    sub.add_argument(
+        "--max-open-buckets",
+        type=int,
+        default=1024,
+        help="buckets kept open for out-of-order rows; later rows for closed buckets are dropped",
+    )
+
+
+def _time_buckets(records: Iterable[dict[str, Any]], args: argparse.Namespace) -> Any:
+    if not args.time_col:
+        raise ConfigurationError("--time-bucket requires --time-col")
+    opts = _analysis_options(args)
+    opts.pop("workers", None)
+    return timebucket.analyze_time_buckets(
+        records,
+        args.time_col,
+        args.time_bucket,
+        top_k=args.top_k,
+        max_open_buckets=args.max_open_buckets,
+        **opts,
+    )
+
+
+def _bucket_header(tb: Any) -> str:
+    return (
+        f"time buckets by {tb.column} ({timedelta(seconds=tb.bucket_seconds)}):"
+        f" {len(tb.buckets)} late_rows={tb.late_rows} untimed_rows={tb.untimed_rows}"
+    )
+
+
+def _add_sample_args(sub: argparse.ArgumentParser) -> None:
+    size = sub.add_mutually_exclusive_group()
+    size.add_argument(
+        "--sample",
+        type=int,
+        metavar="N",
+        help="work on a uniform random sample of N rows (estimates get confidence intervals)",
+    )
+    size.add_argument(
+        "--sample-frac",
+        type=float,
+        metavar="F",
+        help="work on a random sample of about this fraction of rows",
+    )
+    sub.add_argument("--seed", type=int, default=0, help="random seed for --sample/--sample-frac")
+
+
+def _sampling(args: argparse.Namespace) -> bool:
+    return args.sample is not None or args.sample_frac is not None
+
+
+def _load_records(
+    args: argparse.Namespace, reader: Any, fmt: str, kwargs: dict[str, Any]
+) -> tuple[list[dict[str, Any]], Any]:
+    """Read all records, or a sample of them when --sample/--sample-frac is given."""
+    if not _sampling(args):
+        records: list[dict[str, Any]] = reader.read(args.path, **kwargs).as_records()
+        return records, None
+    smp = sampling.sample_path(
+        args.path,
+        "jsonl" if fmt == "json" and args.lines else fmt,
+        read_all=lambda: reader.read(args.path, **kwargs).as_records(),
+        n=args.sample,
+        frac=args.sample_frac,
+        seed=args.seed,
+    )
+    return smp.records, smp
+
+
+def _describe_sample(smp: Any) -> str:
+    approx = "" if smp.exact_population else "~"
+    return f"{len(smp.records)} of {approx}{smp.population_rows} rows ({smp.method})"
+
+
+def _format_estimate(e: Any) -> str:
+    return f"{e.column} {e.statistic}={e.value:.4g} [{e.low:.4g}, {e.high:.4g}]"
+
+
+def _group_by(records: Iterable[dict[str, Any]], args: argparse.Namespace) -> Any:
+    opts = _analysis_options(args)
+    opts.pop("workers", None)
+    return groupby.analyze_by(
+        records,
+        args.by,
+        top_k=args.top_k,
+        max_groups=args.max_groups,
+        max_bytes=args.max_group_memory * 1024 * 1024,
+        **opts,
+    )
+
+
+def _print_groups(grep: Any, args: argparse.Namespace) -> None:
+    print(f"groups by {grep.by}: {len(grep.groups)}")
+    for g in grep.groups:
+        print()
+        print(f"[{grep.by}={g.key}] rows={g.report.rows}")
+        _print_summaries(g.report, args)
+
+
+def _read_shard(path: str, args: argparse.Namespace) -> list[dict[str, Any]]:
+    """Read an extra shard file with the same format options as the main path."""
+    fmt = args.format.lower().lstrip(".") if args.format else detect_format(path)
+    if fmt is None:
+        raise ConfigurationError(f"unknown or unsupported format for {path}")
+    reader = choose_reader(fmt)
+    if reader is None:
+        raise ConfigurationError(f"no reader available for format: {fmt}")
+    kwargs: dict[str, Any] = {"limit": None}
+    if fmt in {"json", "jsonl"} and args.lines:
+        kwargs["lines"] = True
+    if fmt == "xlsx" and args.sheet:
+        kwargs["sheet"] = int(args.sheet) if args.sheet.isdigit() else args.sheet
+    records: list[dict[str, Any]] = reader.read(path, **kwargs).as_records()
+    return records
+
+
+def _analyze_records(records: list[dict[str, Any]], args: argparse.Namespace) -> Any:
+    # extra shard files are read one at a time and merged into the same summary
+    if args.more_paths:
+        shards = itertools.chain([records], (_read_shard(p, args) for p in args.more_paths))
+        return analysis.analyze_many(shards, top_k=args.top_k, **_analysis_options(args))
+    return analysis.analyze(records, top_k=args.top_k, **_analysis_options(args))
+
+
+def _format_top(cs: Any) -> str:
+    """Top values; "unavailable" for a column whose values were not counted."""
+    return "unavailable" if cs.distinct is None else str(cs.top)
+
+
+def _print_summaries(rep: Any, args: argparse.Namespace) -> None:
+    print("numeric:")
+    for ns in rep.numeric:
+        print(
+            f" {ns.column}\t count={ns.count} nulls={ns.nulls}"
+            f" distinct={ns.distinct} min={ns.min} max={ns.max} mean={ns.mean}"
+            + (f" {_format_quantiles(ns)}" if args.quantiles else "")
+            + _invalid_note(ns, " ")
+        )
+
+    print("categorical:")
+    for cs in rep.categorical:
+        print(
+            f" {cs.column}\t count={cs.count} nulls={cs.nulls}"
+            f" distinct={cs.distinct}, top={_format_top(cs)}"
+            + (f" top_error<={cs.top_error}" if args.top_k_mode == "approx" else "")
+            + _invalid_note(cs, " ")
+        )
+
+    temporal = getattr(rep, "temporal", [])
+    if temporal:
+        print("temporal:")
+        for ts in temporal:
+            print(f" {ts.column}\t {_format_temporal(ts, ' ')}" + _invalid_note(ts, " "))
+
+
+def _write_summaries_md(f: TextIO, rep: Any, args: argparse.Namespace, level: str) -> None:
+    # numeric
+    f.write(f"{level} Numeric columns\n")
+    if not rep.numeric:
+        f.write("- None\n")
+    else:
+        for ns in rep.numeric:
+            quantile_note = ", " + _format_quantiles(ns, sep=", ") if args.quantiles else ""
+            f.write(
+                f"- {ns.column}: count={ns.count}, nulls={ns.nulls}, "
+                f"distinct={ns.distinct}, min={ns.min}, max={ns.max}, mean={ns.mean}"
+                f"{quantile_note}{_invalid_note(ns, ', ')}\n"
+            )
+    f.write("\n")
+
+    # categorical
+    f.write(f"{level} Categorical columns\n")
+    if not rep.categorical:
+        f.write("- None\n")
+    else:
+        for cs in rep.categorical:
+            approx_note = f", top_error<={cs.top_error}" if args.top_k_mode == "approx" else ""
+            f.write(
+                f"- {cs.column}: count={cs.count}, nulls={cs.nulls}, "
+                f"distinct={cs.distinct}, top={_format_top(cs)}"
+                f"{approx_note}{_invalid_note(cs, ', ')}\n"
+            )
+    f.write("\n")
+
+    # temporal
+    temporal = getattr(rep, "temporal", [])
+    if temporal:
+        f.write(f"{level} Temporal columns\n")
+        for ts in temporal:
+            f.write(f"- {ts.column}: {_format_temporal(ts, ', ')}{_invalid_note(ts, ', ')}\n")
+        f.write("\n")
+
+
+def _print_correlation(matrix: Any) -> None:
+    print()
+    print(f"correlation ({matrix.method}):")
+    width = max([len(c) for c in matrix.columns] + [6])
+    print(" " * (width + 1) + " ".join(f"{c:>{width}}" for c in matrix.columns))
+    for col, row in zip(matrix.columns, matrix.values, strict=True):
+        cells = ("-" if v is None else f"{v:.3f}" for v in row)
+        print(f" {col:<{width}}" + " ".join(f"{c:>{width}}" for c in cells))
+
+
+def _invalid_note(summary: Any, sep: str) -> str:
+    """Values that did not parse as the column's inferred dtype, when there are any."""
+    invalid = getattr(summary, "invalid", 0)
+    return f"{sep}invalid={invalid} (not {summary.dtype})" if invalid else ""
+
+
+def _format_temporal(ts: Any, sep: str) -> str:
+    parts = [f"count={ts.count}", f"nulls={ts.nulls}"]
+    if ts.min is not None:
+        parts += [
+            f"min={ts.min.isoformat()}",
+            f"max={ts.max.isoformat()}",
+            f"span={timedelta(seconds=ts.span_seconds)}",
+        ]
+        if ts.max_gap_seconds is not None:
+            parts.append(f"max_gap={timedelta(seconds=ts.max_gap_seconds)}")
+        parts += [
+            f"out_of_order={ts.out_of_order}",
+            f"rows_per_bucket={ts.rows_per_bucket_min}/{ts.rows_per_bucket_mean:.4g}/"
+            f"{ts.rows_per_bucket_max} (min/mean/max per {timedelta(seconds=ts.bucket_seconds)})",
+            f"empty_buckets={ts.empty_buckets}",
+        ]
+    return sep.join(parts)
+
+
+def _format_quantiles(ns: Any, sep: str = " ") -> str:
+    return sep.join(f"{analysis.quantile_label(q)}={v}" for q, v in ns.quantiles.items())
+
+
+def _analysis_options(args: argparse.Namespace) -> dict[str, Any]:
+    """Keyword options for analysis.analyze beyond top_k; only non-defaults are passed."""
+    opts: dict[str, Any] = {}
+    if args.top_k_mode != "exact":
+        opts["top_k_mode"] = args.top_k_mode
+        opts["top_k_capacity"] = args.top_k_capacity
+    if args.quantiles:
+        opts["quantiles"] = args.quantiles
+        opts["quantile_k"] = args.quantile_k
+    if args.engine != "python":
+        opts["engine"] = args.engine
+    if not args.infer_types:
+        opts["infer_types"] = False
+    if args.workers > 1:
+        opts["workers"] = args.workers
+    return opts
+
+
+EXIT_REJECTED = 3  # validate reached the --fail-fast / --max-issues budget
+
+
+def _add_validation_args(sub: argparse.ArgumentParser) -> None:
+    sub.add_argument(
+        "--max-examples",
+        type=int,
+        default=5,
+        metavar="N",
+        help="example row indices kept per validation issue (counts stay exact)",
+    )
+    sub.add_argument(
+        "--example-mode",
+        choices=validation.EXAMPLE_MODES,
+        default="first",
+        help="keep the first offending rows, or a uniform random sample of them",
+    )
+    sub.add_argument(
+        "--unique-max-keys",
+        type=int,
+        default=1_000_000,
+        metavar="N",
+        help="keys held in memory per unique rule before it spills to disk",
+    )
+    sub.add_argument(
+        "--unique-mode",
+        choices=validation.UNIQUE_MODES,
+        default="exact",
+        help="bloom: Bloom-filter pre-pass, then an exact check of candidate duplicates only",
+    )
+    sub.add_argument(
+        "--index-dir",
+        metavar="DIR",
+        help="cache for key indexes of files named by `references` rules "
+        "(default: $MFDA_CACHE_DIR or ~/.cache/mfda/keys)",
+    )
+
+
+def _load_schema(path: str) -> Any:
+    """Schema JSON from `path`; relative `references` files resolve against its directory."""
+    with open(path, encoding="utf-8") as f:
+        schema = json.load(f)
+    if isinstance(schema, dict):
+        for spec in schema.values():
+            ref = spec.get("references") if isinstance(spec, dict) else None
+            if isinstance(ref, dict) and isinstance(ref.get("file"), str):
+                ref["file"] = str(Path(path).parent / ref["file"])
+    return schema
+
+
+def _validation_options(args: argparse.Namespace) -> dict[str, Any]:
+    """Keyword options for validation.validate beyond the schema; only non-defaults are passed."""
+    opts: dict[str, Any] = {}
+    if args.max_examples != 5:
+        opts["max_examples"] = args.max_examples
+    if args.example_mode != "first":
+        opts["example_mode"] = args.example_mode
+    if args.unique_max_keys != 1_000_000:
+        opts["unique_max_keys"] = args.unique_max_keys
+    if args.unique_mode != "exact":
+        opts["unique_mode"] = args.unique_mode
+    if args.workers > 1:
+        opts["workers"] = args.workers
+    if args.index_dir:
+        opts["index_dir"] = args.index_dir
+    return opts
+
+
+def _issue_count(issue: Any) -> str:
+    """Issue count for display; "~N" when it is only a lower bound."""
+    return str(issue.count) if getattr(issue, "exact", True) else f"~{issue.count}"
+
+
+def _issue_groups(issue: Any, sep: str = " ") -> str:
+    """Duplicate group count suffix for unique rules; empty for other issues."""
+    groups = getattr(issue, "groups", None)
+    return "" if groups is None else f"{sep}groups={groups}"
+
+
+def _add_hist_args(sub: argparse.ArgumentParser) -> None:
+    sub.add_argument("--bins", type=int, default=10, help="histogram bins (default: 10)")
+    sub.add_argument(
+        "--binning",
+        choices=histogram.BINNINGS,
+        help="histogram bins: equal width over min..max (default for one chart), over the "
+        "0.5-99.5%% quantile range of a sketch, or adaptive in a single streamed pass (default "
+        "for --out-dir)",
+    )
+
+
+def _hist_options(args: argparse.Namespace) -> dict[str, Any]:
+    """Keyword options for save_histogram beyond the column; only non-defaults are passed."""
+    opts: dict[str, Any] = {}
+    if args.bins != 10:
+        opts["bins"] = args.bins
+    if args.binning not in (None, "minmax"):
+        opts["binning"] = args.binning
+    return opts
+
+
+def _bar_options(args: argparse.Namespace) -> dict[str, Any]:
+    """Keyword options for save_bar_counts beyond top_k; only non-defaults are passed."""
+    opts: dict[str, Any] = {}
+    if args.top_k_mode != "exact":
+        opts["mode"] = args.top_k_mode
+        opts["capacity"] = args.top_k_capacity
+    return opts
+
+
+def _viz_many(args: argparse.Namespace) -> int:
+    """viz --out-dir: aggregate every requested chart in one scan, render them in parallel."""
+    if args.out:
+        print("Error: choose either --out or --out-dir (not both)")
+        return 2
+    specs = [("hist", c) for c in _split_columns(args.hist)]
+    specs += [("bar", c) for c in _split_columns(args.bar)]
+    if not specs and not args.all:
+        print("Error: must provide --hist, --bar or --all")
+        return 2
+    fmt = args.format.lower().lstrip(".") if args.format else detect_format(args.path)
+    if fmt is None:
+        print(f"Error: unknown or unsupported format for {args.path}")
+        return 2
+    reader = choose_reader(fmt)
+    if reader is None:
+        print(f"Error : no reader available for {fmt}")
+        return 2
+    kwargs: dict[str, Any] = {"limit": None}
+    if fmt in {"json", "jsonl"} and args.lines:
+        kwargs["lines"] = True
+    if fmt == "xlsx" and args.sheet:
+        kwargs["sheet"] = int(args.sheet) if args.sheet.isdigit() else args.sheet
+    try:
+        # stream the file (twice at most) when it can be; otherwise read it once
+        records = _stream(args, fmt)
+        if records is None:
+            records, _ = _load_records(args, reader, fmt, kwargs)
+        charts, empty = chart_data(
+            records,
+            None if args.all else specs,
+            bins=args.bins,
+            binning=args.binning or "adaptive",
+            top_k=args.top_k,
+            mode=args.top_k_mode,
+            capacity=args.top_k_capacity,
+        )
+        paths = render_charts(charts, args.out_dir, workers=args.workers)
+        print(f"Wrote {len(paths)} charts to {args.out_dir}")
+        for kind, col in empty:
+            print(f"skipped {kind} {col}: no data")
+        return 0
+    except (FileFormatError, ConfigurationError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    except Exception as e:
+        print(f"Unexpected error: {e}", file=sys.stderr)
+        return 1
+
+
+def _stream(args: argparse.Namespace, fmt: str) -> Iterable[dict[str, Any]] | None:
+    """Records streamed from the file instead of loaded; None when sampled or not streamable."""
+    if _sampling(args):
+        return None
+    return stream_records(args.path, "jsonl" if fmt == "json" and args.lines else fmt)
+
+
+def _split_columns(text: str | None) -> list[str]:
+    return [c.strip() for c in (text or "").split(",") if c.strip()]
 
 
 def main(argv: Sequence[str] | None = None) -> int:
@@ -37,31 +577,132 @@ def main(argv: Sequence[str] | None = None) -> int:
     # analyze subparser
     analyze = sub.add_parser("analyze", help="Summarize rows, columns, and value distributions")
     analyze.add_argument("path")
+    analyze.add_argument(
+        "more_paths",
+        nargs="*",
+        metavar="PATH",
+        help="additional shard files merged into a single summary",
+    )
     analyze.add_argument("-f", "--format")
     analyze.add_argument("-k", "--top-k", type=int, default=3)
+    _add_top_k_mode_args(analyze)
+    _add_quantile_args(analyze)
+    _add_engine_arg(analyze)
+    _add_infer_types_arg(analyze)
+    _add_workers_arg(analyze)
+    _add_group_by_args(analyze)
+    _add_time_bucket_args(analyze)
+    _add_sample_args(analyze)
+    analyze.add_argument(
+        "--corr",
+        choices=analysis.CORRELATION_METHODS,
+        help="also print the correlation matrix of numeric columns",
+    )
+    analyze.add_argument(
+        "--state",
+        metavar="FILE",
+        help="persist analysis state here and only scan rows appended since the last run "
+        "(csv/tsv/jsonl)",
+    )
     analyze.add_argument("--lines", action="store_true")
     analyze.add_argument("--sheet")
 
     # visualization subparser
     viz = sub.add_parser(
-        "viz", help="Visualize a column as histogram or bar chart", aliases=["visualize"]
+        "viz", help="Visualize columns as histograms or bar charts", aliases=["visualize"]
     )
     viz.add_argument("path")
     viz.add_argument("-f", "--format")
     viz.add_argument("-k", "--top-k", type=int, default=3)
+    _add_top_k_mode_args(viz)
+    _add_sample_args(viz)
     viz.add_argument("--lines", action="store_true")
     viz.add_argument("--sheet")
-    viz.add_argument("--hist")
-    viz.add_argument("--bar")
-    viz.add_argument("--out", required=True)
+    viz.add_argument("--hist", help="numeric column (comma-separated list with --out-dir)")
+    _add_hist_args(viz)
+    viz.add_argument("--bar", help="categorical column (comma-separated list with --out-dir)")
+    viz.add_argument(
+        "--all",
+        action="store_true",
+        help="with --out-dir: chart every column (histograms for numbers, else bar charts)",
+    )
+    viz.add_argument("--out", help="image file for a single chart")
+    viz.add_argument(
+        "--out-dir", metavar="DIR", help="write one image per chart here (several charts)"
+    )
+    viz.add_argument(
+        "--workers",
+        type=int,
+        help="processes rendering charts with --out-dir (default: one per CPU)",
+    )
 
     # validate subparser
     validate = sub.add_parser("validate", help="Check records against a schema")
     validate.add_argument("path")
+    validate.add_argument(
+        "more_paths",
+        nargs="*",
+        metavar="PATH",
+        help="additional shard files validated as one dataset (row indices run on)",
+    )
     validate.add_argument("-f", "--format")
     validate.add_argument("--lines", action="store_true")
     validate.add_argument("--sheet")
     validate.add_argument("--schema")
+    _add_validation_args(validate)
+    _add_workers_arg(validate)
+    stop_early = validate.add_mutually_exclusive_group()
+    stop_early.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help=f"stop at the first violation and exit with code {EXIT_REJECTED}",
+    )
+    stop_early.add_argument(
+        "--max-issues",
+        type=int,
+        metavar="N",
+        help=f"stop once N violations were found and exit with code {EXIT_REJECTED}",
+    )
+    validate.add_argument(
+        "--dedup",
+        action="store_true",
+        help='also report whole-row duplicates (like "unique_rows": true in the schema)',
+    )
+    validate.add_argument(
+        "--state-dir",
+        metavar="DIR",
+        help="checkpoint the validation state here periodically (csv/tsv/jsonl)",
+    )
+    validate.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue from the last checkpoint in --state-dir instead of the first row",
+    )
+    validate.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=60.0,
+        metavar="SECONDS",
+        help="seconds between checkpoints with --state-dir (default: 60)",
+    )
+
+    # infer-schema subparser
+    infer = sub.add_parser(
+        "infer-schema", help="Profile records and write a schema usable with --schema"
+    )
+    infer.add_argument("path")
+    infer.add_argument("-f", "--format")
+    infer.add_argument("--lines", action="store_true")
+    infer.add_argument("--sheet")
+    infer.add_argument("-o", "--out", help="write the schema here instead of stdout")
+    infer.add_argument(
+        "--max-enum",
+        type=int,
+        default=20,
+        metavar="N",
+        help="string columns with at most N distinct values get allowed_values",
+    )
+    _add_sample_args(infer)
 
     # report subparser
     report = sub.add_parser(
@@ -71,13 +712,30 @@ def main(argv: Sequence[str] | None = None) -> int:
     report.add_argument("--out", required=True)
     report.add_argument("--hist")
     report.add_argument("--hist-out")
+    _add_hist_args(report)
     report.add_argument("--bar")
     report.add_argument("--bar-out")
     report.add_argument("-k", "--top-k", type=int, default=3)
+    _add_top_k_mode_args(report)
+    _add_quantile_args(report)
+    _add_engine_arg(report)
+    _add_infer_types_arg(report)
+    _add_workers_arg(report)
+    _add_group_by_args(report)
+    _add_time_bucket_args(report)
+    report.add_argument("--time-out", help="time-series chart for --time-bucket")
+    _add_sample_args(report)
+    report.add_argument(
+        "--corr",
+        choices=analysis.CORRELATION_METHODS,
+        help="add a correlation matrix of numeric columns (requires --corr-out)",
+    )
+    report.add_argument("--corr-out", help="heatmap image for --corr")
     report.add_argument("-f", "--format")
     report.add_argument("--lines", action="store_true")
     report.add_argument("--sheet")
     report.add_argument("--schema")
+    _add_validation_args(report)
 
     parser.add_argument("--version", action="version", version="mfda 1.0.0")
 
@@ -161,26 +819,70 @@ def main(argv: Sequence[str] | None = None) -> int:
 
         # step 4: read records
         try:
-            table = reader.read(args.path, **kwargs)
-            records = table.as_records()
-            # run analysis
-            rep = analysis.analyze(records, top_k=args.top_k)
+            if args.corr and (args.state or args.more_paths or args.by):
+                raise ConfigurationError("--corr works on a single file without --state or --by")
+            if args.time_bucket and (args.state or args.by or args.corr):
+                raise ConfigurationError(
+                    "--time-bucket cannot be combined with --state, --by or --corr"
+                )
+            if _sampling(args) and (args.state or args.more_paths):
+                raise ConfigurationError("sampling works on a single file without --state")
+            smp = None
+            if args.state:
+                if args.more_paths or args.by:
+                    raise ConfigurationError("--state works on a single file without --by")
+                inc_fmt = "jsonl" if fmt == "json" and args.lines else fmt
+                opts = _analysis_options(args)
+                workers = opts.pop("workers", 1)
+                result = incremental.analyze_incremental(
+                    args.path,
+                    args.state,
+                    fmt=inc_fmt,
+                    top_k=args.top_k,
+                    options=analysis.AnalysisOptions(**opts),
+                    workers=workers,
+                )
+                how = "resumed" if result.resumed else "full scan"
+                print(
+                    f"state: {how} from byte {result.start_offset} to {result.end_offset},"
+                    f" new_rows={result.new_rows}"
+                )
+                rep = result.report
+            elif args.time_bucket:
+                records, _ = _load_records(args, reader, fmt, kwargs)
+                shards = itertools.chain([records], (_read_shard(p, args) for p in args.more_paths))
+                tb = _time_buckets(itertools.chain.from_iterable(shards), args)
+                print(_bucket_header(tb))
+                for b in tb.buckets:
+                    print()
+                    print(f"[{b.start.isoformat()}] rows={b.report.rows}")
+                    _print_summaries(b.report, args)
+                return 0
+            elif args.by:
+                records, _ = _load_records(args, reader, fmt, kwargs)
+                shards = itertools.chain([records], (_read_shard(p, args) for p in args.more_paths))
+                grep = _group_by(itertools.chain.from_iterable(shards), args)
+                print("rows: ", sum(g.report.rows for g in grep.groups))
+                print()
+                _print_groups(grep, args)
+                return 0
+            else:
+                records, smp = _load_records(args, reader, fmt, kwargs)
+                rep = _analyze_records(records, args)
             # print
             print("rows: ", rep.rows)
             print("columns: ", rep.columns)
             print()
-            print("numeric:")
-            for ns in rep.numeric:
-                print(
-                    f" {ns.column}\t count={ns.count} nulls={ns.nulls}"
-                    f" distinct={ns.distinct} min={ns.min} max={ns.max} mean={ns.mean}"
-                )
-
-            print("categorical:")
-            for cs in rep.categorical:
-                print(
-                    f" {cs.column}\t count={cs.count} nulls={cs.nulls}"
-                    f" distinct={cs.distinct}, top={cs.top}"
+            _print_summaries(rep, args)
+            if smp is not None:
+                print()
+                print(f"sample: {_describe_sample(smp)}")
+                print("estimates (95% CI):")
+                for est in sampling.estimate_intervals(rep, population_rows=smp.population_rows):
+                    print(f"  {_format_estimate(est)}")
+            if args.corr:
+                _print_correlation(
+                    analysis.correlation(records, method=args.corr, infer_types=args.infer_types)
                 )
 
             return 0
@@ -194,6 +896,14 @@ def main(argv: Sequence[str] | None = None) -> int:
 
     # visualize
     elif args.cmd == "viz":
+        if args.out_dir:
+            return _viz_many(args)
+        if not args.out:
+            print("Error: provide --out FILE, or --out-dir DIR for several charts")
+            return 2
+        if args.all or "," in (args.hist or "") or "," in (args.bar or ""):
+            print("Error: several charts need --out-dir instead of --out")
+            return 2
         # hist and bar mutually exclusive
         if args.hist and args.bar:
             print("Error: choose either --hist or --bar (not both)")
@@ -224,17 +934,24 @@ def main(argv: Sequence[str] | None = None) -> int:
                 kwargs["sheet"] = int(args.sheet)
             else:
                 kwargs["sheet"] = args.sheet
-        # step 5: read records
+        # step 5: read records (adaptive bins need one pass, so the file is streamed)
         try:
-            table = reader.read(args.path, **kwargs)
-            records = table.as_records()
+            records = _stream(args, fmt) if args.hist and args.binning == "adaptive" else None
+            if records is None:
+                records, _ = _load_records(args, reader, fmt, kwargs)
 
             # step 6: visualization
             if args.hist:
-                save_histogram(records, column=args.hist, out_path=args.out)
+                save_histogram(records, column=args.hist, out_path=args.out, **_hist_options(args))
                 print(f"Wrote histogram to {args.out}")
             elif args.bar:
-                save_bar_counts(records, column=args.bar, out_path=args.out, top_k=args.top_k)
+                save_bar_counts(
+                    records,
+                    column=args.bar,
+                    out_path=args.out,
+                    top_k=args.top_k,
+                    **_bar_options(args),
+                )
                 print(f"Wrote bar chart to {args.out}")
 
             return 0
@@ -267,18 +984,77 @@ def main(argv: Sequence[str] | None = None) -> int:
         if fmt == "xlsx" and args.sheet:
             kwargs["sheet"] = int(args.sheet) if args.sheet.isdigit() else args.sheet
 
-        # 3: read records
+        # 3: read records (streamed whenever the format allows)
+        budget = 1 if args.fail_fast else args.max_issues
+        batches = None
+        if budget is not None and args.unique_mode == "bloom":
+            print(
+                "Error: --unique-mode bloom needs two passes; "
+                "it cannot be combined with --fail-fast/--max-issues",
+                file=sys.stderr,
+            )
+            return 2
+        if (budget is not None or args.unique_mode == "bloom") and (
+            args.more_paths or args.workers > 1
+        ):
+            print(
+                "Error: extra files and --workers need --unique-mode exact "
+                "and no --fail-fast/--max-issues",
+                file=sys.stderr,
+            )
+            return 2
+        if args.resume and not args.state_dir:
+            print("Error: --resume needs --state-dir", file=sys.stderr)
+            return 2
+        if args.state_dir and (args.more_paths or args.workers > 1):
+            print("Error: --state-dir works on a single file without --workers", file=sys.stderr)
+            return 2
+        stream_fmt = "jsonl" if fmt == "json" and args.lines else fmt
+        if budget is not None and not args.state_dir:
+            batches = stream_batches(args.path, stream_fmt)
         try:
-            table = reader.read(args.path, **kwargs)
-            records = table.as_records()
-            if args.schema:
-                with open(args.schema, encoding="utf-8") as f:
-                    schema = json.load(f)
-            if not args.schema:
+            source: Iterable[dict[str, Any]] = ()
+            if batches is not None:
+                source = itertools.chain.from_iterable(batches)
+            elif not args.state_dir:  # checkpointed runs read the file themselves
+                # streamed (and re-read for two-pass rules) when the format allows it, so
+                # unique rules can spill instead of the whole file being held in memory
+                streamed = stream_records(args.path, stream_fmt)
+                source = (
+                    streamed
+                    if streamed is not None
+                    else reader.read(args.path, **kwargs).as_records()
+                )
+            schema = _load_schema(args.schema) if args.schema else {}
+            if args.dedup:
+                schema["unique_rows"] = True
+            if not args.schema and not args.dedup:
                 print("No schema provided, skipping rule checks.")
                 return 2
             # 4: validation
-            vrep = validation.validate(records, schema)
+            opts = _validation_options(args)
+            if budget is not None:
+                opts["max_issues"] = budget
+            if args.state_dir:
+                run = checkpoint.validate_checkpointed(
+                    args.path,
+                    schema,
+                    args.state_dir,
+                    fmt=stream_fmt,
+                    resume=args.resume,
+                    checkpoint_seconds=args.checkpoint_interval,
+                    **opts,
+                )
+                how = f"resumed after {run.resumed_rows} rows" if run.resumed else "new run"
+                print(f"state: {how}, checkpoints={run.checkpoints}")
+                vrep = run.report
+            elif args.more_paths:
+                # extra files are read lazily, in the pool's processes with --workers
+                parts: list[validation.Shard] = [source]
+                parts += [functools.partial(_read_shard, p, args) for p in args.more_paths]
+                vrep = validation.validate_many(parts, schema, **opts)
+            else:
+                vrep = validation.validate(source, schema, **opts)
             # 5: print + errors
             print(f"rows: {vrep.row_count}")
             print(f"columns: {vrep.column_count}")
@@ -286,8 +1062,62 @@ def main(argv: Sequence[str] | None = None) -> int:
             for issue in vrep.issues:
                 print(
                     f"code={issue.code} column={issue.column} "
-                    f"count={issue.count} examples={issue.examples}"
+                    f"count={_issue_count(issue)} examples={issue.examples}"
+                    f"{_issue_groups(issue)}"
                 )
+            if budget is not None and vrep.stopped_early:
+                print(f"rejected: stopped after {vrep.row_count} rows (issue budget {budget})")
+                return EXIT_REJECTED
+            # rules that only count at the end (outliers, spilled or bloom unique keys) can
+            # reach the budget without stopping the scan
+            violations = sum(issue.count for issue in vrep.issues)
+            if budget is not None and violations >= budget:
+                print(f"rejected: {violations} violations (issue budget {budget})")
+                return EXIT_REJECTED
+            return 0
+        except (FileFormatError, ConfigurationError, SchemaError, ValueError) as e:
+            # ValueError: rules that need two passes over a streamed (--max-issues) input
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+        except Exception as e:
+            print(f"Unexpected error: {e}", file=sys.stderr)
+            return 1
+        finally:
+            if batches is not None:
+                batches.close()
+
+    # schema inference
+    elif args.cmd == "infer-schema":
+        if args.format:
+            fmt = args.format.lower().lstrip(".")
+        else:
+            fmt = detect_format(args.path)
+
+        if fmt is None:
+            print(f"Error: unknown or unsupported format for {args.path}")
+            return 2
+        reader = choose_reader(fmt)
+        if reader is None:
+            print(f"Error: no reader available for {fmt}")
+            return 2
+        kwargs = {"limit": None}
+        if fmt in {"json", "jsonl"} and args.lines:
+            kwargs["lines"] = True
+        if fmt == "xlsx" and args.sheet:
+            kwargs["sheet"] = int(args.sheet) if args.sheet.isdigit() else args.sheet
+
+        try:
+            records, smp = _load_records(args, reader, fmt, kwargs)
+            schema = validation.infer_schema(records, sample=None, max_enum=args.max_enum)
+            text = json.dumps(schema, indent=2, ensure_ascii=False)
+            if args.out:
+                with open(args.out, "w", encoding="utf-8") as f:
+                    f.write(text + "\n")
+                print(f"Wrote schema for {len(schema)} columns to {args.out}")
+                if smp is not None:
+                    print(f"sample: {_describe_sample(smp)}")
+            else:
+                print(text)
             return 0
         except (FileFormatError, ConfigurationError) as e:
             print(f"Error: {e}", file=sys.stderr)
@@ -304,6 +1134,12 @@ def main(argv: Sequence[str] | None = None) -> int:
         if args.bar and not args.bar_out:
             print("Error: --bar requires --bar-out")
             return 2
+        if args.corr and not args.corr_out:
+            print("Error: --corr requires --corr-out")
+            return 2
+        if args.time_bucket and not args.time_out:
+            print("Error: --time-bucket requires --time-out")
+            return 2
         # detect format
         if args.format:
             fmt = args.format.lower().lstrip(".")
@@ -333,54 +1169,106 @@ def main(argv: Sequence[str] | None = None) -> int:
 
         # read records
         try:
-            table = reader.read(args.path, **kwargs)
-            records = table.as_records()
+            records, smp = _load_records(args, reader, fmt, kwargs)
             # run analysis + validation
-            rep = analysis.analyze(records, top_k=args.top_k)
+            rep = analysis.analyze(records, top_k=args.top_k, **_analysis_options(args))
+            grep = _group_by(records, args) if args.by else None
+            tb = _time_buckets(records, args) if args.time_bucket else None
+            corr = (
+                analysis.correlation(records, method=args.corr, infer_types=args.infer_types)
+                if args.corr
+                else None
+            )
             if args.schema:
-                with open(args.schema, encoding="utf-8") as f:
-                    schema = json.load(f)
+                schema = _load_schema(args.schema)
             else:
                 schema = {}
                 print("No schema provided, skipping rule checks.")
-            vrep = validation.validate(records, schema)
+            vrep = validation.validate(records, schema, **_validation_options(args))
 
             # generate charts
             if args.hist:
-                save_histogram(records, column=args.hist, out_path=args.hist_out)
+                save_histogram(
+                    records, column=args.hist, out_path=args.hist_out, **_hist_options(args)
+                )
             if args.bar:
-                save_bar_counts(records, column=args.bar, out_path=args.bar_out, top_k=args.top_k)
+                save_bar_counts(
+                    records,
+                    column=args.bar,
+                    out_path=args.bar_out,
+                    top_k=args.top_k,
+                    **_bar_options(args),
+                )
+            if corr is not None:
+                save_heatmap(corr, out_path=args.corr_out)
+            if tb is not None:
+                save_time_series(tb, out_path=args.time_out)
 
             # write markdown
             with open(args.out, "w", encoding="utf-8") as f:
                 f.write(f"# Report for {args.path}\n\n")
                 f.write("## Overview\n")
                 f.write(f"- Rows: {rep.rows}\n")
-                f.write(f"- Columns: {rep.columns}\n\n")
-
-                # numeric
-                f.write("## Numeric columns\n")
-                if not rep.numeric:
-                    f.write("- None\n")
-                else:
-                    for ns in rep.numeric:
-                        f.write(
-                            f"- {ns.column}: count={ns.count}, nulls={ns.nulls}, "
-                            f"distinct={ns.distinct}, min={ns.min}, max={ns.max}, mean={ns.mean}\n"
-                        )  # noqa: E501
+                f.write(f"- Columns: {rep.columns}\n")
+                if smp is not None:
+                    f.write(f"- Sampled: {_describe_sample(smp)}\n")
                 f.write("\n")
 
-                # categorical
-                f.write("## Categorical columns\n")
-                if not rep.categorical:
-                    f.write("- None\n")
-                else:
-                    for cs in rep.categorical:
+                _write_summaries_md(f, rep, args, "##")
+
+                # sample estimates
+                if smp is not None:
+                    f.write("## Sample estimates (95% CI)\n")
+                    for est in sampling.estimate_intervals(
+                        rep, population_rows=smp.population_rows
+                    ):
+                        f.write(f"- {_format_estimate(est)}\n")
+                    f.write("\n")
+
+                # groups
+                if grep is not None:
+                    f.write(f"## Groups by `{grep.by}`\n\n")
+                    for g in grep.groups:
+                        f.write(f"### {grep.by} = {g.key}\n")
+                        f.write(f"- Rows: {g.report.rows}\n\n")
+                        _write_summaries_md(f, g.report, args, "####")
+
+                # time buckets
+                if tb is not None:
+                    columns = list(
+                        dict.fromkeys(ns.column for b in tb.buckets for ns in b.report.numeric)
+                    )
+                    f.write(
+                        f"## Time buckets by `{tb.column}` "
+                        f"({timedelta(seconds=tb.bucket_seconds)})\n"
+                    )
+                    f.write(f"- Late rows (dropped): {tb.late_rows}\n")
+                    f.write(f"- Rows without a timestamp: {tb.untimed_rows}\n\n")
+                    f.write(
+                        "| bucket | rows | " + " | ".join(f"mean {c}" for c in columns) + " |\n"
+                    )
+                    f.write("|---" * (len(columns) + 2) + "|\n")
+                    for b in tb.buckets:
+                        means = {ns.column: ns.mean for ns in b.report.numeric}
+                        cells = (
+                            "-" if means.get(c) is None else f"{means[c]:.4g}" for c in columns
+                        )
                         f.write(
-                            f"- {cs.column}: count={cs.count}, nulls={cs.nulls}, "
-                            f"distinct={cs.distinct}, top={cs.top}\n"
+                            f"| {b.start.isoformat()} | {b.report.rows} | "
+                            + " | ".join(cells)
+                            + " |\n"
                         )
-                f.write("\n")
+                    f.write("\n")
+
+                # correlation
+                if corr is not None:
+                    f.write(f"## Correlation ({corr.method})\n")
+                    f.write("| | " + " | ".join(corr.columns) + " |\n")
+                    f.write("|---" * (len(corr.columns) + 1) + "|\n")
+                    for col, row in zip(corr.columns, corr.values, strict=True):
+                        cells = ("-" if v is None else f"{v:.3f}" for v in row)
+                        f.write(f"| {col} | " + " | ".join(cells) + " |\n")
+                    f.write("\n")
 
                 # validation
                 f.write("## Validation issues\n")
@@ -390,7 +1278,8 @@ def main(argv: Sequence[str] | None = None) -> int:
                     for issue in vrep.issues:
                         f.write(
                             f"- code={issue.code}, column={issue.column}, "
-                            f"count={issue.count}, examples={issue.examples}\n"
+                            f"count={_issue_count(issue)}, examples={issue.examples}"
+                            f"{_issue_groups(issue, ', ')}\n"
                         )
                 f.write("\n")
 
@@ -400,10 +1289,14 @@ def main(argv: Sequence[str] | None = None) -> int:
                     f.write(f"- Histogram for `{args.hist}`: ![]({args.hist_out})\n")
                 if args.bar:
                     f.write(f"- Bar chart for `{args.bar}`: ![]({args.bar_out})\n")
+                if corr is not None:
+                    f.write(f"- Correlation heatmap: ![]({args.corr_out})\n")
+                if tb is not None:
+                    f.write(f"- Time series by `{tb.column}`: ![]({args.time_out})\n")
 
             return 0
 
-        except (FileFormatError, ConfigurationError) as e:
+        except (FileFormatError, ConfigurationError, SchemaError) as e:
             print(f"Error: {e}", file=sys.stderr)
             return 2
         except Exception as e:
@@ -6,11 +6,17 @@ Responsibilities:
 - Determine whether the file is compressed or part of an archive.
 - Map detected formats to the appropriate reader functions or modules.
 - Handle special cases such as `.zip` files containing a single inner path.
+- Offer streaming record batches for formats whose readers can stream (see stream_batches),
+  and re-iterable streamed records for consumers that read the data twice (stream_records).
 """
 
 import importlib
+from collections.abc import Generator, Iterator
 from pathlib import Path
 from types import ModuleType
+from typing import Any
+
+STREAMING_FORMATS = ("csv", "tsv", "jsonl")
 
 
 def detect_format(path: str | Path, hint: str | None = None) -> str | None:
@@ -113,3 +119,62 @@ def choose_reader(fmt: str) -> ModuleType | None:
         return None
 
     return importlib.import_module(module_path)
+
+
+def _streamable(p: Path, fmt: str) -> bool:
+    return fmt in STREAMING_FORMATS and p.suffix.lower() not in {".gz", ".zip"}
+
+
+def stream_batches(
+    path: str | Path, fmt: str, *, batch_rows: int = 10_000
+) -> Generator[list[dict[str, Any]], None, None] | None:
+    """
+    Record batches read lazily from an uncompressed CSV/TSV/JSONL file.
+
+    Returns None when the format or a compressed file cannot be streamed; callers then fall
+    back to the reader's read(). Closing the generator early closes the file, so consumers
+    that stop early (e.g. validation with an issue budget) do not read the rest.
+    """
+    p = Path(path)
+    if not _streamable(p, fmt):
+        return None
+    reader = choose_reader(fmt)
+    assert reader is not None
+
+    def batches() -> Generator[list[dict[str, Any]], None, None]:
+        it = reader.iter_batches(p, batch_rows=batch_rows)
+        try:
+            for batch, _ in it:
+                if batch:
+                    yield batch
+        finally:
+            it.close()
+
+    return batches()
+
+
+class StreamedRecords:
+    """Records of a streamable file; every iteration reads the file again from the start."""
+
+    def __init__(self, path: str | Path, fmt: str, *, batch_rows: int = 10_000) -> None:
+        self.path = Path(path)
+        self.fmt = fmt
+        self.batch_rows = batch_rows
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        batches = stream_batches(self.path, self.fmt, batch_rows=self.batch_rows)
+        assert batches is not None
+        try:
+            for batch in batches:
+                yield from batch
+        finally:
+            batches.close()
+
+
+def stream_records(
+    path: str | Path, fmt: str, *, batch_rows: int = 10_000
+) -> StreamedRecords | None:
+    """Re-iterable records of an uncompressed CSV/TSV/JSONL file; None when it cannot stream."""
+    if not _streamable(Path(path), fmt):
+        return None
+    return StreamedRecords(path, fmt, batch_rows=batch_rows)
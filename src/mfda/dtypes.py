@@ -0,0 +1,196 @@
+"""
+Logical dtype classification
+
+Decides a column's logical dtype from a probe sample instead of type-checking every value:
+- classify(): looks at up to PROBE_SIZE non-null values (spread evenly over the batch) and
+  commits to the first of bool, int, float, datetime that parses at least THRESHOLD of them,
+  otherwise string.
+- coerce(): parses a whole batch to the committed dtype in one pass; values that do not parse
+  become None and are counted as failures (not as nulls).
+
+Notes:
+- Strings are parsed strictly: no thousands separators or underscores, and integers with
+  leading zeros ("02134") stay strings so identifiers and zip codes are not turned into numbers.
+- An int column that meets a float value ("1.5") is widened to float instead of counting a
+  failure.
+- Only "true"/"false" (any case) are booleans; "0"/"1" classify as int.
+- datetime columns get a format detected once from the probe (ISO-8601 first, then a few
+  common day/month layouts; dd/mm wins over mm/dd when both parse) and are parsed with a
+  parser specialized to that format, which also caches repeated strings (log timestamps
+  repeat a lot). Values are normalized to aware UTC datetimes; naive inputs are taken as UTC.
+"""
+
+import functools
+import re
+from collections.abc import Callable, Sequence
+from datetime import date, datetime, timezone
+from typing import Any
+
+DTYPES = ("bool", "int", "float", "datetime", "string")
+PROBE_SIZE = 1_000
+THRESHOLD = 0.95
+
+_INT_RE = re.compile(r"[+-]?(?:0|[1-9]\d*)")
+_FLOAT_RE = re.compile(r"[+-]?(?:(?:0|[1-9]\d*)(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?")
+_BOOLS = {"true": True, "false": False}
+
+
+def _parse_bool(v: Any) -> bool:
+    if isinstance(v, bool):
+        return v
+    if isinstance(v, str) and v.strip().lower() in _BOOLS:
+        return _BOOLS[v.strip().lower()]
+    raise ValueError(v)
+
+
+def _parse_int(v: Any) -> int:
+    if isinstance(v, bool):
+        raise ValueError(v)
+    if isinstance(v, int):
+        return v
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    if isinstance(v, str) and _INT_RE.fullmatch(v.strip()):
+        return int(v)
+    raise ValueError(v)
+
+
+def _parse_float(v: Any) -> float:
+    if isinstance(v, bool):
+        raise ValueError(v)
+    if isinstance(v, int | float):
+        return float(v)
+    if isinstance(v, str) and _FLOAT_RE.fullmatch(v.strip()):
+        return float(v)
+    raise ValueError(v)
+
+
+DATETIME_FORMATS = (
+    "iso",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y",
+    "%d.%m.%Y %H:%M:%S",
+    "%d.%m.%Y",
+)
+PARSE_CACHE_SIZE = 65_536
+
+
+def _to_utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+@functools.cache
+def datetime_parser(fmt: str) -> Callable[[Any], datetime]:
+    """Parser for one datetime format ("iso" or a strptime pattern), returning UTC datetimes."""
+    if fmt not in DATETIME_FORMATS:
+        raise ValueError(f"Unknown datetime format: {fmt}")
+
+    def base(text: str) -> datetime:
+        if fmt != "iso":
+            return datetime.strptime(text, fmt)
+        if text[-1:] in ("Z", "z"):  # fromisoformat only accepts "Z" from Python 3.11
+            text = text[:-1] + "+00:00"
+        return datetime.fromisoformat(text)
+
+    @functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+    def parse_text(text: str) -> datetime:
+        return _to_utc(base(text.strip()))
+
+    def parse(v: Any) -> datetime:
+        if isinstance(v, datetime):
+            return _to_utc(v)
+        if isinstance(v, date):
+            return datetime(v.year, v.month, v.day, tzinfo=timezone.utc)
+        if isinstance(v, str):
+            return parse_text(v)
+        raise ValueError(v)
+
+    return parse
+
+
+def detect_datetime_format(values: Sequence[Any]) -> str | None:
+    """First format in DATETIME_FORMATS that parses at least THRESHOLD of the non-null values."""
+    probe = _probe(values)
+    if not probe:
+        return None
+    for fmt in DATETIME_FORMATS:
+        if sum(_parses(datetime_parser(fmt), v) for v in probe) >= THRESHOLD * len(probe):
+            return fmt
+    return None
+
+
+def best_datetime_format(values: Sequence[Any]) -> str | None:
+    """Format in DATETIME_FORMATS that parses the most probed values (first wins ties)."""
+    probe = _probe(values)
+    if not probe:
+        return None
+    scores = [sum(_parses(datetime_parser(f), v) for v in probe) for f in DATETIME_FORMATS]
+    return DATETIME_FORMATS[scores.index(max(scores))]
+
+
+def _parse_string(v: Any) -> Any:
+    return v
+
+
+PARSERS: dict[str, Callable[[Any], Any]] = {
+    "bool": _parse_bool,
+    "int": _parse_int,
+    "float": _parse_float,
+    "datetime": datetime_parser("iso"),
+    "string": _parse_string,
+}
+
+
+def _parses(parser: Callable[[Any], Any], v: Any) -> bool:
+    try:
+        parser(v)
+    except (ValueError, OverflowError):
+        return False
+    return True
+
+
+def _probe(values: Sequence[Any]) -> list[Any]:
+    non_null = [v for v in values if v is not None]
+    step = max(1, len(non_null) // PROBE_SIZE)
+    return non_null[::step][:PROBE_SIZE]
+
+
+def classify(values: Sequence[Any]) -> str | None:
+    """Logical dtype for a batch of raw values; None when the batch has no non-null values."""
+    probe = _probe(values)
+    if not probe:
+        return None
+    need = THRESHOLD * len(probe)
+    for dtype in ("bool", "int", "float"):
+        if sum(_parses(PARSERS[dtype], v) for v in probe) >= need:
+            return dtype
+    if detect_datetime_format(probe) is not None:
+        return "datetime"
+    return "string"
+
+
+def coerce(
+    values: Sequence[Any], dtype: str, datetime_format: str = "iso"
+) -> tuple[list[Any], int, str]:
+    """Parse a batch to `dtype`; returns (values, failures, dtype) with int possibly widened."""
+    parser = datetime_parser(datetime_format) if dtype == "datetime" else PARSERS[dtype]
+    out: list[Any] = []
+    failures = 0
+    for v in values:
+        if v is None:
+            out.append(None)
+            continue
+        try:
+            out.append(parser(v))
+        except (ValueError, OverflowError):
+            if dtype == "int" and _parses(_parse_float, v):
+                dtype, parser = "float", _parse_float
+                out.append(parser(v))
+                continue
+            out.append(None)
+            failures += 1
+    return out, failures, dtype
@@ -26,3 +26,9 @@ class ConfigurationError(Exception):
     """Raised with config problems"""
 
     pass
+
+
+class SchemaError(Exception):
+    """Raised when a validation schema is malformed"""
+
+    pass
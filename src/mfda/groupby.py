@@ -0,0 +1,193 @@
+"""
+Group-by analysis (hash aggregation)
+
+Computes the usual NumericSummary / CategoricalSummary per value of a grouping column in one
+pass over the records:
+- Each group owns an analysis.PartialAnalysis; rows are buffered per group and folded in with
+  analyze_partial() in batches, so per-row overhead stays low.
+- At most `max_groups` groups are aggregated in memory, and no new group is admitted once
+  the estimated size of the groups' states (PartialAnalysis.approx_bytes(), re-measured as
+  each group is folded in) reaches `max_bytes`. Rows of any further group are spilled to hash
+  partitions on disk and each partition is aggregated afterwards the same way (recursively,
+  with a different hash salt per level), so memory is bounded by the budget rather than by
+  the number of distinct keys or columns.
+
+Notes:
+- The grouping column itself is left out of the per-group summaries.
+- Null keys form their own group.
+- Groups are reported sorted by key (as string), nulls last.
+"""
+
+import pickle
+import tempfile
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from mfda.analysis import (
+    AnalysisOptions,
+    AnalysisReport,
+    PartialAnalysis,
+    analyze_partial,
+    finalize,
+)
+from mfda.sketches import stable_hash
+
+SPILL_PARTITIONS = 16
+SPILL_CHUNK = 1_000
+MAX_GROUP_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class GroupReport:
+    key: Any
+    report: AnalysisReport
+
+
+@dataclass
+class GroupedAnalysisReport:
+    by: str
+    groups: list[GroupReport]
+    spilled_partitions: int = 0  # partitions written to disk because of max_groups
+
+
+def _read_spill(path: Path) -> Iterator[dict[str, Any]]:
+    with open(path, "rb") as fp:
+        while True:
+            try:
+                chunk = pickle.load(fp)  # noqa: S301 - temp file written by _aggregate
+            except EOFError:
+                return
+            yield from chunk
+
+
+def _aggregate(
+    records: Iterable[dict[str, Any]],
+    by: str,
+    options: AnalysisOptions,
+    *,
+    top_k: int,
+    max_groups: int,
+    max_bytes: int,
+    batch_rows: int,
+    spill_dir: str,
+    depth: int,
+    out: list[GroupReport],
+) -> int:
+    partials: dict[Any, PartialAnalysis] = {}
+    buffers: dict[Any, list[dict[str, Any]]] = {}
+    sizes: dict[Any, int] = {}  # estimated bytes per group state
+    used = 0
+    buffered = 0
+    spill_files: list[IO[bytes]] = []
+    spill_buffers: list[list[dict[str, Any]]] = []
+
+    def flush() -> None:
+        nonlocal used
+        for key, rows in buffers.items():
+            if rows:
+                part = partials[key]
+                part.merge(analyze_partial(rows, options, column_types=part.column_types()))
+                rows.clear()
+                size = part.approx_bytes()
+                used += size - sizes[key]
+                sizes[key] = size
+
+    def spill(part: int) -> None:
+        pickle.dump(spill_buffers[part], spill_files[part], protocol=pickle.HIGHEST_PROTOCOL)
+        spill_buffers[part] = []
+
+    for r in records:
+        key = r.get(by)
+        rows = buffers.get(key)
+        if rows is None and len(partials) < max_groups and used < max_bytes:
+            partials[key] = PartialAnalysis(0, {}, options)
+            rows = buffers[key] = []
+            # until measured: an average group, and at least an empty state per column
+            sizes[key] = max(used // len(sizes) if sizes else 0, 200 * len(r))
+            used += sizes[key]
+        if rows is None:
+            if not spill_files:
+                for i in range(SPILL_PARTITIONS):
+                    path = Path(spill_dir) / f"level{depth}-part{i}.pkl"
+                    spill_files.append(open(path, "wb"))
+                    spill_buffers.append([])
+            part = stable_hash((depth, key)) % SPILL_PARTITIONS
+            spill_buffers[part].append(r)
+            if len(spill_buffers[part]) >= SPILL_CHUNK:
+                spill(part)
+            continue
+        rows.append({k: v for k, v in r.items() if k != by})
+        buffered += 1
+        if buffered >= batch_rows:
+            flush()
+            buffered = 0
+    flush()
+
+    for key, partial in partials.items():
+        out.append(GroupReport(key, finalize(partial, top_k=top_k)))
+    partials.clear()
+
+    spilled = 0
+    for i, fp in enumerate(spill_files):
+        if spill_buffers[i]:
+            spill(i)
+        fp.close()
+        path = Path(fp.name)
+        if path.stat().st_size:
+            spilled += 1 + _aggregate(
+                _read_spill(path),
+                by,
+                options,
+                top_k=top_k,
+                max_groups=max_groups,
+                max_bytes=max_bytes,
+                batch_rows=batch_rows,
+                spill_dir=spill_dir,
+                depth=depth + 1,
+                out=out,
+            )
+        path.unlink()
+    return spilled
+
+
+def analyze_by(
+    records: Iterable[dict[str, Any]],
+    by: str,
+    *,
+    top_k: int = 3,
+    top_k_mode: str = "exact",
+    top_k_capacity: int = 1024,
+    quantiles: Sequence[float] = (),
+    quantile_k: int = 200,
+    engine: str = "python",
+    infer_types: bool = True,
+    max_groups: int = 10_000,
+    max_bytes: int = MAX_GROUP_BYTES,
+    batch_rows: int = 10_000,
+    spill_dir: str | None = None,
+) -> GroupedAnalysisReport:
+    if max_groups < 1:
+        raise ValueError("max_groups must be >= 1")
+    if max_bytes < 1:
+        raise ValueError("max_bytes must be >= 1")
+    options = AnalysisOptions(
+        top_k_mode, top_k_capacity, tuple(quantiles), quantile_k, engine, infer_types
+    )
+    groups: list[GroupReport] = []
+    with tempfile.TemporaryDirectory(prefix="mfda-groupby-", dir=spill_dir) as tmp:
+        spilled = _aggregate(
+            records,
+            by,
+            options,
+            top_k=top_k,
+            max_groups=max_groups,
+            max_bytes=max_bytes,
+            batch_rows=batch_rows,
+            spill_dir=tmp,
+            depth=0,
+            out=groups,
+        )
+    groups.sort(key=lambda g: (g.key is None, str(g.key)))
+    return GroupedAnalysisReport(by, groups, spilled)
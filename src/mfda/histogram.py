@@ -0,0 +1,222 @@
+"""
+Streaming histograms
+
+Computes histogram bin counts batch by batch, so charting a column never holds the column in
+memory and plotting cost depends on the number of bins, not rows:
+- binning="minmax" (default): one pass for the exact min and max, then `bins` equal-width
+  bins over [min, max] counted with np.histogram per batch. Same bins as matplotlib's
+  ax.hist(values, bins).
+- binning="quantile": one pass feeding a KLL sketch, then equal-width bins over the
+  sketch's [0.5%, 99.5%] quantile range; values outside it are counted in the outer bins
+  (`clipped`), so a few extreme values do not squeeze the rest into one bar.
+- binning="adaptive": a single pass with a fixed budget of equal-width bins. Bins start on
+  the first batch's range; when a value falls outside, the bin width doubles (adjacent bins
+  are merged) until the range covers it. Counts are exact; bins are aligned to that grid, so
+  between bins/2 and bins of them are used. Works on one-shot iterators.
+
+Notes:
+- Numbers and numeric strings are counted; nulls, other values, NaN and infinities are not.
+- minmax and quantile read the records twice, so they must be a re-iterable collection.
+"""
+
+import math
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from mfda.sketches import KLLSketch
+
+BINNINGS = ("minmax", "quantile", "adaptive")
+CLIP_QUANTILES = (0.005, 0.995)
+
+
+@dataclass
+class Histogram:
+    column: str
+    edges: np.ndarray  # len(counts) + 1 bin edges
+    counts: np.ndarray  # values per bin (int64)
+    total: int  # values counted
+    clipped: int = 0  # values outside the edges, counted in the outer bins
+
+
+def numeric_values(values: Iterable[Any]) -> np.ndarray:
+    """Finite numeric values (numbers, or strings that parse as floats) as a float64 array."""
+    out: list[float] = []
+    for val in values:
+        if isinstance(val, (int, float)):  # noqa: UP038
+            out.append(val)
+        elif isinstance(val, str):
+            try:
+                out.append(float(val))
+            except ValueError:
+                continue
+    arr = np.asarray(out, dtype=np.float64)
+    return arr[np.isfinite(arr)]
+
+
+def column_batches(
+    records: Iterable[dict[str, Any]], column: str, batch_rows: int = 10_000
+) -> Iterator[np.ndarray]:
+    """Numeric values of `column`, one array per batch of `batch_rows` records."""
+    batch: list[Any] = []
+    for record in records:
+        batch.append(record.get(column))
+        if len(batch) >= batch_rows:
+            yield numeric_values(batch)
+            batch = []
+    if batch:
+        yield numeric_values(batch)
+
+
+class BinCounter:
+    """Counts values into fixed edges; with clip=True outliers go to the outer bins."""
+
+    def __init__(self, edges: np.ndarray, *, clip: bool = False) -> None:
+        self.edges = edges
+        self.clip = clip
+        self.counts = np.zeros(len(edges) - 1, dtype=np.int64)
+        self.total = 0
+        self.clipped = 0
+
+    def update(self, values: np.ndarray) -> None:
+        if not values.size:
+            return
+        if self.clip:
+            lo, hi = self.edges[0], self.edges[-1]
+            self.clipped += int(np.count_nonzero((values < lo) | (values > hi)))
+            values = np.clip(values, lo, hi)
+        self.counts += np.histogram(values, bins=self.edges)[0]
+        self.total += values.size
+
+    def result(self, column: str) -> Histogram:
+        return Histogram(column, self.edges, self.counts, self.total, self.clipped)
+
+
+class AdaptiveHistogram:
+    """One-pass histogram with a fixed bin budget; bins merge pairwise as the range grows."""
+
+    def __init__(self, bins: int = 10) -> None:
+        if bins < 1:
+            raise ValueError("bins must be >= 1")
+        self.bins = bins + bins % 2  # even, so bins can merge in pairs
+        self.origin = 0.0
+        self.width = 0.0  # 0 until the first value
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+        self.total = 0
+
+    def _grow(self, lo: float, hi: float) -> None:
+        half = self.bins // 2
+        while lo < self.origin or hi > self.origin + self.bins * self.width:
+            merged = self.counts.reshape(half, 2).sum(axis=1)
+            counts = np.zeros(self.bins, dtype=np.int64)
+            if lo < self.origin:  # the old range becomes the upper half
+                self.origin -= self.bins * self.width
+                counts[half:] = merged
+            else:
+                counts[:half] = merged
+            self.counts = counts
+            self.width *= 2
+
+    def update(self, values: np.ndarray) -> None:
+        if not values.size:
+            return
+        lo, hi = float(values.min()), float(values.max())
+        if self.width == 0.0:
+            self.origin = lo
+            self.width = (hi - lo) / self.bins if hi > lo else (abs(lo) or 1.0) / self.bins
+        self._grow(lo, hi)
+        idx = np.floor((values - self.origin) / self.width).astype(np.int64)
+        np.clip(idx, 0, self.bins - 1, out=idx)  # the top edge belongs to the last bin
+        self.counts += np.bincount(idx, minlength=self.bins)
+        self.total += values.size
+
+    def result(self, column: str) -> Histogram:
+        used = np.flatnonzero(self.counts)
+        first, last = (int(used[0]), int(used[-1]) + 1) if used.size else (0, 0)
+        edges = self.origin + self.width * np.arange(first, last + 1, dtype=np.float64)
+        return Histogram(column, edges, self.counts[first:last], self.total)
+
+
+class StreamingHistogram:
+    """Histogram of one column fed batch by batch; bins other than adaptive need a 2nd pass.
+
+    update() takes the first pass; when `passes` is 2, count() takes the same values again
+    once the bins are fixed.
+    """
+
+    def __init__(self, bins: int = 10, binning: str = "minmax") -> None:
+        if binning not in BINNINGS:
+            raise ValueError(f"Unknown binning: {binning}")
+        if bins < 1:
+            raise ValueError("bins must be >= 1")
+        self.bins = bins
+        self.binning = binning
+        self.passes = 1 if binning == "adaptive" else 2
+        self.adaptive = AdaptiveHistogram(bins) if binning == "adaptive" else None
+        self.sketch = KLLSketch() if binning == "quantile" else None
+        self.low, self.high = math.inf, -math.inf
+        self.counter: BinCounter | None = None
+
+    def update(self, values: np.ndarray) -> None:
+        if self.adaptive is not None:
+            self.adaptive.update(values)
+        elif values.size:
+            self.low = min(self.low, float(values.min()))
+            self.high = max(self.high, float(values.max()))
+            if self.sketch is not None:
+                self.sketch.update(values.tolist())
+
+    def _edges(self) -> np.ndarray | None:
+        if self.low > self.high:
+            return None
+        lo, hi = self.low, self.high
+        if self.sketch is not None:
+            q_lo, q_hi = self.sketch.quantiles(CLIP_QUANTILES)
+            if q_lo is not None and q_hi is not None and q_lo < q_hi:
+                lo, hi = q_lo, q_hi
+        if lo == hi:  # same widening as np.histogram for a single distinct value
+            lo, hi = lo - 0.5, hi + 0.5
+        return np.linspace(lo, hi, self.bins + 1)
+
+    def count(self, values: np.ndarray) -> None:
+        if self.counter is None:
+            edges = self._edges()
+            if edges is None:
+                return
+            self.counter = BinCounter(edges, clip=self.sketch is not None)
+        self.counter.update(values)
+
+    def result(self, column: str) -> Histogram | None:
+        """The histogram; None when no numeric value was seen."""
+        hist = self.adaptive.result(column) if self.adaptive is not None else None
+        if self.counter is not None:
+            hist = self.counter.result(column)
+        return hist if hist is not None and hist.total else None
+
+
+def compute_histogram(
+    records: Iterable[dict[str, Any]],
+    column: str,
+    *,
+    bins: int = 10,
+    binning: str = "minmax",
+    batch_rows: int = 10_000,
+) -> Histogram:
+    """Bin counts of the numeric values of `column`; raises ValueError when there are none."""
+    builder = StreamingHistogram(bins, binning)
+    if builder.passes > 1 and iter(records) is records:
+        raise ValueError(
+            f"binning={binning!r} reads the records twice; use binning='adaptive' for a "
+            "one-shot iterator"
+        )
+    for values in column_batches(records, column, batch_rows):
+        builder.update(values)
+    if builder.passes > 1:
+        for values in column_batches(records, column, batch_rows):
+            builder.count(values)
+    hist = builder.result(column)
+    if hist is None:
+        raise ValueError(f"No numeric data in column {column}")
+    return hist
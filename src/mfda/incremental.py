@@ -0,0 +1,168 @@
+"""
+Incremental analysis of append-only files
+
+`analyze` over a growing JSONL/CSV log normally rescans from byte zero. Here the mergeable
+analysis state (see analysis.PartialAnalysis) is persisted together with:
+- the byte offset up to which rows have been consumed,
+- a fingerprint of that prefix (its length plus its first and last 64 KiB),
+- the CSV header (so later runs can parse rows that start mid-file).
+
+The next run reopens the state, checks the fingerprint, and only parses bytes after the
+offset. If the file shrank, the fingerprint differs, or the analysis options changed, the
+state is discarded and the file is rescanned in full.
+
+Notes:
+- Only uncompressed CSV/TSV and JSONL files are supported (offsets must be seekable).
+- A trailing line without a newline is treated as in-progress and picked up next run.
+- The state file is a pickle written by mfda itself; do not load state files from
+  untrusted sources.
+"""
+
+import hashlib
+import os
+import pickle
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from mfda import analysis
+from mfda.errors import ConfigurationError
+from mfda.readers import csv_reader, json_reader
+
+STATE_VERSION = 3
+FINGERPRINT_BLOCK = 64 * 1024
+INCREMENTAL_FORMATS = ("csv", "tsv", "jsonl")
+
+
+@dataclass
+class AnalysisState:
+    version: int
+    path: str
+    fmt: str
+    offset: int
+    fingerprint: str
+    header: list[str] | None
+    partial: analysis.PartialAnalysis
+
+
+@dataclass
+class IncrementalResult:
+    report: analysis.AnalysisReport
+    resumed: bool  # False when the file was (re)scanned from the start
+    start_offset: int
+    end_offset: int
+    new_rows: int
+
+
+def fingerprint(path: str | Path, offset: int) -> str:
+    """Fingerprint of the first `offset` bytes: length + head block + tail block."""
+    h = hashlib.sha256(str(offset).encode())
+    with open(path, "rb") as fp:
+        h.update(fp.read(min(offset, FINGERPRINT_BLOCK)))
+        fp.seek(max(0, offset - FINGERPRINT_BLOCK))
+        h.update(fp.read(min(offset, FINGERPRINT_BLOCK)))
+    return h.hexdigest()
+
+
+def load_state(state_path: str | Path) -> AnalysisState | None:
+    try:
+        with open(state_path, "rb") as fp:
+            state = pickle.load(fp)  # noqa: S301 - local cache written by save_state
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    if not isinstance(state, AnalysisState) or state.version != STATE_VERSION:
+        return None
+    return state
+
+
+def save_state(state: AnalysisState, state_path: str | Path) -> None:
+    tmp = f"{state_path}.tmp"
+    with open(tmp, "wb") as fp:
+        pickle.dump(state, fp, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, state_path)
+
+
+def _usable(
+    state: AnalysisState | None, path: Path, fmt: str, options: analysis.AnalysisOptions
+) -> bool:
+    if state is None:
+        return False
+    if state.path != str(path.resolve()) or state.fmt != fmt:
+        return False
+    if state.partial.options != options:
+        return False
+    if path.stat().st_size < state.offset:
+        return False
+    return fingerprint(path, state.offset) == state.fingerprint
+
+
+def _batches(
+    path: Path, fmt: str, offset: int | None, header: list[str] | None, batch_rows: int
+) -> Iterator[tuple[list[dict[str, Any]], int]]:
+    if fmt == "jsonl":
+        return json_reader.iter_batches(
+            path, offset=offset or 0, batch_rows=batch_rows, wait_for_newline=True
+        )
+    return csv_reader.iter_batches(
+        path, offset=offset, header=header, batch_rows=batch_rows, wait_for_newline=True
+    )
+
+
+def analyze_incremental(
+    path: str | Path,
+    state_path: str | Path,
+    *,
+    fmt: str,
+    top_k: int = 3,
+    options: analysis.AnalysisOptions | None = None,
+    workers: int = 1,
+    batch_rows: int = 50_000,
+) -> IncrementalResult:
+    """Resume analysis of an append-only file from its persisted state and save the new state."""
+    if fmt not in INCREMENTAL_FORMATS:
+        raise ConfigurationError(f"incremental analysis supports csv, tsv and jsonl, not {fmt}")
+    p = Path(path)
+    if p.suffix.lower() in {".gz", ".zip"}:
+        raise ConfigurationError("incremental analysis needs an uncompressed file")
+    options = options or analysis.AnalysisOptions()
+
+    state = load_state(state_path)
+    if state is not None and _usable(state, p, fmt, options):
+        resumed = True
+    else:
+        header = None
+        if fmt != "jsonl":
+            header, _ = csv_reader.read_header(p)
+        state = AnalysisState(
+            STATE_VERSION,
+            str(p.resolve()),
+            fmt,
+            0,
+            "",
+            header,
+            analysis.PartialAnalysis(0, {}, options),
+        )
+        resumed = False
+
+    start = state.offset
+    new_rows = 0
+    offset: int | None = state.offset if resumed else None
+    with analysis.worker_pool(workers) as pool:
+        for records, end in _batches(p, fmt, offset, state.header, batch_rows):
+            part = analysis.analyze_partial(
+                records,
+                options,
+                workers=workers,
+                executor=pool,
+                column_types=state.partial.column_types(),
+            )
+            state.partial.merge(part)
+            state.offset = end
+            new_rows += len(records)
+
+    state.fingerprint = fingerprint(p, state.offset)
+    save_state(state, state_path)
+    return IncrementalResult(
+        analysis.finalize(state.partial, top_k=top_k), resumed, start, state.offset, new_rows
+    )
@@ -0,0 +1,176 @@
+"""
+Persistent key index for foreign-key checks
+
+Stores the distinct non-null values of one column of a (parent) file as a sorted file of
+fixed-width 128-bit digests, so a child dataset can be checked against it without loading
+the parent:
+- build_index() streams the parent's values, sorts digests in memory-bounded runs of
+  `run_keys` and merges the runs into one deduplicated file (external merge sort).
+- KeyIndex memory-maps that file; membership is a binary search over the mapping, so only
+  the touched pages are read.
+- open_index() caches indexes under `index_dir` by a fingerprint of the parent file (size,
+  mtime, head and tail blocks), the column and the format. A later check against an
+  unchanged parent reuses the index; a changed parent gets a new one.
+
+Notes:
+- Keys are compared as text (digest of str(value)), so 42 in a JSON file matches "42" in a
+  CSV file.
+- The default index_dir is $MFDA_CACHE_DIR, else $XDG_CACHE_HOME/mfda/keys, else
+  ~/.cache/mfda/keys. Stale indexes are not removed automatically.
+"""
+
+import hashlib
+import heapq
+import itertools
+import mmap
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from mfda.dispatch import choose_reader, detect_format, stream_batches
+from mfda.errors import ConfigurationError
+from mfda.incremental import fingerprint
+from mfda.sketches import DIGEST_SIZE, key_digest
+
+INDEX_VERSION = 1
+RUN_KEYS = 1_000_000
+
+
+def default_index_dir() -> Path:
+    if os.environ.get("MFDA_CACHE_DIR"):
+        return Path(os.environ["MFDA_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "mfda" / "keys"
+
+
+def text_digest(value: Any) -> bytes:
+    return key_digest(value if isinstance(value, str) else str(value))
+
+
+class KeyIndex:
+    """Read-only view of a sorted digest file; `digest in index` is a binary search."""
+
+    def __init__(self, path: str | Path, *, reused: bool = False) -> None:
+        self.path = Path(path)
+        self.reused = reused  # True when an existing cached index was opened
+        self.count = self.path.stat().st_size // DIGEST_SIZE
+        self._map: mmap.mmap | None = None
+
+    def _view(self) -> mmap.mmap:
+        if self._map is None:
+            with open(self.path, "rb") as fp:
+                self._map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def __contains__(self, digest: object) -> bool:
+        if not isinstance(digest, bytes) or self.count == 0:
+            return False
+        view = self._view()
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if view[mid * DIGEST_SIZE : (mid + 1) * DIGEST_SIZE] < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < self.count and view[lo * DIGEST_SIZE : (lo + 1) * DIGEST_SIZE] == digest
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        # the mapping is reopened on first use in the receiving process
+        return {**self.__dict__, "_map": None}
+
+
+def _read_run(path: Path) -> Iterator[bytes]:
+    with open(path, "rb") as fp:
+        while chunk := fp.read(DIGEST_SIZE * 4096):
+            for i in range(0, len(chunk), DIGEST_SIZE):
+                yield chunk[i : i + DIGEST_SIZE]
+
+
+def _write_sorted(digests: Iterable[bytes], path: Path) -> int:
+    count = 0
+    last = None
+    with open(path, "wb") as fp:
+        buf = bytearray()
+        for d in digests:
+            if d == last:
+                continue
+            buf += d
+            last = d
+            count += 1
+            if len(buf) >= 1 << 16:
+                fp.write(buf)
+                buf.clear()
+        fp.write(buf)
+    return count
+
+
+def build_index(
+    records: Iterable[dict[str, Any]],
+    column: str,
+    out_path: str | Path,
+    *,
+    run_keys: int = RUN_KEYS,
+) -> int:
+    """Write the sorted distinct digests of `column` to out_path; returns the key count."""
+    if run_keys < 1:
+        raise ValueError("run_keys must be >= 1")
+    out = Path(out_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp")
+    values = (r.get(column) for r in records)
+    digests = (text_digest(v) for v in values if v is not None)
+    with tempfile.TemporaryDirectory(prefix="mfda-keys-", dir=out.parent) as work:
+        runs: list[Path] = []
+        while run := set(itertools.islice(digests, run_keys)):
+            runs.append(Path(work) / f"run{len(runs)}.bin")
+            _write_sorted(sorted(run), runs[-1])
+        count = _write_sorted(heapq.merge(*(_read_run(r) for r in runs)), tmp)
+    os.replace(tmp, out)
+    return count
+
+
+def _parent_records(path: Path, fmt: str) -> Iterator[dict[str, Any]]:
+    batches = stream_batches(path, fmt)
+    if batches is not None:
+        for batch in batches:
+            yield from batch
+        return
+    reader = choose_reader(fmt)
+    if reader is None:
+        raise ConfigurationError(f"no reader available for format: {fmt}")
+    yield from reader.read(path, limit=None).as_records()
+
+
+def open_index(
+    path: str | Path,
+    column: str,
+    *,
+    fmt: str | None = None,
+    index_dir: str | Path | None = None,
+) -> KeyIndex:
+    """Index of `column` in the file at `path`, reusing a cached one when the file is unchanged."""
+    p = Path(path)
+    fmt = fmt or detect_format(p)
+    if fmt is None:
+        raise ConfigurationError(f"unknown or unsupported format for {p}")
+    st = p.stat()
+    parts = [INDEX_VERSION, p.resolve(), fmt, column, st.st_mtime_ns, fingerprint(p, st.st_size)]
+    key = "\0".join(map(str, parts))
+    name = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + ".keys"
+    target = Path(index_dir) if index_dir is not None else default_index_dir()
+    cached = target / name
+    if cached.exists():
+        return KeyIndex(cached, reused=True)
+    build_index(_parent_records(p, fmt), column, cached)
+    return KeyIndex(cached)
@@ -16,11 +16,18 @@ CSV/TSV Reader Plugin
   - `FileFormatError` for malformed rows or delimiter mismatch
   - `ConfigurationError` for invalid options
 - **Returns**: a `Table`
+
+Streaming: `iter_batches()` yields `(records, end_offset)` batches with the same row policy as
+`read()` (malformed/empty rows skipped, empty cells -> NULL). `end_offset` is the byte offset
+just past the last consumed row, so a caller can resume later with `offset=` and the `header`
+from `read_header()`. With `wait_for_newline=True` a trailing line without a newline (a writer
+mid-append) is left unconsumed.
 """
 
 import csv
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 # Defaults & sentinel for the CSV/TSV reader contract
 DEFAULT_DELIMITER_CSV = ","
@@ -41,6 +48,89 @@ class _Table:
         return [dict(zip(self.columns, row, strict=False)) for row in self._rows]
 
 
+def _choose_delimiter(p: Path, delimiter: str | None) -> str:
+    if delimiter is not None:
+        return delimiter
+    if p.suffix.lower() == ".tsv":
+        return DEFAULT_DELIMITER_TSV
+    return DEFAULT_DELIMITER_CSV
+
+
+class _LineSource:
+    """Binary line iterator for csv.reader that tracks the byte offset of consumed lines."""
+
+    def __init__(self, fp: IO[bytes], offset: int, encoding: str, wait_for_newline: bool):
+        fp.seek(offset)
+        self._fp = fp
+        self._encoding = encoding
+        self._wait = wait_for_newline
+        self.pos = offset
+
+    def __iter__(self) -> "_LineSource":
+        return self
+
+    def __next__(self) -> str:
+        line = self._fp.readline()
+        if not line or (self._wait and not line.endswith(b"\n")):
+            raise StopIteration
+        self.pos += len(line)
+        return line.decode(self._encoding)
+
+
+def read_header(
+    path: str | Path,
+    *,
+    delimiter: str | None = None,
+    encoding: str = "utf-8",
+    quotechar: str = '"',
+    header_row: int = 0,
+) -> tuple[list[str], int]:
+    """Return the header and the byte offset of the first data row."""
+    p = Path(path)
+    with open(p, "rb") as fp:
+        source = _LineSource(fp, 0, encoding, wait_for_newline=False)
+        reader = csv.reader(source, delimiter=_choose_delimiter(p, delimiter), quotechar=quotechar)
+        for _ in range(header_row):
+            next(reader)
+        header = next(reader)
+        return header, source.pos
+
+
+def iter_batches(
+    path: str | Path,
+    *,
+    offset: int | None = None,
+    header: list[str] | None = None,
+    delimiter: str | None = None,
+    encoding: str = "utf-8",
+    quotechar: str = '"',
+    header_row: int = 0,
+    batch_rows: int = 10_000,
+    wait_for_newline: bool = False,
+) -> Iterator[tuple[list[dict[str, Any]], int]]:
+    p = Path(path)
+    if offset is None or header is None:
+        header, start = read_header(
+            p, delimiter=delimiter, encoding=encoding, quotechar=quotechar, header_row=header_row
+        )
+        offset = start if offset is None else offset
+    chosen = _choose_delimiter(p, delimiter)
+
+    with open(p, "rb") as fp:
+        source = _LineSource(fp, offset, encoding, wait_for_newline)
+        reader = csv.reader(source, delimiter=chosen, quotechar=quotechar)
+        batch: list[dict[str, Any]] = []
+        for row in reader:
+            if len(row) != len(header) or all(val == "" for val in row):
+                continue
+            batch.append(dict(zip(header, (v if v != "" else NULL for v in row), strict=True)))
+            if len(batch) >= batch_rows:
+                yield batch, source.pos
+                batch = []
+        if batch or source.pos != offset:
+            yield batch, source.pos
+
+
 def read(
     path: str | Path,
     *,
@@ -54,13 +144,7 @@ def read(
     infer_dtypes: bool = True,
 ) -> Any:
     p = Path(path)
-
-    if delimiter is not None:
-        chosen = delimiter
-    elif p.suffix.lower() == ".tsv":
-        chosen = DEFAULT_DELIMITER_TSV
-    else:
-        chosen = DEFAULT_DELIMITER_CSV
+    chosen = _choose_delimiter(p, delimiter)
 
     rows: list[list[str | None]] = []
     with open(p, newline="", encoding=encoding) as file:
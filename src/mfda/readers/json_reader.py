@@ -11,9 +11,16 @@ compressed(gz, zip).
   - `FileFormatError` if JSON is invalid or not records/objects
   - `ConfigurationError` if options conflict
 - **Returns**: a `Table` (see core model docs)
+
+Streaming (JSONL only): `iter_batches()` yields `(records, end_offset)` batches, where
+`end_offset` is the byte offset just past the last consumed line; pass it back as `offset=` to
+resume. With `wait_for_newline=True` a trailing line without a newline is left unconsumed.
+Records are yielded as parsed (missing keys are not filled in; validation reads them as null,
+the same as the None that read() fills in).
 """
 
 import json
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
@@ -35,6 +42,38 @@ class _Table:
         return self._records
 
 
+def iter_batches(
+    path: str | Path,
+    *,
+    offset: int = 0,
+    encoding: str = "utf-8",
+    batch_rows: int = 10_000,
+    wait_for_newline: bool = False,
+) -> Iterator[tuple[list[dict[str, Any]], int]]:
+    pos = offset
+    batch: list[dict[str, Any]] = []
+    with open(Path(path), "rb") as fp:
+        fp.seek(offset)
+        for line in fp:
+            if wait_for_newline and not line.endswith(b"\n"):
+                break
+            start, pos = pos, pos + len(line)
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line.decode(encoding))
+            except json.JSONDecodeError as e:
+                raise FileFormatError(f"Invalid JSON at byte {start}: {e}") from e
+            if not isinstance(obj, dict):
+                raise FileFormatError("JSONL expects one JSON object per line")
+            batch.append(obj)
+            if len(batch) >= batch_rows:
+                yield batch, pos
+                batch = []
+    if batch or pos != offset:
+        yield batch, pos
+
+
 def read(
     path: str | Path,
     *,
@@ -0,0 +1,261 @@
+"""
+Sampling for approximate analysis
+
+Trades exactness for speed on very large inputs:
+- reservoir_sample(): uniform fixed-size sample of a stream (Vitter's Algorithm L, which skips
+  over rows instead of drawing a random number for each one).
+- bernoulli_sample(): keeps each row with probability `frac`.
+- sample_path(): picks the cheapest route for a file. Large uncompressed CSV/TSV/JSONL files
+  are sampled by seeking to random byte offsets and reading the next full line, so only the
+  sampled lines are parsed. Smaller files, compressed files and other formats are streamed
+  (or read) once and sampled with the functions above.
+- estimate_intervals(): confidence intervals for statistics estimated from a sample (means,
+  null rates, top-k shares).
+
+Notes:
+- Seek sampling picks a line with probability proportional to the length of the line before
+  it, so it is only approximately uniform, and the population size is estimated from the
+  average sampled line length. It assumes one record per line: CSV fields with embedded
+  newlines are not supported on that path.
+- Means use a normal interval (with finite-population correction when the population size is
+  known); proportions use Wilson score intervals.
+"""
+
+import csv
+import itertools
+import json
+import math
+import random
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import NormalDist
+from typing import Any, TypeVar
+
+from mfda.analysis import AnalysisReport
+from mfda.dispatch import STREAMING_FORMATS, stream_batches
+from mfda.errors import ConfigurationError, FileFormatError
+from mfda.readers import csv_reader
+
+T = TypeVar("T")
+
+SEEKABLE_FORMATS = STREAMING_FORMATS
+MIN_SEEK_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class Sample:
+    records: list[dict[str, Any]]
+    population_rows: int | None  # rows in the full input (estimated for seek sampling)
+    exact_population: bool
+    method: str  # "reservoir", "bernoulli" or "seek"
+
+
+@dataclass
+class Estimate:
+    column: str
+    statistic: str  # "mean", "null_rate" or "share[<value>]"
+    value: float
+    low: float
+    high: float
+
+
+def _rng(seed: int) -> random.Random:
+    return random.Random(seed)  # noqa: S311 - statistical sampling, not security related
+
+
+def reservoir_sample(items: Iterable[T], n: int, *, seed: int = 0) -> tuple[list[T], int]:
+    """Uniform sample of up to n items; returns (sample, items_seen)."""
+    if n < 1:
+        raise ValueError("sample size must be >= 1")
+    rng = _rng(seed)
+    it: Iterator[T] = iter(items)
+    sample = list(itertools.islice(it, n))
+    seen = len(sample)
+    if seen < n:
+        return sample, seen
+    w = math.exp(math.log(1.0 - rng.random()) / n)
+    while True:
+        skip = math.floor(math.log(1.0 - rng.random()) / math.log(1.0 - w)) if w < 1 else 0
+        skipped = sum(1 for _ in itertools.islice(it, skip))
+        seen += skipped
+        if skipped < skip:
+            return sample, seen
+        for nxt in itertools.islice(it, 1):
+            seen += 1
+            sample[rng.randrange(n)] = nxt
+            break
+        else:
+            return sample, seen
+        w *= math.exp(math.log(1.0 - rng.random()) / n)
+
+
+def bernoulli_sample(items: Iterable[T], frac: float, *, seed: int = 0) -> tuple[list[T], int]:
+    """Keep each item with probability frac; returns (sample, items_seen)."""
+    if not 0 < frac <= 1:
+        raise ValueError("sample fraction must be in (0, 1]")
+    rng = _rng(seed)
+    sample: list[T] = []
+    seen = 0
+    for item in items:
+        seen += 1
+        if rng.random() < frac:
+            sample.append(item)
+    return sample, seen
+
+
+def _check_size(n: int | None, frac: float | None) -> None:
+    if (n is None) == (frac is None):
+        raise ConfigurationError("choose exactly one of sample size or sample fraction")
+    if n is not None and n < 1:
+        raise ConfigurationError("sample size must be >= 1")
+    if frac is not None and not 0 < frac <= 1:
+        raise ConfigurationError("sample fraction must be in (0, 1]")
+
+
+def sample_records(
+    records: Iterable[dict[str, Any]],
+    *,
+    n: int | None = None,
+    frac: float | None = None,
+    seed: int = 0,
+) -> Sample:
+    _check_size(n, frac)
+    if n is not None:
+        rows, seen = reservoir_sample(records, n, seed=seed)
+        return Sample(rows, seen, True, "reservoir")
+    assert frac is not None
+    rows, seen = bernoulli_sample(records, frac, seed=seed)
+    return Sample(rows, seen, True, "bernoulli")
+
+
+def _parse_line(line: bytes, fmt: str, header: list[str] | None) -> dict[str, Any] | None:
+    text = line.decode("utf-8")
+    if not text.strip():
+        return None
+    if fmt == "jsonl":
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise FileFormatError(f"Invalid JSON line in sample: {e}") from e
+        return obj if isinstance(obj, dict) else None
+    assert header is not None
+    delimiter = (
+        csv_reader.DEFAULT_DELIMITER_TSV if fmt == "tsv" else csv_reader.DEFAULT_DELIMITER_CSV
+    )
+    row = next(csv.reader([text], delimiter=delimiter), [])
+    if len(row) != len(header) or all(v == "" for v in row):
+        return None
+    return dict(zip(header, (v if v != "" else csv_reader.NULL for v in row), strict=True))
+
+
+def seek_sample(
+    path: str | Path,
+    fmt: str,
+    *,
+    n: int | None = None,
+    frac: float | None = None,
+    seed: int = 0,
+) -> Sample:
+    """Sample lines by seeking to random byte offsets; only sampled lines are parsed."""
+    _check_size(n, frac)
+    p = Path(path)
+    header: list[str] | None = None
+    start = 0
+    if fmt != "jsonl":
+        header, start = csv_reader.read_header(p)
+    size = p.stat().st_size
+    rng = _rng(seed)
+
+    with open(p, "rb") as fp:
+        if n is None:
+            assert frac is not None
+            fp.seek(start)
+            head = fp.read(64 * 1024)
+            lines = max(1, head.count(b"\n"))
+            n = max(1, round(frac * (size - start) * lines / max(1, len(head))))
+
+        records: list[dict[str, Any]] = []
+        starts: set[int] = set()
+        total_len = 0
+        attempts = 0
+        while len(records) < n and attempts < 10 * n:
+            attempts += 1
+            off = rng.randrange(start, size) if size > start else start
+            fp.seek(off)
+            if off != start:
+                fp.readline()  # skip the partial line we landed in
+            line_start = fp.tell()
+            line = fp.readline()
+            if not line or line_start in starts:
+                continue
+            starts.add(line_start)
+            rec = _parse_line(line, fmt, header)
+            if rec is not None:
+                records.append(rec)
+                total_len += len(line)
+
+    population = round((size - start) * len(records) / total_len) if total_len else 0
+    return Sample(records, population, False, "seek")
+
+
+def sample_path(
+    path: str | Path,
+    fmt: str,
+    *,
+    read_all: Callable[[], list[dict[str, Any]]],
+    n: int | None = None,
+    frac: float | None = None,
+    seed: int = 0,
+    min_seek_bytes: int = MIN_SEEK_BYTES,
+) -> Sample:
+    """Sample a file, seeking when it is a large uncompressed CSV/TSV/JSONL file."""
+    p = Path(path)
+    seekable = fmt in SEEKABLE_FORMATS and p.suffix.lower() not in {".gz", ".zip"}
+    if seekable and p.stat().st_size >= min_seek_bytes:
+        return seek_sample(p, fmt, n=n, frac=frac, seed=seed)
+    batches = stream_batches(p, fmt)
+    if batches is not None:
+        stream = (r for batch in batches for r in batch)
+        return sample_records(stream, n=n, frac=frac, seed=seed)
+    return sample_records(read_all(), n=n, frac=frac, seed=seed)
+
+
+def _wilson(successes: int, trials: int, z: float) -> tuple[float, float]:
+    p = successes / trials
+    denom = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def estimate_intervals(
+    report: AnalysisReport,
+    *,
+    population_rows: int | None = None,
+    confidence: float = 0.95,
+) -> list[Estimate]:
+    """Confidence intervals for means, null rates and top-k shares of a sampled report."""
+    if report.rows == 0:
+        return []
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    fpc = 1.0
+    if population_rows is not None and population_rows > 1:
+        fpc = math.sqrt(max(0.0, (population_rows - report.rows) / (population_rows - 1)))
+
+    out: list[Estimate] = []
+    for ns in report.numeric:
+        if ns.mean is not None and ns.std is not None:
+            half = z * ns.std / math.sqrt(ns.count) * fpc
+            out.append(Estimate(ns.column, "mean", ns.mean, ns.mean - half, ns.mean + half))
+    nulls = [(s.column, s.nulls) for s in report.numeric]
+    nulls += [(s.column, s.nulls) for s in report.categorical]
+    nulls += [(s.column, s.nulls) for s in report.temporal]
+    for column, count in nulls:
+        low, high = _wilson(count, report.rows, z)
+        out.append(Estimate(column, "null_rate", count / report.rows, low, high))
+    for cs in report.categorical:
+        for value, count in cs.top:
+            low, high = _wilson(count, cs.count, z)
+            out.append(Estimate(cs.column, f"share[{value}]", count / cs.count, low, high))
+    return out
@@ -0,0 +1,450 @@
+"""
+Streaming sketches
+
+Bounded-memory summaries used by the analysis layer when exact counting is too costly:
+- SpaceSaving: heavy-hitters top-k. Every reported count overestimates the true count by at
+  most its `error`, and `error <= n / capacity`.
+- CountMinSketch: frequency estimates that never underestimate; overestimate <= eps * n
+  with probability 1 - delta (eps = e / width, delta = exp(-depth)).
+- HyperLogLog: approximate distinct counts (relative error ~1.04 / sqrt(2**precision)).
+- BloomFilter: set membership with no false negatives; sized for `capacity` items at a false
+  positive rate of `error_rate` (about 9.6 bits per item at 1%).
+- KLLSketch: mergeable streaming quantiles (Karnin-Lang-Liberty); O(k) memory, normalized
+  rank error roughly 1.7 / k, and exact while fewer than k values have been added.
+  update_sorted() takes a whole sorted batch at once (halved before it is merged in).
+
+- HeavyHitters: the three above bundled for a categorical column (top-k + distinct).
+
+All sketches support `merge()` with a sketch of the same configuration, so per-shard partial
+summaries can be reduced into one.
+
+Notes:
+- Hashing is stable across processes (blake2b over repr), so sketches can be merged or
+  persisted safely.
+- Top-k ties are broken the same way as the exact path: frequency desc, then value asc.
+"""
+
+import hashlib
+import heapq
+import itertools
+import math
+import random
+from array import array
+from collections.abc import Hashable, Iterable, Mapping, Sequence
+from typing import Any
+
+
+def stable_hash(value: object) -> int:
+    """64-bit hash of `value` that does not depend on PYTHONHASHSEED."""
+    digest = hashlib.blake2b(repr(value).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+DIGEST_SIZE = 16
+
+
+def key_digest(value: object) -> bytes:
+    """128-bit digest of a key value (or tuple of values), stable across processes."""
+    return hashlib.blake2b(repr(value).encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+
+def top_k_exact(freq: Mapping[Any, int], k: int) -> list[tuple[Any, int]]:
+    """Select the k most frequent items with a heap instead of a full sort."""
+    return heapq.nsmallest(k, freq.items(), key=lambda kv: (-kv[1], str(kv[0])))
+
+
+class SpaceSaving:
+    """Space-Saving heavy hitters (Metwally et al.) with a fixed number of counters."""
+
+    def __init__(self, capacity: int = 1024) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.n = 0
+        # value -> [count, error]
+        self._counters: dict[Hashable, list[int]] = {}
+        # lazy min-heap of (count, seq, value); stale entries are skipped on pop
+        self._heap: list[tuple[int, int, Hashable]] = []
+        self._seq = 0
+
+    def _push(self, value: Hashable, count: int) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (count, self._seq, value))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c[0], i, v) for i, (v, c) in enumerate(self._counters.items())]
+            heapq.heapify(self._heap)
+            self._seq = len(self._heap)
+
+    def _pop_min(self) -> tuple[Hashable, list[int]]:
+        while True:
+            count, _, value = heapq.heappop(self._heap)
+            entry = self._counters.get(value)
+            if entry is not None and entry[0] == count:
+                del self._counters[value]
+                return value, entry
+
+    def add(self, value: Hashable, weight: int = 1) -> None:
+        self.n += weight
+        entry = self._counters.get(value)
+        if entry is not None:
+            entry[0] += weight
+        elif len(self._counters) < self.capacity:
+            entry = self._counters[value] = [weight, 0]
+        else:
+            _, (min_count, _) = self._pop_min()
+            entry = self._counters[value] = [min_count + weight, min_count]
+        self._push(value, entry[0])
+
+    def update(self, values: Iterable[Hashable]) -> None:
+        for v in values:
+            self.add(v)
+
+    def _floor(self) -> int:
+        # any value not tracked has a true count of at most the smallest tracked count
+        if len(self._counters) < self.capacity:
+            return 0
+        return min(c for c, _ in self._counters.values())
+
+    def merge(self, other: "SpaceSaving") -> None:
+        """Combine summaries (Agarwal et al., mergeable summaries); bounds still hold."""
+        mine, theirs = self._floor(), other._floor()
+        combined: dict[Hashable, list[int]] = {}
+        for v in self._counters.keys() | other._counters.keys():
+            c1, e1 = self._counters.get(v, (mine, mine))
+            c2, e2 = other._counters.get(v, (theirs, theirs))
+            combined[v] = [c1 + c2, e1 + e2]
+        kept = heapq.nlargest(self.capacity, combined.items(), key=lambda kv: kv[1][0])
+        self._counters = dict(kept)
+        self.n += other.n
+        self._heap = [(c[0], i, v) for i, (v, c) in enumerate(self._counters.items())]
+        heapq.heapify(self._heap)
+        self._seq = len(self._heap)
+
+    def top(self, k: int) -> list[tuple[Any, int, int]]:
+        """Return up to k (value, count, error) triples; true count is in [count - error, count]."""
+        best = heapq.nsmallest(k, self._counters.items(), key=lambda kv: (-kv[1][0], str(kv[0])))
+        return [(v, c, e) for v, (c, e) in best]
+
+
+class CountMinSketch:
+    """Count-Min sketch over stable 64-bit hashes (double hashing for the row indexes)."""
+
+    def __init__(self, width: int = 2048, depth: int = 4) -> None:
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be >= 1")
+        self.width = width
+        self.depth = depth
+        self.n = 0
+        self._rows = [array("q", bytes(8 * width)) for _ in range(depth)]
+
+    def _indexes(self, h: int) -> list[int]:
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add_hash(self, h: int, weight: int = 1) -> None:
+        self.n += weight
+        for row, idx in zip(self._rows, self._indexes(h), strict=True):
+            row[idx] += weight
+
+    def add(self, value: object, weight: int = 1) -> None:
+        self.add_hash(stable_hash(value), weight)
+
+    def merge(self, other: "CountMinSketch") -> None:
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("cannot merge Count-Min sketches of different shapes")
+        self.n += other.n
+        for row, other_row in zip(self._rows, other._rows, strict=True):
+            for i, c in enumerate(other_row):
+                if c:
+                    row[i] += c
+
+    def estimate_hash(self, h: int) -> int:
+        return min(row[idx] for row, idx in zip(self._rows, self._indexes(h), strict=True))
+
+    def estimate(self, value: object) -> int:
+        return self.estimate_hash(stable_hash(value))
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter with 2**precision one-byte registers."""
+
+    def __init__(self, precision: int = 14) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.m = 1 << precision
+        self._registers = bytearray(self.m)
+
+    def add_hash(self, h: int) -> None:
+        idx = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self._registers[idx]:
+            self._registers[idx] = rank
+
+    def add(self, value: object) -> None:
+        self.add_hash(stable_hash(value))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if self.precision != other.precision:
+            raise ValueError("cannot merge HyperLogLog sketches of different precision")
+        self._registers = bytearray(map(max, self._registers, other._registers))
+
+    def estimate(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0**-r for r in self._registers)
+        zeros = self._registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # small-range correction: linear counting
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+
+class BloomFilter:
+    """Bloom filter over 128-bit hashes (double hashing with the two 64-bit halves)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be in (0, 1)")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.m = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        self._bits = bytearray((self.m + 7) // 8)
+
+    def add_hash(self, h: int) -> bool:
+        """Set the bits for `h`; returns True when they were all set already (maybe seen)."""
+        h1 = h & 0xFFFFFFFFFFFFFFFF
+        h2 = (h >> 64) | 1
+        bits, m = self._bits, self.m
+        present = True
+        for i in range(self.k):
+            idx = (h1 + i * h2) % m
+            mask = 1 << (idx & 7)
+            if not bits[idx >> 3] & mask:
+                present = False
+                bits[idx >> 3] |= mask
+        return present
+
+    def contains_hash(self, h: int) -> bool:
+        h1 = h & 0xFFFFFFFFFFFFFFFF
+        h2 = (h >> 64) | 1
+        return all(
+            self._bits[idx >> 3] & (1 << (idx & 7))
+            for idx in ((h1 + i * h2) % self.m for i in range(self.k))
+        )
+
+    @staticmethod
+    def _hash(value: object) -> int:
+        return int.from_bytes(key_digest(value), "little")
+
+    def add(self, value: object) -> bool:
+        return self.add_hash(self._hash(value))
+
+    def __contains__(self, value: object) -> bool:
+        return self.contains_hash(self._hash(value))
+
+    def merge(self, other: "BloomFilter") -> None:
+        if (self.m, self.k) != (other.m, other.k):
+            raise ValueError("cannot merge Bloom filters of different shapes")
+        merged = int.from_bytes(self._bits, "little") | int.from_bytes(other._bits, "little")
+        self._bits = bytearray(merged.to_bytes(len(self._bits), "little"))
+
+
+class HeavyHitters:
+    """Fixed-memory categorical summary: Space-Saving candidates checked against Count-Min.
+
+    The Count-Min and HyperLogLog sketches are only allocated once Space-Saving first has to
+    evict; until then its counters are exact, and the sketches are filled from them.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.ss = SpaceSaving(capacity)
+        self.cms: CountMinSketch | None = None
+        self.hll: HyperLogLog | None = None
+
+    def _start_sketches(self) -> tuple[CountMinSketch, HyperLogLog]:
+        if self.cms is None or self.hll is None:
+            self.cms, self.hll = CountMinSketch(), HyperLogLog()
+            self._sketch(self.ss)
+        return self.cms, self.hll
+
+    def _sketch(self, ss: SpaceSaving) -> None:
+        # exact counters of a Space-Saving summary that has not evicted yet
+        cms, hll = self._start_sketches()
+        for v, (count, _) in ss._counters.items():
+            h = stable_hash(v)
+            cms.add_hash(h, count)
+            hll.add_hash(h)
+
+    def _add(self, value: Hashable, weight: int) -> None:
+        if self.cms is None and (
+            value in self.ss._counters or len(self.ss._counters) < self.ss.capacity
+        ):
+            self.ss.add(value, weight)  # no eviction: the counters stay exact
+            return
+        cms, hll = self._start_sketches()
+        h = stable_hash(value)
+        cms.add_hash(h, weight)
+        hll.add_hash(h)
+        self.ss.add(value, weight)
+
+    def add(self, value: Hashable) -> None:
+        self._add(value, 1)
+
+    def update(self, values: Iterable[Hashable]) -> None:
+        for v in values:
+            self._add(v, 1)
+
+    def update_counts(self, counts: Iterable[tuple[Hashable, int]]) -> None:
+        """Add (value, count) pairs, e.g. a batch already counted with np.unique."""
+        for v, c in counts:
+            self._add(v, c)
+
+    def merge(self, other: "HeavyHitters") -> None:
+        keys = self.ss._counters.keys() | other.ss._counters.keys()
+        if self.cms is not None or other.cms is not None or len(keys) > self.ss.capacity:
+            cms, hll = self._start_sketches()
+            if other.cms is not None and other.hll is not None:
+                cms.merge(other.cms)
+                hll.merge(other.hll)
+            else:
+                self._sketch(other.ss)
+        self.ss.merge(other.ss)
+
+    def approx_bytes(self) -> int:
+        """Rough in-memory size: Space-Saving counters plus the sketches once allocated."""
+        size = 150 * len(self.ss._counters) + 100 * len(self.ss._heap)
+        if self.cms is not None and self.hll is not None:
+            size += 8 * self.cms.width * self.cms.depth + self.hll.m
+        return size
+
+    def top(self, k: int) -> tuple[list[tuple[Any, int]], int]:
+        """
+        Return (top, error_bound). Each reported count c satisfies
+        true <= c <= true + error_bound.
+        """
+        top: list[tuple[Any, int]] = []
+        bound = 0
+        for v, count, error in self.ss.top(k):
+            est = count if self.cms is None else min(count, self.cms.estimate(v))
+            top.append((v, est))
+            bound = max(bound, est - (count - error))
+        top.sort(key=lambda kv: (-kv[1], str(kv[0])))
+        return top, bound
+
+    def distinct(self) -> int:
+        return len(self.ss._counters) if self.hll is None else self.hll.estimate()
+
+
+def approx_top_k(
+    values: Iterable[Hashable], k: int, *, capacity: int = 1024
+) -> tuple[list[tuple[Any, int]], int, int]:
+    """Bounded-memory top-k in one call; returns (top, error_bound, distinct_estimate)."""
+    hh = HeavyHitters(capacity)
+    hh.update(values)
+    top, bound = hh.top(k)
+    return top, bound, hh.distinct()
+
+
+class KLLSketch:
+    """KLL quantile sketch over floats; compaction coins come from a seeded RNG (deterministic)."""
+
+    def __init__(self, k: int = 200, *, seed: int = 0) -> None:
+        if k < 8:
+            raise ValueError("k must be >= 8")
+        self.k = k
+        self.n = 0
+        self._compactors: list[list[float]] = [[]]
+        self._rng = random.Random(seed)  # noqa: S311 - compaction coin, not security related
+        self._size = 0
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._compactors) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self._compactors)))
+
+    def _compress(self) -> None:
+        while self._size >= self._max_size():
+            for h, items in enumerate(self._compactors):
+                if len(items) >= self._capacity(h):
+                    if h + 1 == len(self._compactors):
+                        self._compactors.append([])
+                    items.sort()
+                    offset = self._rng.random() < 0.5
+                    self._compactors[h + 1].extend(items[offset::2])
+                    items.clear()
+                    break
+            self._size = sum(len(c) for c in self._compactors)
+
+    def add(self, value: float) -> None:
+        self._compactors[0].append(value)
+        self.n += 1
+        self._size += 1
+        if self._size >= self._max_size():
+            self._compress()
+
+    def update(self, values: Iterable[float]) -> None:
+        # same result as add() per value: fill level 0 up to the next compaction point at once
+        it = iter(values)
+        while chunk := list(itertools.islice(it, self._max_size() - self._size)):
+            self._compactors[0].extend(chunk)
+            self.n += len(chunk)
+            self._size += len(chunk)
+            if self._size >= self._max_size():
+                self._compress()
+
+    def update_sorted(self, values: Sequence[float]) -> None:
+        """Add a sorted batch: halve it down to k items on its own, then merge it in.
+
+        Each halving of a sorted level-h buffer moves any rank by at most 2**h, as a regular
+        compaction does, so the error bound holds while the batch costs a few slices instead
+        of a compaction every few values. Batches that fit before the next compaction are
+        added as update() would.
+        """
+        if len(values) < self._max_size() - self._size:
+            self.update(values)
+            return
+        items, level = list(values), 0
+        while len(items) > self.k:
+            items = items[self._rng.random() < 0.5 :: 2]
+            level += 1
+        batch = KLLSketch(self.k)
+        batch._compactors = [[] for _ in range(level)] + [items]
+        batch.n = len(values)
+        self.merge(batch)
+
+    def approx_bytes(self) -> int:
+        return 32 * self._size
+
+    def merge(self, other: "KLLSketch") -> None:
+        while len(self._compactors) < len(other._compactors):
+            self._compactors.append([])
+        for mine, theirs in zip(self._compactors, other._compactors, strict=False):
+            mine.extend(theirs)
+        self.n += other.n
+        self._size = sum(len(c) for c in self._compactors)
+        self._compress()
+
+    def quantiles(self, qs: Sequence[float]) -> list[float | None]:
+        """Nearest-rank quantiles for each q in [0, 1]; None when the sketch is empty."""
+        if self.n == 0:
+            return [None for _ in qs]
+        weighted = sorted((v, 1 << h) for h, items in enumerate(self._compactors) for v in items)
+        total = sum(w for _, w in weighted)
+        out: list[float | None] = []
+        for q in qs:
+            target = max(1, math.ceil(q * total))
+            acc = 0
+            for v, w in weighted:
+                acc += w
+                if acc >= target:
+                    out.append(v)
+                    break
+        return out
@@ -0,0 +1,131 @@
+"""
+Time-bucketed analysis
+
+Summarizes rows per fixed-width time bucket of a timestamp column (e.g. per hour or per day)
+in one pass over the records:
+- The timestamp column is parsed with the same typed path as analysis (format detected once
+  per column, values normalized to UTC) and each row goes to bucket floor(ts / bucket).
+- Each open bucket owns an analysis.PartialAnalysis, so it reports the usual count, nulls,
+  mean, quantiles and top-k per column.
+- Out-of-order input is absorbed by keeping up to `max_open_buckets` buckets open. Past that
+  budget the oldest bucket is closed (finalized); rows that arrive later for a closed bucket
+  are counted as `late_rows` and dropped, so memory stays bounded.
+
+Notes:
+- The timestamp column itself is left out of the per-bucket summaries.
+- Rows with a null or unparseable timestamp are counted as `untimed_rows`.
+- Buckets without rows are not reported.
+"""
+
+import itertools
+import math
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from mfda import dtypes
+from mfda.analysis import (
+    AnalysisOptions,
+    AnalysisReport,
+    PartialAnalysis,
+    analyze_partial,
+    finalize,
+)
+
+BUCKET_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86_400, "w": 604_800}
+
+
+@dataclass
+class TimeBucket:
+    start: datetime  # UTC
+    report: AnalysisReport
+
+
+@dataclass
+class TimeBucketReport:
+    column: str
+    bucket_seconds: int
+    buckets: list[TimeBucket]  # sorted by start
+    late_rows: int = 0  # rows for buckets that were already closed (dropped)
+    untimed_rows: int = 0  # rows with a null or unparseable timestamp
+
+
+def parse_bucket(text: str) -> int:
+    """Bucket width in seconds from e.g. "90s", "15m", "1h", "1d" or "1w"."""
+    m = re.fullmatch(r"\s*(\d+)\s*([smhdw])\s*", text.lower())
+    if m is None or int(m.group(1)) < 1:
+        raise ValueError(f"Invalid time bucket: {text!r} (expected e.g. 15m, 1h, 1d)")
+    return int(m.group(1)) * BUCKET_UNITS[m.group(2)]
+
+
+def analyze_time_buckets(
+    records: Iterable[dict[str, Any]],
+    column: str,
+    bucket_seconds: int,
+    *,
+    top_k: int = 3,
+    top_k_mode: str = "exact",
+    top_k_capacity: int = 1024,
+    quantiles: Sequence[float] = (),
+    quantile_k: int = 200,
+    engine: str = "python",
+    infer_types: bool = True,
+    max_open_buckets: int = 1024,
+    batch_rows: int = 10_000,
+) -> TimeBucketReport:
+    if bucket_seconds < 1:
+        raise ValueError("bucket_seconds must be >= 1")
+    if max_open_buckets < 1:
+        raise ValueError("max_open_buckets must be >= 1")
+    options = AnalysisOptions(
+        top_k_mode, top_k_capacity, tuple(quantiles), quantile_k, engine, infer_types
+    )
+    open_buckets: dict[int, PartialAnalysis] = {}
+    closed: list[TimeBucket] = []
+    watermark = -math.inf  # every bucket id <= watermark has been closed
+    late = untimed = 0
+    fmt: str | None = None
+
+    def close(key: int) -> None:
+        start = datetime.fromtimestamp(key * bucket_seconds, timezone.utc)
+        closed.append(TimeBucket(start, finalize(open_buckets.pop(key), top_k=top_k)))
+
+    it = iter(records)
+    while batch := list(itertools.islice(it, batch_rows)):
+        raw = [r.get(column) for r in batch]
+        if fmt is None:
+            fmt = dtypes.detect_datetime_format(raw)
+        stamps, _, _ = dtypes.coerce(raw, "datetime", fmt or "iso")
+
+        rows: dict[int, list[dict[str, Any]]] = {}
+        for r, ts in zip(batch, stamps, strict=True):
+            if ts is None:
+                untimed += 1
+                continue
+            key = math.floor(ts.timestamp() / bucket_seconds)
+            if key <= watermark:
+                late += 1
+                continue
+            rows.setdefault(key, []).append({k: v for k, v in r.items() if k != column})
+
+        for key in sorted(rows):
+            if key <= watermark:
+                late += len(rows[key])
+                continue
+            seen = open_buckets[key].column_types() if key in open_buckets else None
+            part = analyze_partial(rows[key], options, column_types=seen)
+            if key in open_buckets:
+                open_buckets[key].merge(part)
+            else:
+                open_buckets[key] = part
+                while len(open_buckets) > max_open_buckets:
+                    oldest = min(open_buckets)
+                    close(oldest)
+                    watermark = oldest
+
+    for key in sorted(open_buckets):
+        close(key)
+    closed.sort(key=lambda b: b.start)
+    return TimeBucketReport(column, bucket_seconds, closed, late, untimed)
@@ -6,14 +6,134 @@ Defines data models for schema validation and validation results.
 Schema shape:
 {
     "id":   {"required": True, "unique": True, "type": "integer"},
+    "line": {"unique": ["id", "line"]},  # composite key
     "age":  {"type": "number", "min": 0, "max": 120},
     "name": {"required": True, "type": "string"},
+    "zip":  {"nullable": False, "regex": "[0-9]{5}"},
+    "tier": {"allowed_values": ["free", "pro"]},
+    "customer_id": {"references": {"file": "customers.csv", "column": "id"}},
+    "amount": {"outlier": {"method": "zscore", "threshold": 4}},
+    "unique_rows": True,  # schema-level: no whole-row duplicates
 }
+
+Rules:
+- required: the value must be present and non-null (missing_required).
+- nullable: False: the value must not be null; a row without the column counts as null,
+  as it does when a reader fills missing keys (null_value; not checked when the column is
+  also required, which already reports nulls).
+- type: one of dtypes.DTYPES or the aliases integer/number/boolean; values must parse as that
+  dtype the same way analysis coerces them, so "42" is an integer but "042" is not. Integers
+  are numbers; the datetime layout that parses most of the first batch is used for the
+  whole column (type_mismatch).
+- min/max: numbers and numeric strings (parsed as floats) must lie within the bounds; other
+  values are skipped (out_of_range). unique (duplicate), see below.
+- allowed_values: a list; values are looked up in a frozenset that also holds the string
+  form of non-string entries, so CSV text "1" matches an allowed 1 (not_allowed).
+- regex: compiled once; the whole value (as text) must match (pattern_mismatch).
+- references: {"file", "column"[, "format"]}: the value must occur in that column of the
+  other file (missing_reference). The file is indexed once into a sorted on-disk digest file
+  that is cached by its fingerprint and reused while the file is unchanged (see keyindex);
+  values are compared as text.
+- outlier: "zscore" / "iqr" or {"method", "threshold", "mode", "max_candidates"}: numeric
+  values (numbers or numeric strings) more than `threshold` standard deviations from the
+  mean (default 3), or more than `threshold` IQRs outside the quartiles (default 1.5), are
+  flagged (outlier). Mean and std come from streaming moments and the quartiles from a KLL
+  sketch, so the column is never materialized or sorted. mode="one-pass" (default) keeps the
+  `max_candidates` (default 10,000) largest and smallest values with their rows and checks
+  them against the final bounds; when more values than that are outliers, the issue's count
+  is a lower bound (exact=False). mode="two-pass" re-reads the rows to flag every value
+  outside the bounds (records must be iterable twice, and it cannot be sharded). Either
+  way outliers are only known at the end, so max_issues does not stop on them.
+- unique_rows: True (a schema-level key, not a column): no two rows may be equal
+  (duplicate_row, column None). See Uniqueness.
+Nulls only count against required and nullable.
+
+Execution:
+- compile_plan() turns a schema into a ValidationPlan: one state object per rule, grouped by
+  column. validate() streams row batches through the plan once; each batch pulls a column's
+  values a single time and hands them to every rule on that column, so the cost is one scan
+  of the data no matter how many rules the schema has.
+- Issues are reported in schema order (column by column; required, nullable, unique, type,
+  range, allowed_values, regex, references, then outlier; unique_rows where it appears).
+- Value rules (type, allowed_values, regex, references) work on the distinct values of a
+  batch: each is checked once, and rows are only scanned again when a batch holds a bad
+  value. Enum-like columns therefore cost one set() per batch in the common all-valid case.
+- Each rule records violations in an IssueCollector: an exact count plus at most
+  `max_examples` row indices (the first ones, or a uniform reservoir sample), so memory does
+  not grow with the number of violations.
+- max_issues stops the pass once that many violations have been counted (checked after each
+  batch, so the report can hold a few more); the report is then marked `stopped_early` and
+  `row_count` is the number of rows scanned. Pass a lazy iterable (e.g.
+  dispatch.stream_batches) so the unread rest of the file is never parsed.
+
+Sharding:
+- Rule states are mergeable: ValidationPlan.merge() folds in a plan run over the rows that
+  follow, shifting its row indices, so counts, examples (first rows or reservoirs) and
+  unique key sets (in memory or spilled partitions) combine into the same report a single
+  pass would give. validate(workers=N) splits a record list into N row shards and
+  validate_many() validates consecutive shards (e.g. the files of a multi-part dataset,
+  passed as callables that read them) in a process pool.
+- Sharded runs need unique_mode="exact" and no max_issues. The datetime layout of a type
+  rule is detected per shard.
+
+Uniqueness:
+- `unique` is True (the column itself) or a list of columns forming a composite key; the
+  issue's column is the key columns joined with ",". Keys with a null part are skipped.
+- Keys are hashed to 128-bit digests, so memory per key is fixed whatever the key size. Up
+  to `unique_max_keys` digests are kept in memory; past that the rule spills (digest, row)
+  records to hash partitions on disk and resolves duplicates partition by partition at the
+  end (re-partitioning any partition that is still too large). Counts stay exact (barring a
+  128-bit digest collision) and examples are the same as in memory.
+- Keys compare by repr, so 1, 1.0 and "1" are different keys. Once a rule spills, its later
+  duplicates are only counted at the end, so max_issues cannot stop on them.
+- The issue's count is the number of duplicate rows (every occurrence after a key's first)
+  and `groups` the number of distinct keys that occur more than once. Keys that already
+  have a duplicate are flagged by storing their first row as ~row, so groups cost no extra
+  memory and survive spilling and merging.
+- unique_rows keys each row by its (column, value) pairs sorted by column, leaving out nulls,
+  so column order and a missing versus a null column do not matter. It always uses the
+  exact, spilling check.
+- unique_mode="bloom" checks keys in two phases instead: the pass streams key digests
+  through a Bloom filter (~10 bits per key at the default 1% false positive rate) and keeps
+  only the keys it may have seen before; a second pass over the same rows then verifies just
+  those candidates exactly. Counts and examples match the exact mode. The filter is sized for
+  `unique_expected_keys` (default: len(records), when known), and `records` must be
+  iterable twice. Duplicates are only known after the second pass, so max_issues does not
+  stop on them.
+
+Schema inference:
+- infer_schema() profiles a uniform sample of `sample` rows (or every row with sample=None) in
+  one batched pass and writes a schema that the profiled rows pass: `type` (the narrowest of
+  boolean, integer, number, datetime that parses every non-null value, else string),
+  `required` when no row is null or lacks the column, `min`/`max` for numbers,
+  `allowed_values` for string columns with at most `max_enum` distinct values that repeat,
+  and `unique` for integer and string columns whose HyperLogLog distinct estimate matches
+  the row count. Inferred unique keys are candidates: on a sample they are often unique by
+  chance.
 """
 
+import bisect
+import heapq
+import itertools
+import math
+import os
+import random
+import re
+import shutil
+import struct
+import tempfile
+from collections.abc import Callable, Iterable, Iterator, Sequence, Sized
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+from mfda import dtypes, keyindex
+from mfda.errors import ConfigurationError, SchemaError
+from mfda.sampling import reservoir_sample
+from mfda.sketches import DIGEST_SIZE, BloomFilter, HyperLogLog, KLLSketch, key_digest
 
-Schema = dict[str, dict[str, object]]
+Schema = dict[str, Any]  # column -> rules, plus schema-level keys (unique_rows)
 
 
 @dataclass
@@ -22,6 +142,8 @@ class ValidationIssue:
     column: str | None
     count: int
     examples: list[int]
+    exact: bool = True  # False when count is a lower bound (see outlier rules)
+    groups: int | None = None  # distinct duplicated keys (unique rules)
 
 
 @dataclass
@@ -29,59 +151,1147 @@ class ValidationReport:
     row_count: int
     column_count: int
     issues: list[ValidationIssue] = field(default_factory=list)
+    stopped_early: bool = False  # max_issues reached before the end of the input
+
+
+EXAMPLE_MODES = ("first", "reservoir")
+
+
+class IssueCollector:
+    """Exact violation count plus a bounded list of example row indices."""
+
+    def __init__(self, max_examples: int = 5, mode: str = "first", *, seed: int = 0) -> None:
+        if max_examples < 0:
+            raise ValueError("max_examples must be >= 0")
+        if mode not in EXAMPLE_MODES:
+            raise ValueError(f"Unknown example mode: {mode}")
+        self.max_examples = max_examples
+        self.mode = mode
+        self.count = 0
+        self.examples: list[int] = []
+        self._rng = random.Random(seed)  # noqa: S311 - example sampling, not security related
+
+    def add(self, row: int) -> None:
+        self.count += 1
+        if len(self.examples) < self.max_examples:
+            if self.mode == "first":
+                bisect.insort(self.examples, row)
+            else:
+                self.examples.append(row)
+        elif self.mode == "reservoir" and self.max_examples:
+            j = self._rng.randrange(self.count)
+            if j < self.max_examples:
+                self.examples[j] = row
+        elif self.max_examples and row < self.examples[-1]:
+            # rows can arrive out of order (spilled partitions); keep the smallest
+            self.examples.pop()
+            bisect.insort(self.examples, row)
+
+    def extend(self, rows: Iterable[int]) -> None:
+        for row in rows:
+            self.add(row)
+
+    def merge(self, other: "IssueCollector", offset: int = 0) -> None:
+        """Fold in a collector of the same mode over disjoint rows, shifting its rows by offset."""
+        if self.mode == "first":
+            count = self.count + other.count
+            for row in other.examples:
+                self.add(row + offset)
+            self.count = count
+            return
+        # reservoir: draw from each side in proportion to the rows it stands for
+        mine, theirs = self.examples[:], [row + offset for row in other.examples]
+        self._rng.shuffle(mine)
+        self._rng.shuffle(theirs)
+        left, right = self.count, other.count
+        self.examples = []
+        while len(self.examples) < self.max_examples and (mine or theirs):
+            if mine and (not theirs or self._rng.random() * (left + right) < left):
+                self.examples.append(mine.pop())
+                left -= 1
+            else:
+                self.examples.append(theirs.pop())
+                right -= 1
+        self.count += other.count
+
+    def issue(self, code: str, column: str | None) -> ValidationIssue:
+        return ValidationIssue(code, column, self.count, sorted(self.examples))
+
+
+class RuleState:
+    """Per-rule state fed column values batch by batch; issues() reports what it found."""
+
+    code = ""
+    passes = 1  # 2: the rule reads the rows again through verify()
+
+    def __init__(self, column: str, *, max_examples: int = 5, example_mode: str = "first") -> None:
+        self.column = column
+        self.columns: tuple[str, ...] = (column,)  # update() gets tuples when there are several
+        self.found = IssueCollector(max_examples, example_mode)
+
+    def update(self, start: int, values: Sequence[Any]) -> None:
+        raise NotImplementedError
+
+    def issues(self) -> list[ValidationIssue]:
+        return [self.found.issue(self.code, self.column)] if self.found.count else []
+
+    def violations(self) -> int:
+        return self.found.count
+
+    def merge(self, other: "RuleState", offset: int) -> None:
+        """Fold in the same rule run over the rows that follow ours (its rows shift by offset)."""
+        self.found.merge(other.found, offset)
+
+    def rescan(self) -> bool:
+        """True when the rule needs a second pass over the same rows (see verify())."""
+        return False
+
+    def verify(self, start: int, values: Sequence[Any]) -> None:
+        raise NotImplementedError
+
+    def sync(self) -> None:
+        """Write out buffered on-disk state, so a pickled copy of the rule matches its files."""
+
+    def restore(self) -> None:
+        """Undo on-disk changes made after the last sync() (when resuming from a pickle)."""
+
+
+class RequiredRule(RuleState):
+    code = "missing_required"
+
+    def update(self, start: int, values: Sequence[Any]) -> None:
+        self.found.extend(start + i for i, v in enumerate(values) if v is None)
+
+
+SPILL_PARTITIONS = 16
+_SPILL_RECORD = struct.Struct(f"<{DIGEST_SIZE}sq")  # key digest, row
+_SPILL_BUFFER = 1 << 16
+
+
+class _SpillPartitions:
+    """SPILL_PARTITIONS append-only files of (digest, row) records, buffered in memory."""
+
+    def __init__(self, prefix: Path) -> None:
+        self.paths = [Path(f"{prefix}-{i}.bin") for i in range(SPILL_PARTITIONS)]
+        self.buffers = [bytearray() for _ in self.paths]
+        self.synced = [0] * SPILL_PARTITIONS  # file sizes at the last sync()
+        for path in self.paths:
+            path.touch()
+
+    def put(self, part: int, digest: bytes, row: int) -> None:
+        buf = self.buffers[part]
+        buf += _SPILL_RECORD.pack(digest, row)
+        if len(buf) >= _SPILL_BUFFER:
+            self._flush(part)
+
+    def _flush(self, part: int) -> None:
+        # files are opened per flush, so the partitions can be pickled to another process
+        with open(self.paths[part], "ab") as fp:
+            fp.write(self.buffers[part])
+        self.buffers[part].clear()
+
+    def close(self) -> list[Path]:
+        for part in range(SPILL_PARTITIONS):
+            self._flush(part)
+        return self.paths
+
+    def sync(self) -> None:
+        self.synced = [path.stat().st_size for path in self.close()]
+
+    def restore(self) -> None:
+        for path, size in zip(self.paths, self.synced, strict=True):
+            os.truncate(path, size)
+
+
+def _read_records(fp: IO[bytes]) -> Iterator[tuple[bytes, int]]:
+    while chunk := fp.read(_SPILL_RECORD.size * 4096):
+        yield from _SPILL_RECORD.iter_unpack(chunk)
+
 
+class NullableRule(RuleState):
+    code = "null_value"
 
-def infer_schema(records: list[dict[str, object]], sample: int | None = 50) -> Schema:
-    raise NotImplementedError
+    def update(self, start: int, values: Sequence[Any]) -> None:
+        self.found.extend(start + i for i, v in enumerate(values) if v is None)
 
 
-def validate(records: list[dict[str, object]], schema: Schema) -> ValidationReport:
-    row_count = len(records)
-    column_count = len({k for r in records for k in r})
-    issues: list[ValidationIssue] = []
+class ValueRule(RuleState):
+    """Rule that judges each non-null value on its own; checked once per distinct value."""
 
-    for col, rules in schema.items():
-        # Required
-        if rules.get("required"):
-            bad_rows = [i for i, r in enumerate(records) if col not in r or r[col] is None]
-            if bad_rows:
-                issues.append(ValidationIssue("missing_required", col, len(bad_rows), bad_rows[:5]))
+    def accepts(self, value: Any) -> bool:
+        raise NotImplementedError
 
-        # Unique
-        if rules.get("unique"):
-            seen: dict[object, int] = {}
-            dupes = []
-            for i, r in enumerate(records):
-                val = r.get(col)
-                # skip NULL
-                if val is None:
+    def _keys(self, values: Sequence[Any]) -> Sequence[Any]:
+        return values
+
+    def _check(self, key: Any) -> bool:
+        return self.accepts(key)
+
+    def update(self, start: int, values: Sequence[Any]) -> None:
+        keys = self._keys(values)
+        try:
+            distinct = set(keys)
+        except TypeError:  # unhashable values (nested JSON): check row by row
+            self.found.extend(
+                start + i for i, v in enumerate(values) if v is not None and not self.accepts(v)
+            )
+            return
+        bad = {k for k in distinct if k is not None and not self._check(k)}
+        if bad:
+            self.found.extend(start + i for i, k in enumerate(keys) if k in bad)
+
+
+TYPE_ALIASES = {"integer": "int", "number": "float", "boolean": "bool"}
+
+
+class TypeRule(ValueRule):
+    code = "type_mismatch"
+
+    def __init__(self, column: str, dtype: str, **kwargs: Any) -> None:
+        super().__init__(column, **kwargs)
+        self.dtype = TYPE_ALIASES.get(dtype, dtype)
+        self.datetime_format: str | None = None
+        self.parser: Any = None if self.dtype == "datetime" else dtypes.PARSERS[self.dtype]
+
+    def __getstate__(self) -> dict[str, Any]:
+        # datetime parsers are closures; rebuild them from the format after unpickling
+        state = self.__dict__.copy()
+        if self.dtype == "datetime":
+            state["parser"] = None
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        if self.datetime_format is not None:
+            self.parser = dtypes.datetime_parser(self.datetime_format)
+
+    def _keys(self, values: Sequence[Any]) -> Sequence[Any]:
+        # keyed by type too, so True is not taken for 1 (they are equal in a set)
+        return [None if v is None else (type(v), v) for v in values]
+
+    def _check(self, key: Any) -> bool:
+        return self.accepts(key[1])
+
+    def accepts(self, value: Any) -> bool:
+        if self.dtype == "string":
+            return isinstance(value, str)
+        try:
+            self.parser(value)
+        except (ValueError, OverflowError):
+            return False
+        return True
+
+    def update(self, start: int, values: Sequence[Any]) -> None:
+        if self.parser is None:
+            self.datetime_format = dtypes.best_datetime_format(values)
+            if self.datetime_format is None:
+                return
+            self.parser = dtypes.datetime_parser(self.datetime_format)
+        super().update(start, values)
+
+
+class AllowedValuesRule(ValueRule):
+    code = "not_allowed"
+
+    def __init__(self, column: str, allowed: Iterable[Any], **kwargs: Any) -> None:
+        super().__init__(column, **kwargs)
+        allowed = list(allowed)
+        self.allowed = frozenset(allowed) | {str(v) for v in allowed if not isinstance(v, str)}
+
+    def accepts(self, value: Any) -> bool:
+        try:
+            return value in self.allowed
+        except TypeError:
+            return False
+
+    def update(self, start: int, values: Sequence[Any]) -> None:
+        try:
+            bad = set(values) - self.allowed
+        except TypeError:
+            super().update(start, values)
+            return
+        bad.discard(None)
+        if bad:
+            self.found.extend(start + i for i, v in enumerate(values) if v in bad)
+
+
+class RegexRule(ValueRule):
+    code = "pattern_mismatch"
+
+    def __init__(self, column: str, pattern: "re.Pattern[str]", **kwargs: Any) -> None:
+        super().__init__(column, **kwargs)
+        self.pattern = pattern
+
+    def accepts(self, value: Any) -> bool:
+        return self.pattern.fullmatch(value if isinstance(value, str) else str(value)) is not None
+
+
+class ReferencesRule(ValueRule):
+    code = "missing_reference"
+
+    def __init__(self, column: str, index: keyindex.KeyIndex, **kwargs: Any) -> None:
+        super().__init__(column, **kwargs)
+        self.index = index
+
+    def accepts(self, value: Any) -> bool:
+        return keyindex.text_digest(value) in self.index
+
+
+def _first_row(row: int) -> int:
+    return row if row >= 0 else ~row
+
+
+def _shift(row: int, offset: int) -> int:
+    # keeps the "already duplicated" flag of a ~row entry
+    return row + offset if row >= 0 else row - offset
+
+
+def _new_groups(flagged: bool, row: int) -> int:
+    """Change in groups when a key (flagged: its group is counted) meets a later occurrence.
+
+    A ~row occurrence is another side's first row whose group that side already counted.
+    """
+    return int(row >= 0) - int(flagged)
+
+
+class UniqueRule(RuleState):
+    code = "duplicate"
+
+    def __init__(
+        self,
+        column: str,
+        key: Sequence[str] | None = None,
+        *,
+        max_keys: int = 1_000_000,
+        spill_dir: str | None = None,
+        **kwargs: Any,
+    ) -> None:
+        if max_keys < 1:
+            raise ValueError("max_keys must be >= 1")
+        columns = tuple(key) if key else (column,)
+        super().__init__(",".join(columns), **kwargs)
+        self.columns = columns
+        self.max_keys = max_keys
+        self.spill_dir = spill_dir
+        self.seen: dict[bytes, int] = {}  # digest -> first row (~row once it has duplicates)
+        self.groups = 0
+        self.spilled = False
+        self._dir: Path | None = None
+        self._parts: _SpillPartitions | None = None
+
+    def update(self, start: int, values: Sequence[Any]) -> None:
+        seen = self.seen
+        composite = len(self.columns) > 1
+        for i, v in enumerate(values):
+            # skip NULL (or keys with a NULL part)
+            if v is None or (composite and None in v):
+                continue
+            digest = key_digest(v)
+            if self.spilled:
+                self._write(digest, start + i)
+            elif digest in seen:
+                self.found.add(start + i)
+                first = seen[digest]
+                if first >= 0:
+                    seen[digest] = ~first
+                    self.groups += 1
+            else:
+                seen[digest] = start + i
+                if len(seen) > self.max_keys:
+                    self._spill()
+
+    def _spill(self) -> None:
+        self._dir = Path(tempfile.mkdtemp(prefix="mfda-unique-", dir=self.spill_dir))
+        self._parts = _SpillPartitions(self._dir / "part")
+        self.spilled = True
+        for digest, row in self.seen.items():
+            self._write(digest, row)
+        self.seen = {}
+
+    def _write(self, digest: bytes, row: int) -> None:
+        assert self._parts is not None
+        self._parts.put(digest[0] % SPILL_PARTITIONS, digest, row)
+
+    def sync(self) -> None:
+        if self._parts is not None:
+            self._parts.sync()
+
+    def restore(self) -> None:
+        if self._parts is not None:
+            self._parts.restore()
+
+    def merge(self, other: RuleState, offset: int) -> None:
+        assert isinstance(other, UniqueRule)
+        super().merge(other, offset)
+        self.groups += other.groups
+        items = iter(other.seen.items())
+        if not self.spilled:
+            for digest, row in items:
+                mine = self.seen.get(digest)
+                if mine is not None:
+                    self.found.add(_first_row(row) + offset)
+                    self.groups += _new_groups(mine < 0, row)
+                    self.seen[digest] = ~_first_row(mine)
                     continue
-                # record dupes
-                if val in seen:
-                    dupes.append(i)
-                else:
-                    seen[val] = i
-            if dupes:
-                issues.append(ValidationIssue("duplicate", col, len(dupes), dupes[:5]))
-
-        # Range
-        if "min" in rules or "max" in rules:
-            lows: list[int] = []
-            highs: list[int] = []
-            min_val = rules.get("min")
-            max_val = rules.get("max")
-
-            for i, r in enumerate(records):
-                val = r.get(col)
-                if not isinstance(val, (int, float)):  # noqa: UP038
+                self.seen[digest] = _shift(row, offset)
+                if len(self.seen) > self.max_keys:
+                    self._spill()
+                    break
+        if other._parts is not None and not self.spilled:
+            self._spill()
+        # the other side's rows all come after ours, so appending keeps partitions in row order
+        for digest, row in items:
+            self._write(digest, _shift(row, offset))
+        if other._parts is not None and other._dir is not None:
+            for path in other._parts.close():
+                with open(path, "rb") as fp:
+                    for digest, row in _read_records(fp):
+                        self._write(digest, _shift(row, offset))
+            shutil.rmtree(other._dir)
+            other._parts = other._dir = None
+
+    def _resolve(self, path: Path, depth: int) -> None:
+        # a partition's records are in row order, so the first record of a digest is the key's
+        # first occurrence and every later one is a duplicate
+        local = IssueCollector(self.found.max_examples, self.found.mode, seed=depth)
+        seen: dict[bytes, bool] = {}  # digest -> flagged (its group is counted)
+        groups = 0
+        overflow = False
+        with open(path, "rb") as fp:
+            for digest, row in _read_records(fp):
+                flagged = seen.get(digest)
+                if flagged is not None:
+                    local.add(_first_row(row))
+                    groups += _new_groups(flagged, row)
+                    seen[digest] = True
                     continue
-                if isinstance(min_val, (int, float)) and val < min_val:  # noqa: UP038
-                    lows.append(i)
-                if isinstance(max_val, (int, float)) and val > max_val:  # noqa: UP038
-                    highs.append(i)
-            if lows:
-                issues.append(ValidationIssue("out_of_range", col, len(lows), lows[:5]))
-            if highs:
-                issues.append(ValidationIssue("out_of_range", col, len(highs), highs[:5]))
-
-    return ValidationReport(row_count, column_count, issues)
+                seen[digest] = row < 0
+                if len(seen) > self.max_keys and depth + 1 < DIGEST_SIZE:
+                    overflow = True
+                    break
+        if not overflow:
+            self.found.merge(local)
+            self.groups += groups
+            path.unlink()
+            return
+        # too many distinct keys for memory: split on the next digest byte and recurse
+        seen.clear()
+        parts = _SpillPartitions(path.with_suffix(""))
+        with open(path, "rb") as fp:
+            for digest, row in _read_records(fp):
+                parts.put(digest[depth + 1] % SPILL_PARTITIONS, digest, row)
+        path.unlink()
+        for part in parts.close():
+            self._resolve(part, depth + 1)
+
+    def issues(self) -> list[ValidationIssue]:
+        if self._parts is not None and self._dir is not None:
+            for path in self._parts.close():
+                self._resolve(path, 0)
+            shutil.rmtree(self._dir)
+            self._parts = self._dir = None
+        issues = super().issues()
+        for issue in issues:
+            issue.groups = self.groups
+        return issues
+
+
+class RowDuplicateRule(UniqueRule):
+    """Whole-row duplicates (unique_rows); rows are keyed by their sorted non-null items."""
+
+    code = "duplicate_row"
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__("", **kwargs)
+        self.columns = ()  # ValidationPlan hands over row keys instead of column values
+
+    def issues(self) -> list[ValidationIssue]:
+        issues = super().issues()
+        for issue in issues:
+            issue.column = None
+        return issues
+
+
+UNIQUE_MODES = ("exact", "bloom")
+
+
+class BloomUniqueRule(RuleState):
+    """Two-phase uniqueness: Bloom filter pre-pass, then exact check of candidate keys only."""
+
+    code = "duplicate"
+    passes = 2
+
+    def __init__(
+        self,
+        column: str,
+        key: Sequence[str] | None = None,
+        *,
+        expected_keys: int = 10_000_000,
+        error_rate: float = 0.01,
+        **kwargs: Any,
+    ) -> None:
+        columns = tuple(key) if key else (column,)
+        super().__init__(",".join(columns), **kwargs)
+        self.columns = columns
+        self.bloom = BloomFilter(expected_keys, error_rate)
+        self.candidates: set[bytes] = set()  # keys the filter may have seen before
+        self._verified: dict[bytes, bool] = {}  # candidate -> has a duplicate
+        self.groups = 0
+
+    def _digests(self, values: Sequence[Any]) -> Iterator[tuple[int, bytes]]:
+        composite = len(self.columns) > 1
+        for i, v in enumerate(values):
+            # skip NULL (or keys with a NULL part)
+            if v is None or (composite and None in v):
+                continue
+            yield i, key_digest(v)
+
+    def update(self, start: int, values: Sequence[Any]) -> None:
+        bloom, candidates = self.bloom, self.candidates
+        for _, digest in self._digests(values):
+            if bloom.add_hash(int.from_bytes(digest, "little")):
+                candidates.add(digest)
+
+    def rescan(self) -> bool:
+        return bool(self.candidates)
+
+    def merge(self, other: RuleState, offset: int) -> None:
+        # a key seen once in each shard is in neither shard's candidates, and the filters
+        # cannot list their keys, so cross-shard duplicates would be missed
+        raise ValueError("bloom unique checks cannot be merged; use unique_mode='exact'")
+
+    def verify(self, start: int, values: Sequence[Any]) -> None:
+        candidates, seen = self.candidates, self._verified
+        for i, digest in self._digests(values):
+            if digest not in candidates:
+                continue
+            if digest not in seen:
+                seen[digest] = False
+                continue
+            self.found.add(start + i)
+            if not seen[digest]:
+                seen[digest] = True
+                self.groups += 1
+
+    def issues(self) -> list[ValidationIssue]:
+        issues = super().issues()
+        for issue in issues:
+            issue.groups = self.groups
+        return issues
+
+
+class RangeRule(RuleState):
+    code = "out_of_range"
+
+    def __init__(self, column: str, min_val: object, max_val: object, **kwargs: Any) -> None:
+        super().__init__(column, **kwargs)
+        self.min = min_val if isinstance(min_val, (int, float)) else None  # noqa: UP038
+        self.max = max_val if isinstance(max_val, (int, float)) else None  # noqa: UP038
+        self.highs = IssueCollector(self.found.max_examples, self.found.mode)
+
+    def update(self, start: int, values: Sequence[Any]) -> None:
+        lo, hi = self.min, self.max
+        parse = dtypes.PARSERS["float"]
+        for i, v in enumerate(values):
+            if isinstance(v, str):  # numeric text, e.g. from CSV, as infer_schema reads it
+                try:
+                    v = parse(v)
+                except (ValueError, OverflowError):
+                    continue
+            elif not isinstance(v, (int, float)):  # noqa: UP038
+                continue
+            if lo is not None and v < lo:
+                self.found.add(start + i)
+            if hi is not None and v > hi:
+                self.highs.add(start + i)
+
+    def issues(self) -> list[ValidationIssue]:
+        # lows and highs are reported as separate issues
+        issues = super().issues()
+        if self.highs.count:
+            issues.append(self.highs.issue(self.code, self.column))
+        return issues
+
+    def violations(self) -> int:
+        return self.found.count + self.highs.count
+
+    def merge(self, other: RuleState, offset: int) -> None:
+        assert isinstance(other, RangeRule)
+        super().merge(other, offset)
+        self.highs.merge(other.highs, offset)
+
+
+OUTLIER_METHODS = {"zscore": 3.0, "iqr": 1.5}  # method -> default threshold
+OUTLIER_MODES = ("one-pass", "two-pass")
+
+
+def _numbers(start: int, values: Sequence[Any]) -> tuple[list[float], list[int]]:
+    nums: list[float] = []
+    rows: list[int] = []
+    for i, v in enumerate(values):
+        if v is None or isinstance(v, bool):
+            continue
+        if isinstance(v, (int, float)):  # noqa: UP038
+            x = float(v)
+        else:
+            try:
+                x = dtypes.PARSERS["float"](v)
+            except (ValueError, OverflowError):
+                continue
+        if not math.isnan(x):
+            nums.append(x)
+            rows.append(start + i)
+    return nums, rows
+
+
+class OutlierRule(RuleState):
+    """Data-relative bounds (z-score or IQR) from streaming moments / a quantile sketch."""
+
+    code = "outlier"
+
+    def __init__(
+        self,
+        column: str,
+        method: str = "zscore",
+        threshold: float | None = None,
+        *,
+        mode: str = "one-pass",
+        max_candidates: int = 10_000,
+        sketch_k: int = 200,
+        **kwargs: Any,
+    ) -> None:
+        if method not in OUTLIER_METHODS:
+            raise ValueError(f"Unknown outlier method: {method}")
+        if mode not in OUTLIER_MODES:
+            raise ValueError(f"Unknown outlier mode: {mode}")
+        if max_candidates < 1:
+            raise ValueError("max_candidates must be >= 1")
+        super().__init__(column, **kwargs)
+        self.method = method
+        self.threshold = OUTLIER_METHODS[method] if threshold is None else threshold
+        self.mode = mode
+        self.passes = 2 if mode == "two-pass" else 1
+        self.max_candidates = max_candidates
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sketch = KLLSketch(sketch_k) if method == "iqr" else None
+        # one-pass candidates: min-heaps of (value, row) and (-value, row) of the extremes
+        self.high: list[tuple[float, int]] = []
+        self.low: list[tuple[float, int]] = []
+        self.exact = True
+        self._bounds: tuple[float, float] | None = None
+        self._done = False
+
+    def _add_moments(self, n: int, mean: float, m2: float) -> None:
+        # Chan et al. pairwise update, as in analysis.ColumnState
+        total = self.count + n
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+
+    def _keep(self, heap: list[tuple[float, int]], items: Iterable[tuple[float, int]]) -> None:
+        cap = self.max_candidates
+        for item in items:
+            if len(heap) < cap:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    def update(self, start: int, values: Sequence[Any]) -> None:
+        nums, rows = _numbers(start, values)
+        if not nums:
+            return
+        mean = math.fsum(nums) / len(nums)
+        self._add_moments(len(nums), mean, math.fsum((x - mean) ** 2 for x in nums))
+        if self.sketch is not None:
+            self.sketch.update(nums)
+        if self.mode == "one-pass":
+            full = len(self.high) >= self.max_candidates
+            top = self.high[0][0] if full else -math.inf
+            bottom = -self.low[0][0] if full else math.inf
+            self._keep(self.high, ((x, r) for x, r in zip(nums, rows, strict=True) if x > top))
+            self._keep(self.low, ((-x, r) for x, r in zip(nums, rows, strict=True) if x < bottom))
+
+    def bounds(self) -> tuple[float, float] | None:
+        """(low, high) limits; None until there is enough data to define them."""
+        if self._bounds is None:
+            if self.sketch is not None and self.sketch.n:
+                q1, q3 = self.sketch.quantiles([0.25, 0.75])
+                assert q1 is not None and q3 is not None
+                spread = self.threshold * (q3 - q1)
+                self._bounds = (q1 - spread, q3 + spread)
+            elif self.sketch is None and self.count > 1:
+                spread = self.threshold * math.sqrt(self.m2 / (self.count - 1))
+                self._bounds = (self.mean - spread, self.mean + spread)
+        return self._bounds
+
+    def merge(self, other: RuleState, offset: int) -> None:
+        assert isinstance(other, OutlierRule)
+        super().merge(other, offset)
+        if other.count:
+            self._add_moments(other.count, other.mean, other.m2)
+        if self.sketch is not None and other.sketch is not None:
+            self.sketch.merge(other.sketch)
+        self._keep(self.high, ((x, r + offset) for x, r in other.high))
+        self._keep(self.low, ((x, r + offset) for x, r in other.low))
+
+    def rescan(self) -> bool:
+        return self.mode == "two-pass" and self.bounds() is not None
+
+    def verify(self, start: int, values: Sequence[Any]) -> None:
+        bounds = self.bounds()
+        assert bounds is not None
+        lo, hi = bounds
+        nums, rows = _numbers(start, values)
+        self.found.extend(r for x, r in zip(nums, rows, strict=True) if x < lo or x > hi)
+
+    def issues(self) -> list[ValidationIssue]:
+        bounds = self.bounds()
+        if self.mode == "one-pass" and not self._done and bounds is not None:
+            self._done = True
+            lo, hi = bounds
+            rows = {r for x, r in self.high if x > hi} | {r for x, r in self.low if -x < lo}
+            self.found.extend(sorted(rows))
+            # a full heap whose least extreme value is still out of bounds may have dropped some
+            cap = self.max_candidates
+            self.exact = not (
+                (len(self.high) >= cap and self.high[0][0] > hi)
+                or (len(self.low) >= cap and -self.low[0][0] < lo)
+            )
+        issues = super().issues()
+        for issue in issues:
+            issue.exact = self.exact
+        return issues
+
+
+@dataclass
+class ValidationPlan:
+    """Compiled schema: rule states grouped by column, evaluated in one pass over batches."""
+
+    rules: list[RuleState]
+    row_count: int = 0
+    columns: set[str] = field(default_factory=set)
+
+    @staticmethod
+    def _inputs(
+        rules: Sequence[RuleState], batch: Sequence[dict[str, Any]]
+    ) -> Iterator[tuple[RuleState, list[Any]]]:
+        # each column is pulled out of the batch once, however many rules read it
+        by_column: dict[str, list[Any]] = {}
+
+        def column(name: str) -> list[Any]:
+            values = by_column.get(name)
+            if values is None:
+                values = by_column[name] = [r.get(name) for r in batch]
+            return values
+
+        for rule in rules:
+            if not rule.columns:  # whole-row rules
+                yield (
+                    rule,
+                    [tuple(sorted((k, v) for k, v in r.items() if v is not None)) for r in batch],
+                )
+            elif len(rule.columns) == 1:
+                yield rule, column(rule.columns[0])
+            else:
+                yield rule, list(zip(*map(column, rule.columns), strict=True))
+
+    def update(self, batch: Sequence[dict[str, Any]]) -> None:
+        for r in batch:
+            self.columns.update(r)
+        for rule, values in self._inputs(self.rules, batch):
+            rule.update(self.row_count, values)
+        self.row_count += len(batch)
+
+    def rescan(self) -> list[RuleState]:
+        """Rules that need a second pass over the rows seen so far."""
+        return [rule for rule in self.rules if rule.rescan()]
+
+    def verify(self, records: Iterable[dict[str, Any]], *, batch_rows: int = 10_000) -> None:
+        """Second pass: feed the first row_count records again to the rules that asked."""
+        rules = self.rescan()
+        it = itertools.islice(records, self.row_count)
+        start = 0
+        while rules and (batch := list(itertools.islice(it, batch_rows))):
+            for rule, values in self._inputs(rules, batch):
+                rule.verify(start, values)
+            start += len(batch)
+
+    def violations(self) -> int:
+        return sum(rule.violations() for rule in self.rules)
+
+    def sync(self) -> None:
+        """Prepare for pickling as a checkpoint (see RuleState.sync())."""
+        for rule in self.rules:
+            rule.sync()
+
+    def restore(self) -> None:
+        """Roll on-disk rule state back to this (unpickled) checkpoint."""
+        for rule in self.rules:
+            rule.restore()
+
+    def merge(self, other: "ValidationPlan") -> None:
+        """Fold in a plan compiled from the same schema and run over the rows after ours."""
+        if [(type(r), r.column) for r in self.rules] != [(type(r), r.column) for r in other.rules]:
+            raise ValueError("cannot merge validation plans compiled from different schemas")
+        for mine, theirs in zip(self.rules, other.rules, strict=True):
+            mine.merge(theirs, self.row_count)
+        self.row_count += other.row_count
+        self.columns |= other.columns
+
+    def report(self, *, stopped_early: bool = False) -> ValidationReport:
+        issues = [issue for rule in self.rules for issue in rule.issues()]
+        return ValidationReport(self.row_count, len(self.columns), issues, stopped_early)
+
+
+def _unique_key(col: str, unique: object) -> list[str] | None:
+    if unique is True:
+        return None
+    if (
+        not isinstance(unique, list)
+        or not unique
+        or not all(isinstance(c, str) for c in unique)
+        or len(set(unique)) != len(unique)
+    ):
+        raise SchemaError(f"{col}: unique must be true or a list of distinct column names")
+    return unique
+
+
+def _references(col: str, ref: object, index_dir: str | None) -> keyindex.KeyIndex:
+    if (
+        not isinstance(ref, dict)
+        or not isinstance(ref.get("file"), str)
+        or not isinstance(ref.get("column"), str)
+    ):
+        raise SchemaError(f'{col}: references must be {{"file": ..., "column": ...}}')
+    try:
+        return keyindex.open_index(
+            ref["file"], ref["column"], fmt=ref.get("format"), index_dir=index_dir
+        )
+    except (OSError, ConfigurationError) as e:
+        raise SchemaError(f"{col}: cannot index {ref['file']}: {e}") from e
+
+
+def _outlier(col: str, spec: object, opts: dict[str, Any]) -> OutlierRule:
+    if isinstance(spec, str):
+        spec = {"method": spec}
+    if not isinstance(spec, dict) or not set(spec) <= {
+        "method",
+        "threshold",
+        "mode",
+        "max_candidates",
+    }:
+        raise SchemaError(f"{col}: outlier must be a method name or an object")
+    threshold = spec.get("threshold")
+    if threshold is not None and (
+        isinstance(threshold, bool) or not isinstance(threshold, (int, float)) or threshold <= 0  # noqa: UP038
+    ):
+        raise SchemaError(f"{col}: outlier threshold must be a positive number")
+    try:
+        return OutlierRule(
+            col,
+            spec.get("method", "zscore"),
+            threshold,
+            mode=spec.get("mode", "one-pass"),
+            max_candidates=spec.get("max_candidates", 10_000),
+            **opts,
+        )
+    except (ValueError, TypeError) as e:
+        raise SchemaError(f"{col}: {e}") from e
+
+
+def _value_rules(
+    col: str, spec: dict[str, object], opts: dict[str, Any], index_dir: str | None
+) -> list[RuleState]:
+    rules: list[RuleState] = []
+    if "type" in spec:
+        dtype = spec["type"]
+        if not isinstance(dtype, str) or TYPE_ALIASES.get(dtype, dtype) not in dtypes.DTYPES:
+            raise SchemaError(f"{col}: unknown type {dtype!r}")
+        rules.append(TypeRule(col, dtype, **opts))
+    if "min" in spec or "max" in spec:
+        rules.append(RangeRule(col, spec.get("min"), spec.get("max"), **opts))
+    if "allowed_values" in spec:
+        allowed = spec["allowed_values"]
+        if not isinstance(allowed, list):
+            raise SchemaError(f"{col}: allowed_values must be a list")
+        try:
+            rules.append(AllowedValuesRule(col, allowed, **opts))
+        except TypeError as e:
+            raise SchemaError(f"{col}: allowed_values must be scalars ({e})") from e
+    if "regex" in spec:
+        pattern = spec["regex"]
+        if not isinstance(pattern, str):
+            raise SchemaError(f"{col}: regex must be a string")
+        try:
+            compiled = re.compile(pattern)
+        except re.error as e:
+            raise SchemaError(f"{col}: invalid regex {pattern!r}: {e}") from e
+        rules.append(RegexRule(col, compiled, **opts))
+    if "references" in spec:
+        rules.append(ReferencesRule(col, _references(col, spec["references"], index_dir), **opts))
+    if "outlier" in spec:
+        rules.append(_outlier(col, spec["outlier"], opts))
+    return rules
+
+
+def compile_plan(
+    schema: Schema,
+    *,
+    max_examples: int = 5,
+    example_mode: str = "first",
+    unique_max_keys: int = 1_000_000,
+    spill_dir: str | None = None,
+    unique_mode: str = "exact",
+    unique_expected_keys: int = 10_000_000,
+    index_dir: str | None = None,
+) -> ValidationPlan:
+    if unique_mode not in UNIQUE_MODES:
+        raise ValueError(f"Unknown unique mode: {unique_mode}")
+    opts: dict[str, Any] = {"max_examples": max_examples, "example_mode": example_mode}
+    rules: list[RuleState] = []
+    for col, spec in schema.items():
+        if col == "unique_rows" and isinstance(spec, bool):
+            if spec:
+                rules.append(
+                    RowDuplicateRule(max_keys=unique_max_keys, spill_dir=spill_dir, **opts)
+                )
+            continue
+        if spec.get("required"):
+            rules.append(RequiredRule(col, **opts))
+        if spec.get("nullable", True) is False and not spec.get("required"):
+            rules.append(NullableRule(col, **opts))
+        if spec.get("unique", False) is not False:
+            key = _unique_key(col, spec["unique"])
+            if unique_mode == "bloom":
+                rules.append(BloomUniqueRule(col, key, expected_keys=unique_expected_keys, **opts))
+            else:
+                rules.append(
+                    UniqueRule(col, key, max_keys=unique_max_keys, spill_dir=spill_dir, **opts)
+                )
+        rules.extend(_value_rules(col, spec, opts, index_dir))
+    return ValidationPlan(rules)
+
+
+Shard = Iterable[dict[str, Any]] | Callable[[], Iterable[dict[str, Any]]]
+
+
+def validate_shard(
+    shard: Shard, schema: Schema, options: dict[str, Any], batch_rows: int = 10_000
+) -> ValidationPlan:
+    """Run a freshly compiled plan over one shard (records, or a callable that reads them)."""
+    plan = compile_plan(schema, **options)
+    it = iter(shard() if callable(shard) else shard)
+    while batch := list(itertools.islice(it, batch_rows)):
+        plan.update(batch)
+    return plan
+
+
+def validate_many(
+    shards: Iterable[Shard],
+    schema: Schema,
+    *,
+    workers: int = 1,
+    batch_rows: int = 10_000,
+    max_examples: int = 5,
+    example_mode: str = "first",
+    unique_max_keys: int = 1_000_000,
+    spill_dir: str | None = None,
+    index_dir: str | None = None,
+) -> ValidationReport:
+    """
+    Validate consecutive shards (row slices, or the files of a multi-part dataset) as one
+    dataset; workers > 1 runs shards in a process pool. Row indices are global, in shard order.
+    """
+    with tempfile.TemporaryDirectory(prefix="mfda-validate-", dir=spill_dir) as tmp:
+        options: dict[str, Any] = {
+            "max_examples": max_examples,
+            "example_mode": example_mode,
+            "unique_max_keys": unique_max_keys,
+            "spill_dir": tmp,
+            "index_dir": index_dir,
+        }
+        result = compile_plan(schema, **options)
+        if any(rule.passes > 1 for rule in result.rules):
+            raise ValueError("two-pass rules cannot be validated in shards")
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for plan in pool.map(
+                    validate_shard,
+                    shards,
+                    itertools.repeat(schema),
+                    itertools.repeat(options),
+                    itertools.repeat(batch_rows),
+                ):
+                    result.merge(plan)
+        else:
+            for shard in shards:
+                result.merge(validate_shard(shard, schema, options, batch_rows))
+        return result.report()
+
+
+def validate(
+    records: Iterable[dict[str, Any]],
+    schema: Schema,
+    *,
+    batch_rows: int = 10_000,
+    max_examples: int = 5,
+    example_mode: str = "first",
+    max_issues: int | None = None,
+    unique_max_keys: int = 1_000_000,
+    spill_dir: str | None = None,
+    unique_mode: str = "exact",
+    unique_expected_keys: int | None = None,
+    workers: int = 1,
+    index_dir: str | None = None,
+) -> ValidationReport:
+    if max_issues is not None and max_issues < 1:
+        raise ValueError("max_issues must be >= 1")
+    if workers > 1:
+        if max_issues is not None or unique_mode != "exact":
+            raise ValueError("workers > 1 needs max_issues=None and unique_mode='exact'")
+        if isinstance(records, Sequence) and len(records) > workers:
+            size = math.ceil(len(records) / workers)
+            return validate_many(
+                [records[i : i + size] for i in range(0, len(records), size)],
+                schema,
+                workers=workers,
+                batch_rows=batch_rows,
+                max_examples=max_examples,
+                example_mode=example_mode,
+                unique_max_keys=unique_max_keys,
+                spill_dir=spill_dir,
+                index_dir=index_dir,
+            )
+    if unique_expected_keys is None:
+        unique_expected_keys = max(1, len(records)) if isinstance(records, Sized) else 10_000_000
+    with tempfile.TemporaryDirectory(prefix="mfda-validate-", dir=spill_dir) as tmp:
+        plan = compile_plan(
+            schema,
+            max_examples=max_examples,
+            example_mode=example_mode,
+            unique_max_keys=unique_max_keys,
+            spill_dir=tmp,
+            unique_mode=unique_mode,
+            unique_expected_keys=unique_expected_keys,
+            index_dir=index_dir,
+        )
+        if any(rule.passes > 1 for rule in plan.rules) and iter(records) is records:
+            raise ValueError(
+                "two-pass rules (unique_mode='bloom', two-pass outliers) need records that "
+                "can be iterated twice"
+            )
+        it = iter(records)
+        stopped = False
+        while batch := list(itertools.islice(it, batch_rows)):
+            plan.update(batch)
+            if max_issues is not None and plan.violations() >= max_issues:
+                stopped = True
+                break
+        plan.verify(records, batch_rows=batch_rows)
+        return plan.report(stopped_early=stopped)
+
+
+INFER_TYPES = ("bool", "int", "float", "datetime")  # narrowest first
+_SCHEMA_TYPES = {"bool": "boolean", "int": "integer", "float": "number"}
+
+
+class _ColumnProfile:
+    """Streaming profile of one column for infer_schema()."""
+
+    def __init__(self, max_enum: int) -> None:
+        self.rows = 0  # rows since the column first appeared
+        self.nulls = 0
+        self.candidates = list(INFER_TYPES)
+        self.parsers: dict[str, Any] = {t: dtypes.PARSERS[t] for t in INFER_TYPES}
+        self.datetime_format: str | None = None
+        self.all_str = True
+        self.low: float | None = None
+        self.high: float | None = None
+        self.enum: set[Any] | None = set()
+        self.max_enum = max_enum
+        self.hll = HyperLogLog()
+
+    def _accepts(self, dtype: str, value: Any) -> bool:
+        try:
+            self.parsers[dtype](value)
+        except (ValueError, OverflowError):
+            return False
+        return True
+
+    def update(self, values: list[Any]) -> None:
+        self.rows += len(values)
+        non_null = [v for v in values if v is not None]
+        self.nulls += len(values) - len(non_null)
+        if not non_null:
+            return
+        if self.datetime_format is None and "datetime" in self.candidates:
+            self.datetime_format = dtypes.best_datetime_format(non_null) or "iso"
+            self.parsers["datetime"] = dtypes.datetime_parser(self.datetime_format)
+        try:
+            distinct = list({(type(v), v) for v in non_null})
+        except TypeError:  # unhashable values (nested JSON) have no schema type
+            self.candidates, self.all_str, self.enum = [], False, None
+            return
+        self.all_str = self.all_str and all(t is str for t, _ in distinct)
+        self.candidates = [
+            t for t in self.candidates if all(self._accepts(t, v) for _, v in distinct)
+        ]
+        for _, v in distinct:
+            self.hll.add(v)
+        if self.enum is not None:
+            self.enum.update(v for _, v in distinct)
+            if len(self.enum) > self.max_enum:
+                self.enum = None
+        if self.candidates and self.candidates[0] in ("int", "float"):
+            numbers = [self.parsers[self.candidates[0]](v) for _, v in distinct]
+            low, high = min(numbers), max(numbers)
+            self.low = low if self.low is None else min(self.low, low)
+            self.high = high if self.high is None else max(self.high, high)
+
+    def spec(self, rows: int) -> dict[str, object]:
+        spec: dict[str, object] = {}
+        count = self.rows - self.nulls
+        if count == rows:
+            spec["required"] = True
+        if count == 0:
+            return spec
+        dtype = self.candidates[0] if self.candidates else ("string" if self.all_str else None)
+        if dtype is not None:
+            spec["type"] = _SCHEMA_TYPES.get(dtype, dtype)
+        # allow for the sketch's error (about 2 standard errors) on large counts
+        slack = math.floor(2 * 1.04 / math.sqrt(self.hll.m) * count)
+        if dtype in ("int", "string") and count > 1 and self.hll.estimate() >= count - slack:
+            spec["unique"] = True
+        if dtype in ("int", "float"):
+            spec["min"], spec["max"] = self.low, self.high
+        if dtype == "string" and self.enum is not None and 2 * len(self.enum) <= count:
+            spec["allowed_values"] = sorted(self.enum)
+        return spec
+
+
+def infer_schema(
+    records: Iterable[dict[str, Any]],
+    sample: int | None = 50,
+    *,
+    seed: int = 0,
+    max_enum: int = 20,
+    batch_rows: int = 10_000,
+) -> Schema:
+    """Schema the given rows pass, from a uniform sample of them (or all when sample=None)."""
+    if sample is not None:
+        records, _ = reservoir_sample(records, sample, seed=seed)
+    profiles: dict[str, _ColumnProfile] = {}
+    rows = 0
+    it = iter(records)
+    while batch := list(itertools.islice(it, batch_rows)):
+        for r in batch:
+            for name in r:
+                if name not in profiles:
+                    profiles[name] = _ColumnProfile(max_enum)
+        for name, profile in profiles.items():
+            profile.update([r.get(name) for r in batch])
+        rows += len(batch)
+    return {name: profile.spec(rows) for name, profile in profiles.items()}
@@ -1,45 +1,82 @@
 """
 Save histogram of numeric non-null values; raises if empty
 
+Histograms are binned by mfda.histogram in batches (exact min/max bins by default, or
+sketch-clipped / one-pass adaptive bins), so matplotlib only receives the bin counts and
+rendering cost does not depend on the row count. save_binned_histogram() draws a
+precomputed histogram.Histogram.
+
+Many charts at once: chart_data() computes the histogram bins and top-k counts of any number
+of columns in one scan (adaptive bins by default; other binnings scan a second time for the
+bin counts only), and render_charts() draws them in a process pool with the Agg backend, one
+PNG per chart in an output directory.
+
+Bar charts select top-k with the same helpers as the analysis layer
+(exact heap selection, or fixed-memory sketches with mode="approx").
+
+Correlation heatmaps take a precomputed analysis.CorrelationMatrix (undefined cells left blank).
+
+Time-series charts take a precomputed timebucket.TimeBucketReport: rows per bucket on top, then
+the per-bucket mean of up to `max_series` numeric columns.
 """
 
+import itertools
 import os
+import re
 from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
 
+import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
+
+from mfda import dtypes
+from mfda.analysis import CorrelationMatrix
+from mfda.histogram import Histogram, StreamingHistogram, compute_histogram, numeric_values
+from mfda.sketches import HeavyHitters, approx_top_k, top_k_exact
+from mfda.timebucket import TimeBucketReport
+
+CHART_KINDS = ("hist", "bar")
+
+
+@dataclass
+class TopCounts:
+    column: str
+    top: list[tuple[Any, int]]  # (value, count), most frequent first
+    top_k: int
+
+
+Chart = Histogram | TopCounts
 
 
 # numeric
 def save_histogram(
-    records: list[dict[str, object]],
+    records: Iterable[dict[str, object]],
     *,
     column: str,
     out_path: str | os.PathLike[str],
     bins: int = 10,
+    binning: str = "minmax",
 ) -> None:
-    values = []
-    for record in records:
-        val = record.get(column)
-        if val is None:
-            continue
-        if isinstance(val, (int, float)):  # noqa: UP038
-            values.append(val)
-        elif isinstance(val, str):
-            try:
-                values.append(float(val))  # coerce: convert string -> float
-            except ValueError:
-                continue
-        # empty list
-        if not values:
-            raise ValueError(f"No numeric data in column {column}")
+    hist = compute_histogram(records, column, bins=bins, binning=binning)
+    save_binned_histogram(hist, out_path=out_path)
 
-    # plot
+
+def save_binned_histogram(hist: Histogram, *, out_path: str | os.PathLike[str]) -> None:
+    # plot: one weighted sample per bin, so the figure does not grow with the data
     fig, ax = plt.subplots()
-    ax.hist(values, bins=bins)
+    ax.hist(hist.edges[:-1], bins=hist.edges.tolist(), weights=hist.counts)
     # set labels
-    ax.set_xlabel(column)
+    ax.set_xlabel(hist.column)
     ax.set_ylabel("Frequency")
-    ax.set_title(f"Histogram of {column}")
+    title = f"Histogram of {hist.column}"
+    if hist.clipped:
+        title += f" ({hist.clipped} outside the range counted in the outer bins)"
+    ax.set_title(title)
     # save plot
     fig.savefig(out_path)
     plt.close(fig)
@@ -47,29 +84,224 @@ def save_histogram(
 
 # categorical
 def save_bar_counts(
-    records: list[dict[str, object]],
+    records: Iterable[dict[str, object]],
     *,
     column: str,
     out_path: str | os.PathLike[str],
     top_k: int = 10,
+    mode: str = "exact",
+    capacity: int = 1024,
 ) -> None:
-    values = [rec.get(column) for rec in records if rec.get(column) is not None]
+    # values are streamed into the counter, so approx mode never holds the column
+    values = (v for rec in records if (v := rec.get(column)) is not None)
+    if mode == "approx":
+        top, _, _ = approx_top_k(values, top_k, capacity=capacity)
+    else:
+        top = top_k_exact(Counter(values), top_k)
 
-    if not values:
+    if not top:
         raise ValueError(f"No categorical data in column {column}")
+    save_top_counts(TopCounts(column, top, top_k), out_path=out_path)
 
-    freq = Counter(values)
-    sorted_items = sorted(freq.items(), key=lambda kv: (-kv[1], str(kv[0])))
-    top = sorted_items[:top_k]
 
-    raw_labels, counts = zip(*top, strict=False)
+def save_top_counts(counts: TopCounts, *, out_path: str | os.PathLike[str]) -> None:
+    raw_labels, values = zip(*counts.top, strict=False)
     labels = [str(x) for x in raw_labels]
 
     # plot
     fig, ax = plt.subplots()
-    ax.bar(labels, counts)
-    ax.set_xlabel(column)
+    ax.bar(labels, values)
+    ax.set_xlabel(counts.column)
     ax.set_ylabel("Count")
-    ax.set_title(f"Top {top_k} values of {column}")
+    ax.set_title(f"Top {counts.top_k} values of {counts.column}")
+    fig.savefig(out_path)
+    plt.close(fig)
+
+
+# correlation
+def save_heatmap(
+    matrix: CorrelationMatrix,
+    *,
+    out_path: str | os.PathLike[str],
+) -> None:
+    if not matrix.columns:
+        raise ValueError("No numeric columns to correlate")
+
+    data = np.array(
+        [[np.nan if v is None else v for v in row] for row in matrix.values], dtype=np.float64
+    )
+    n = len(matrix.columns)
+
+    # plot
+    fig, ax = plt.subplots(figsize=(max(4.0, 0.6 * n + 2), max(3.5, 0.6 * n + 1.5)))
+    im = ax.imshow(data, cmap="coolwarm", vmin=-1.0, vmax=1.0)
+    ax.set_xticks(range(n), labels=matrix.columns, rotation=45, ha="right")
+    ax.set_yticks(range(n), labels=matrix.columns)
+    if n <= 15:
+        for i in range(n):
+            for j in range(n):
+                if not np.isnan(data[i, j]):
+                    ax.text(j, i, f"{data[i, j]:.2f}", ha="center", va="center", fontsize=8)
+    fig.colorbar(im, ax=ax)
+    ax.set_title(f"{matrix.method.capitalize()} correlation")
+    fig.tight_layout()
     fig.savefig(out_path)
     plt.close(fig)
+
+
+# time series
+def save_time_series(
+    buckets: TimeBucketReport,
+    *,
+    out_path: str | os.PathLike[str],
+    max_series: int = 4,
+) -> None:
+    if not buckets.buckets:
+        raise ValueError(f"No timestamped rows in column {buckets.column}")
+
+    starts = [b.start for b in buckets.buckets]
+    columns = list(dict.fromkeys(ns.column for b in buckets.buckets for ns in b.report.numeric))[
+        :max_series
+    ]
+
+    # plot
+    fig, axes = plt.subplots(
+        len(columns) + 1, 1, sharex=True, figsize=(8, 2.2 * (len(columns) + 1)), squeeze=False
+    )
+    width = buckets.bucket_seconds / 86_400 * 0.9  # matplotlib dates are in days
+    axes[0, 0].bar(starts, [b.report.rows for b in buckets.buckets], width=width, align="edge")
+    axes[0, 0].set_ylabel("Rows")
+    for ax, col in zip(axes[1:, 0], columns, strict=True):
+        means = [
+            next((ns.mean for ns in b.report.numeric if ns.column == col), None)
+            for b in buckets.buckets
+        ]
+        ax.plot(starts, [np.nan if m is None else m for m in means], marker=".")
+        ax.set_ylabel(f"mean {col}")
+    axes[-1, 0].set_xlabel(f"{buckets.column} (UTC)")
+    axes[0, 0].set_title(f"Per-bucket summary by {buckets.column}")
+    fig.autofmt_xdate()
+    fig.tight_layout()
+    fig.savefig(out_path)
+    plt.close(fig)
+
+
+# many charts
+def chart_columns(records: Sequence[dict[str, object]]) -> list[tuple[str, str]]:
+    """(kind, column) for each column of the records: histograms for numbers, else bars."""
+    out = []
+    for col in dict.fromkeys(k for r in records for k in r):
+        dtype = dtypes.classify([r.get(col) for r in records])
+        out.append(("hist" if dtype in {"int", "float"} else "bar", col))
+    return out
+
+
+def _batches(records: Iterable[dict[str, object]], size: int) -> Iterator[list[dict[str, object]]]:
+    it = iter(records)
+    while batch := list(itertools.islice(it, size)):
+        yield batch
+
+
+def chart_data(
+    records: Iterable[dict[str, object]],
+    charts: Sequence[tuple[str, str]] | None = None,
+    *,
+    bins: int = 10,
+    binning: str = "adaptive",
+    top_k: int = 10,
+    mode: str = "exact",
+    capacity: int = 1024,
+    batch_rows: int = 10_000,
+) -> tuple[list[Chart], list[tuple[str, str]]]:
+    """
+    Aggregates for (kind, column) charts in one scan; charts=None charts every column of the
+    first batch (see chart_columns). Returns the charts with data and those without any.
+    """
+    batches = _batches(records, batch_rows)
+    first = next(batches, [])
+    specs = list(dict.fromkeys(charts if charts is not None else chart_columns(first)))
+    for kind, _ in specs:
+        if kind not in CHART_KINDS:
+            raise ValueError(f"Unknown chart kind: {kind}")
+    hists = {col: StreamingHistogram(bins, binning) for kind, col in specs if kind == "hist"}
+    counters: dict[str, Counter[Any] | HeavyHitters] = {
+        col: HeavyHitters(capacity) if mode == "approx" else Counter()
+        for kind, col in specs
+        if kind == "bar"
+    }
+    rescan = any(h.passes > 1 for h in hists.values())
+    if rescan and iter(records) is records:
+        raise ValueError(f"binning={binning!r} reads the records twice; use binning='adaptive'")
+
+    for batch in itertools.chain([first], batches):
+        for col, hist in hists.items():
+            hist.update(numeric_values(r.get(col) for r in batch))
+        for col, counter in counters.items():
+            counter.update(v for r in batch if (v := r.get(col)) is not None)
+    if rescan:
+        for batch in _batches(records, batch_rows):
+            for col, hist in hists.items():
+                hist.count(numeric_values(r.get(col) for r in batch))
+
+    out: list[Chart] = []
+    empty: list[tuple[str, str]] = []
+    for kind, col in specs:
+        chart: Chart | None
+        if kind == "hist":
+            chart = hists[col].result(col)
+        else:
+            counter = counters[col]
+            if isinstance(counter, HeavyHitters):
+                top = counter.top(top_k)[0]
+            else:
+                top = top_k_exact(counter, top_k)
+            chart = TopCounts(col, top, top_k) if top else None
+        if chart is None:
+            empty.append((kind, col))
+        else:
+            out.append(chart)
+    return out, empty
+
+
+def _render(chart: Chart, out_path: str) -> str:
+    if isinstance(chart, Histogram):
+        save_binned_histogram(chart, out_path=out_path)
+    else:
+        save_top_counts(chart, out_path=out_path)
+    return out_path
+
+
+def _use_agg() -> None:
+    matplotlib.use("Agg")
+
+
+def chart_paths(charts: Sequence[Chart], out_dir: str | os.PathLike[str]) -> list[Path]:
+    """One file per chart: <column>_hist.png or <column>_bar.png, made unique and path-safe."""
+    paths: list[Path] = []
+    for chart in charts:
+        kind = "hist" if isinstance(chart, Histogram) else "bar"
+        stem = re.sub(r"[^\w.-]+", "_", chart.column).strip("._") or "column"
+        path = Path(out_dir) / f"{stem}_{kind}.png"
+        n = 1
+        while path in paths:
+            n += 1
+            path = Path(out_dir) / f"{stem}_{kind}_{n}.png"
+        paths.append(path)
+    return paths
+
+
+def render_charts(
+    charts: Sequence[Chart], out_dir: str | os.PathLike[str], *, workers: int | None = None
+) -> list[Path]:
+    """Draw every chart into out_dir with `workers` processes (default: one per CPU)."""
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    paths = chart_paths(charts, out_dir)
+    workers = min(len(charts), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        for chart, path in zip(charts, paths, strict=True):
+            _render(chart, str(path))
+    else:
+        # figures only need the bin/top-k aggregates, which are small to send to the workers
+        with ProcessPoolExecutor(max_workers=workers, initializer=_use_agg) as pool:
+            list(pool.map(_render, charts, map(str, paths)))
+    return paths
@@ -67,3 +67,267 @@ def test_mixed_types_numeric_and_categorical_split():
 
     assert _by_col_numeric(rep, "age") is not None
     assert _by_col_categorical(rep, "name") is not None
+
+
+def test_categorical_topk_approx_mode():
+    # capacity 2 forces an eviction: "green" is replaced by "blue" with error 1
+    records = [{"color": c} for c in ["green"] + ["red"] * 5 + ["blue"] * 3] + [{"color": None}]
+    rep = AN.analyze(records, top_k=2, top_k_mode="approx", top_k_capacity=2)
+
+    s = _by_col_categorical(rep, "color")
+    assert s is not None
+    assert s.count == 9 and s.nulls == 1
+    assert s.distinct == 3
+    assert [v for v, _ in s.top] == ["red", "blue"]
+    assert s.top[0] == ("red", 5)
+    assert s.top[1][1] - s.top_error <= 3 <= s.top[1][1]
+
+
+def test_numeric_quantiles():
+    records = [{"ms": float(v)} for v in range(1, 101)] + [{"ms": None}]
+    rep = AN.analyze(records, quantiles=[0.5, 0.99])
+
+    s = _by_col_numeric(rep, "ms")
+    assert s is not None
+    assert s.quantiles == {0.5: 50.0, 0.99: 99.0}
+    assert AN.quantile_label(0.999) == "p99.9"
+
+
+def test_numpy_engine_matches_python_engine():
+    records = [
+        {"age": 10, "score": 1.5, "name": "Ana"},
+        {"age": None, "score": 2.5, "name": "Bob"},
+        {"age": 20, "score": None, "name": "Ana"},
+        {"age": 30, "score": 4.0, "name": None},
+        {"age": 20, "score": 4.0, "name": "Chi"},
+    ]
+    py = AN.analyze(records, quantiles=[0.5])
+    vec = AN.analyze(records, quantiles=[0.5], engine="numpy")
+
+    for col in ("age", "score"):
+        a, b = _by_col_numeric(py, col), _by_col_numeric(vec, col)
+        assert a is not None and b is not None
+        assert (a.count, a.nulls, a.distinct) == (b.count, b.nulls, b.distinct)
+        assert (a.min, a.max, a.quantiles) == (b.min, b.max, b.quantiles)
+        assert abs(a.mean - b.mean) < 1e-9 and abs(a.std - b.std) < 1e-9
+    assert type(_by_col_numeric(vec, "age").min) is int
+    assert _by_col_categorical(vec, "name") == _by_col_categorical(py, "name")
+
+
+def test_numpy_engine_skips_parsing_numeric_batches(monkeypatch):
+    batches = [["1", "2", None], [3, 4, None], [5.5, 6], [7, 8]]
+    results = {}
+    for engine in AN.ENGINES:
+        opts = AN.AnalysisOptions(engine=engine, quantiles=(0.5,))
+        state = AN.ColumnState.create(opts)
+        for batch in batches:
+            state.update_numpy(batch) if engine == "numpy" else state.update(batch)
+        results[engine] = state.summarize("x", 9, 3, opts.quantiles)
+    assert results["numpy"] == results["python"]
+    assert (results["numpy"].dtype, results["numpy"].min) == ("float", 1.0)
+
+    coerced = []
+    monkeypatch.setattr(AN.dtypes, "coerce", lambda *a: coerced.append(1) or (a[0], 0, a[1]))
+    state = AN.ColumnState.create(AN.AnalysisOptions(engine="numpy"))
+    state.dtype = "int"
+    state.update_numpy([1, 2, None])
+    assert not coerced and state.count == 2
+
+
+def test_numpy_engine_keeps_python_semantics():
+    # a float NaN is a value, not a null; ints stay exact above 2**53 and past int64
+    for batch in ([1.5, float("nan"), None], [2**60 + 1, 2**60 + 2, None], [7, 2**64]):
+        summaries = []
+        for engine in AN.ENGINES:
+            state = AN.ColumnState.create(AN.AnalysisOptions(engine=engine))
+            state.update_numpy(batch) if engine == "numpy" else state.update(batch)
+            s = state.summarize("x", 3, 3, ())
+            summaries.append((s.count, s.nulls, s.distinct, s.min, s.max, type(s.max)))
+        assert summaries[0] == summaries[1]
+
+
+def test_numpy_engine_counts_large_batches_exactly():
+    batches = [[i % 997 for i in range(70_000)], [i % 1009 for i in range(70_000)]]
+    reports = {}
+    for engine in AN.ENGINES:
+        opts = AN.AnalysisOptions(engine=engine, quantiles=(0.5,), infer_types=False)
+        total = AN.analyze_partial([{"n": v} for v in batches[0]], opts)
+        total.merge(AN.analyze_partial([{"n": v} for v in batches[1]], opts))
+        total.merge(AN.analyze_partial([{"n": "x"}, {"n": 3.0}], opts))
+        reports[engine] = AN.finalize(total, top_k=5)
+    py, vec = reports["python"].categorical[0], reports["numpy"].categorical[0]
+    assert (vec.count, vec.distinct, vec.top) == (py.count, py.distinct, py.top)
+    assert vec.top[0] == (3, 142) and type(vec.top[0][0]) is int
+
+    rep = AN.analyze(
+        [{"n": float(i)} for i in range(100_000)], quantiles=[0.5, 0.99], engine="numpy"
+    )
+    p50, p99 = rep.numeric[0].quantiles.values()
+    assert abs(p50 - 50_000) < 2_000 and abs(p99 - 99_000) < 2_000
+
+
+def test_partials_merge_like_single_pass():
+    records = [{"n": i % 7, "c": "abc"[i % 3], "extra": None} for i in range(60)]
+    records[5]["n"] = None
+    whole = AN.analyze(records, top_k=2, quantiles=[0.5])
+
+    opts = AN.AnalysisOptions(quantiles=(0.5,))
+    part = AN.analyze_partial(records[:25], opts)
+    part.merge(AN.analyze_partial(records[25:], opts))
+    merged = AN.finalize(part, top_k=2)
+
+    assert merged.rows == whole.rows and merged.columns == whole.columns
+    a, b = _by_col_numeric(whole, "n"), _by_col_numeric(merged, "n")
+    assert (a.count, a.nulls, a.distinct, a.min, a.max, a.quantiles) == (
+        b.count,
+        b.nulls,
+        b.distinct,
+        b.min,
+        b.max,
+        b.quantiles,
+    )
+    assert abs(a.mean - b.mean) < 1e-9 and abs(a.std - b.std) < 1e-9
+    assert _by_col_categorical(whole, "c") == _by_col_categorical(merged, "c")
+
+
+def test_shard_that_turns_column_categorical():
+    shards = [[{"v": 1}, {"v": 2}], [{"v": "x"}, {"v": "x"}]]
+    rep = AN.analyze_many(shards, top_k=1, infer_types=False)
+
+    s = _by_col_categorical(rep, "v")
+    assert s is not None and s.count == 4 and s.top == [("x", 2)]
+
+    # with inferred types the first shard commits the dtype, as the first batch of a run does
+    ns = AN.analyze_many(shards).numeric[0]
+    assert (ns.dtype, ns.count, ns.invalid) == ("int", 2, 2)
+
+
+def test_process_pool_workers():
+    records = [{"n": i, "c": str(i % 4)} for i in range(400)]
+    serial = AN.analyze(records)
+    parallel = AN.analyze(records, workers=2)
+
+    assert _by_col_numeric(parallel, "n") == _by_col_numeric(serial, "n")
+    assert _by_col_categorical(parallel, "c") == _by_col_categorical(serial, "c")
+
+
+def test_correlation_pairwise_complete():
+    records = [{"a": i, "b": 2 * i + 1, "c": 10 - i, "d": "x"} for i in range(10)]
+    records[3]["c"] = None
+    records[0]["a"] = None
+
+    m = AN.correlation(records)
+    assert m.columns == ["a", "b", "c"]
+    i = {c: n for n, c in enumerate(m.columns)}
+    assert abs(m.values[i["a"]][i["b"]] - 1.0) < 1e-12
+    assert abs(m.values[i["a"]][i["c"]] + 1.0) < 1e-12
+    assert m.counts[i["a"]][i["c"]] == 8
+    assert m.values == [list(row) for row in zip(*m.values, strict=True)]  # symmetric
+
+
+def test_spearman_is_rank_based():
+    records = [{"x": float(i), "y": float(i**3)} for i in range(1, 8)]
+    records.append({"x": 8.0, "y": None})
+    pearson = AN.correlation(records).values[0][1]
+    spearman = AN.correlation(records, method="spearman").values[0][1]
+    assert pearson < 0.99 and abs(spearman - 1.0) < 1e-12
+    assert AN.correlation([{"k": 1}, {"k": 1}]).values == [[None]]  # constant column
+
+
+def test_string_numbers_get_numeric_stats():
+    rows = [{"n": "1"}, {"n": "3"}, {"n": None}, {"n": "oops"}] + [{"n": str(i)} for i in range(40)]
+    rep = AN.analyze(rows)
+    ns = next(s for s in rep.numeric if s.column == "n")
+    assert (ns.dtype, ns.count, ns.nulls, ns.invalid) == ("int", 42, 1, 1)
+    assert ns.max == 39
+
+    raw = AN.analyze(rows, infer_types=False)
+    assert [c.column for c in raw.categorical] == ["n"]
+
+
+def test_bool_columns_are_categorical():
+    rows = [{"ok": "true"}, {"ok": "false"}, {"ok": "TRUE"}, {"ok": None}]
+    for engine in AN.ENGINES:
+        rep = AN.analyze(rows, engine=engine)
+        assert rep.numeric == []
+        cs = _by_col_categorical(rep, "ok")
+        assert (cs.dtype, cs.count, cs.nulls, cs.distinct) == ("bool", 3, 1, 2)
+        assert cs.top == [(True, 2), (False, 1)]
+    assert AN.analyze([{"ok": True}, {"ok": False}]).numeric == []
+
+
+def test_typed_partials_merge_widen_to_float():
+    opts = AN.AnalysisOptions()
+    left = AN.analyze_partial([{"x": "1"}, {"x": "2"}], opts)
+    left.merge(AN.analyze_partial([{"x": "0.5"}], opts))
+    ns = AN.finalize(left).numeric[0]
+    assert (ns.dtype, ns.count, ns.min, ns.max) == ("float", 3, 0.5, 2)
+
+
+def test_timestamps_get_temporal_summary():
+    rows = [{"ts": f"2024-03-01T{h:02d}:00:00Z"} for h in (0, 0, 1, 4, 3)] + [{"ts": None}]
+    rep = AN.analyze(rows)
+    assert not rep.categorical and not rep.numeric
+    ts = rep.temporal[0]
+    assert (ts.count, ts.nulls, ts.span_seconds) == (5, 1, 4 * 3600)
+    assert (ts.max_gap_seconds, ts.out_of_order) == (3 * 3600, 1)
+    assert (ts.buckets, ts.empty_buckets, ts.rows_per_bucket_max) == (5, 1, 2)
+
+    # merging shards in order gives the same summary as one pass
+    opts = AN.AnalysisOptions()
+    part = AN.analyze_partial(rows[:3], opts)
+    part.merge(AN.analyze_partial(rows[3:], opts))
+    assert AN.finalize(part).temporal == rep.temporal
+
+
+def test_mixed_temporal_partials_merge_as_strings():
+    stamps = [{"x": "2024-03-01T00:00:00Z"}, {"x": "2024-03-01T01:00:00Z"}]
+    for mode in ("exact", "approx"):
+        opts = AN.AnalysisOptions(top_k_mode=mode)
+        for other in ([{"x": 1}, {"x": 3}], [{"x": "abc"}, {"x": "def"}, {"x": None}]):
+            for first, second in ((stamps, other), (other, stamps)):
+                part = AN.analyze_partial(first, opts)
+                part.merge(AN.analyze_partial(second, opts))
+                rep = AN.finalize(part, top_k=10)
+                assert not rep.numeric and not rep.temporal
+                cs = rep.categorical[0]
+                assert (cs.dtype, cs.count, cs.nulls) == ("string", 4, part.rows - 4)
+                assert (cs.distinct, cs.top) == (None, [])  # values were not counted
+                # a later shard does not bring the counters back
+                part.merge(AN.analyze_partial([{"x": "ghi"}], opts))
+                cs = AN.finalize(part).categorical[0]
+                assert (cs.count, cs.distinct) == (5, None)
+
+    state = AN.analyze_partial(stamps * 100, AN.AnalysisOptions()).states["x"]
+    assert state.freq is None and state.heavy is None  # no per-timestamp counter
+
+
+def test_numeric_columns_classify_a_probe(monkeypatch):
+    records = [{"x": str(i), "s": f"v{i}"} for i in range(5000)]
+    records[-1]["rare"] = "7"
+    sizes = []
+    classify = AN.dtypes.classify
+
+    def counting(values):
+        sizes.append(len(values))
+        return classify(values)
+
+    monkeypatch.setattr(AN.dtypes, "classify", counting)
+    assert AN.numeric_columns(records, infer_types=True) == ["x", "rare"]
+    # one probe-sized call per column, and a full one only for the column the probe missed
+    assert sorted(sizes) == [1000, 1000, 1000, 5000]
+
+
+def test_dtype_does_not_depend_on_sharding():
+    from concurrent.futures import ThreadPoolExecutor
+
+    records = [{"x": str(i)} for i in range(970)] + [{"x": "n/a"}] * 30
+    serial = AN.analyze(records)
+    ns = serial.numeric[0]
+    assert (ns.dtype, ns.count, ns.invalid) == ("int", 970, 30)
+
+    opts = AN.AnalysisOptions()
+    with ThreadPoolExecutor(4) as pool:
+        sharded = AN.analyze_partial(records, opts, workers=4, executor=pool)
+    assert AN.finalize(sharded) == serial
+    assert AN.analyze_many([records[:500], records[500:900], records[900:]]) == serial
@@ -0,0 +1,81 @@
+import importlib
+
+import pytest
+
+CKPT = importlib.import_module("mfda.checkpoint")
+VAL = importlib.import_module("mfda.validation")
+
+SCHEMA = {"id": {"unique": True}, "v": {"required": True, "max": 100}}
+
+
+def _write(path):
+    rows = ["id,v"] + [f"{i % 70},{'' if i % 13 == 0 else i}" for i in range(200)]
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+
+def _rows(path):
+    return [r for batch, _ in CKPT._batches(path, "csv", None, None, 1000) for r in batch]
+
+
+class Preempted(Exception):
+    pass
+
+
+def test_resume_continues_from_last_checkpoint(tmp_path, monkeypatch):
+    data = tmp_path / "t.csv"
+    _write(data)
+    state = tmp_path / "state"
+    expected = VAL.validate(_rows(data), SCHEMA)
+
+    # checkpoint after the first two batches only, then get preempted two batches later:
+    # the spill partitions already hold rows the checkpoint has not seen
+    batches = CKPT._batches
+    saves = CKPT.save_checkpoint
+    calls = []
+
+    def flaky_batches(*args):
+        for i, item in enumerate(batches(*args)):
+            if i == 4:
+                raise Preempted
+            yield item
+
+    def first_saves(*args):
+        calls.append(1)
+        if len(calls) <= 2:
+            saves(*args)
+
+    monkeypatch.setattr(CKPT, "_batches", flaky_batches)
+    monkeypatch.setattr(VAL, "_SPILL_BUFFER", 1)  # write spilled keys out at once
+    monkeypatch.setattr(CKPT, "save_checkpoint", first_saves)
+    opts = {"batch_rows": 20, "checkpoint_seconds": 0, "unique_max_keys": 5}
+    with pytest.raises(Preempted):
+        CKPT.validate_checkpointed(data, SCHEMA, state, fmt="csv", **opts)
+    monkeypatch.undo()
+
+    result = CKPT.validate_checkpointed(data, SCHEMA, state, fmt="csv", resume=True, **opts)
+    assert result.resumed and result.resumed_rows == 40
+    assert result.report == expected
+    assert not (state / CKPT.STATE_FILE).exists() and not (state / CKPT.SPILL_DIR).exists()
+
+
+def test_changed_schema_or_file_restarts(tmp_path, monkeypatch):
+    data = tmp_path / "t.csv"
+    _write(data)
+    state = tmp_path / "state"
+    batches = CKPT._batches
+
+    def one_batch(*args):
+        yield next(batches(*args))
+        raise Preempted
+
+    monkeypatch.setattr(CKPT, "_batches", one_batch)
+    with pytest.raises(Preempted):
+        CKPT.validate_checkpointed(data, SCHEMA, state, fmt="csv", checkpoint_seconds=0)
+    monkeypatch.undo()
+
+    other = {"id": {"unique": True}}
+    result = CKPT.validate_checkpointed(data, other, state, fmt="csv", resume=True)
+    assert not result.resumed and result.report == VAL.validate(_rows(data), other)
+
+    with pytest.raises(CKPT.ConfigurationError):
+        CKPT.validate_checkpointed(data, SCHEMA, state, fmt="json")
@@ -220,3 +220,104 @@ def test_analyze_prints_numeric_and_categorical(monkeypatch, tmp_path):
     assert code == 0
     assert "numeric:" in out and "categorical:" in out
     assert "count=" in out and "distinct=" in out  # loop bodies executed
+
+
+def test_analyze_quantiles_flag(tmp_path):
+    p = tmp_path / "lat.jsonl"
+    p.write_text("".join(f'{{"ms": {v}}}\n' for v in range(1, 11)), encoding="utf-8")
+
+    code, out = _call(["analyze", str(p), "--quantiles", "0.5,0.9"])
+    assert code == 0
+    assert "p50=5" in out and "p90=9" in out
+
+
+def test_analyze_merges_shard_files(tmp_path):
+    a = tmp_path / "part-0.jsonl"
+    b = tmp_path / "part-1.jsonl"
+    a.write_text('{"n": 1}\n{"n": 2}\n', encoding="utf-8")
+    b.write_text('{"n": 3}\n{"n": null}\n', encoding="utf-8")
+
+    code, out = _call(["analyze", str(a), str(b)])
+    assert code == 0
+    assert "rows:  4" in out
+    assert "count=3 nulls=1" in out and "max=3" in out
+
+
+def test_analyze_state_resumes(tmp_path):
+    log = tmp_path / "log.jsonl"
+    state = tmp_path / "log.state"
+    log.write_text('{"n": 1}\n', encoding="utf-8")
+
+    code, out = _call(["analyze", str(log), "--state", str(state)])
+    assert code == 0 and "full scan" in out
+
+    with open(log, "a", encoding="utf-8") as fp:
+        fp.write('{"n": 5}\n')
+    code, out = _call(["analyze", str(log), "--state", str(state)])
+    assert code == 0 and "resumed" in out and "new_rows=1" in out
+    assert "rows:  2" in out and "max=5" in out
+
+
+def test_analyze_by_group(tmp_path):
+    p = tmp_path / "sales.json"
+    p.write_text(
+        '[{"region":"eu","amt":1},{"region":"us","amt":5},{"region":"eu","amt":3}]',
+        encoding="utf-8",
+    )
+
+    code, out = _call(["analyze", str(p), "--by", "region", "--max-groups", "1"])
+    assert code == 0
+    assert "groups by region: 2" in out
+    assert "[region=eu] rows=2" in out and "mean=2.0" in out
+    assert "[region=us] rows=1" in out
+
+
+def test_analyze_prints_correlation(tmp_path):
+    p = tmp_path / "m.json"
+    p.write_text('[{"a":1,"b":2},{"a":2,"b":4},{"a":3,"b":7}]', encoding="utf-8")
+
+    code, out = _call(["analyze", str(p), "--corr", "pearson"])
+    assert code == 0
+    assert "correlation (pearson):" in out and "1.000" in out
+
+
+def test_analyze_sample_prints_intervals(tmp_path):
+    p = tmp_path / "s.jsonl"
+    p.write_text("".join(f'{{"n": {i}}}\n' for i in range(100)), encoding="utf-8")
+
+    code, out = _call(["analyze", str(p), "--sample", "20", "--seed", "7"])
+    assert code == 0
+    assert "rows:  20" in out and "sample: 20 of 100 rows (reservoir)" in out
+    assert "estimates (95% CI):" in out and "n mean=" in out and "n null_rate=0" in out
+
+
+def test_analyze_csv_numbers_are_numeric(tmp_path):
+    p = tmp_path / "t.csv"
+    p.write_text("id,age\n" + "".join(f"{i},{20 + i}\n" for i in range(30)) + "99,n/a\n")
+
+    code, out = _call(["analyze", str(p)])
+    assert code == 0
+    assert "age\t count=30 nulls=0" in out and "invalid=1 (not int)" in out
+
+    code, out = _call(["analyze", str(p), "--no-infer-types"])
+    assert code == 0 and "invalid=" not in out and "top=" in out
+
+
+def test_analyze_prints_temporal(tmp_path):
+    p = tmp_path / "ev.jsonl"
+    p.write_text('{"ts": "2024-03-01T10:00:00Z"}\n{"ts": "2024-03-01T12:30:00+02:00"}\n')
+
+    code, out = _call(["analyze", str(p)])
+    assert code == 0 and "temporal:" in out
+    assert "min=2024-03-01T10:00:00+00:00 max=2024-03-01T10:30:00+00:00" in out
+    assert "span=0:30:00" in out
+
+
+def test_analyze_time_buckets(tmp_path):
+    p = tmp_path / "ev.jsonl"
+    p.write_text('{"ts": "2024-03-01T10:05:00Z", "v": 1}\n{"ts": null, "v": 2}\n')
+
+    code, out = _call(["analyze", str(p), "--time-bucket", "1d", "--time-col", "ts"])
+    assert code == 0
+    assert "time buckets by ts (1 day, 0:00:00): 1 late_rows=0 untimed_rows=1" in out
+    assert "[2024-03-01T00:00:00+00:00] rows=1" in out
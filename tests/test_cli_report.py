@@ -243,3 +243,63 @@ def test_report_error_handlers(monkeypatch, tmp_path):
     code, out, err = _call_both(["report", "x.csv", "--out", str(tmp_path / "r2.md")])
     assert code == 1
     assert "Unexpected error:" in err
+
+
+def test_report_includes_quantiles(tmp_path):
+    p = tmp_path / "lat.json"
+    p.write_text("[" + ",".join(f'{{"ms": {v}}}' for v in range(1, 5)) + "]", encoding="utf-8")
+    rmd = tmp_path / "r.md"
+
+    code, _out = _call(["report", str(p), "--out", str(rmd), "--quantiles", "0.5"])
+    assert code == 0
+    assert "p50=2" in rmd.read_text("utf-8")
+
+
+def test_report_group_sections(tmp_path):
+    p = tmp_path / "sales.json"
+    p.write_text('[{"region":"eu","amt":1},{"region":"us","amt":5}]', encoding="utf-8")
+    rmd = tmp_path / "r.md"
+
+    code, _out = _call(["report", str(p), "--out", str(rmd), "--by", "region"])
+    assert code == 0
+    text = rmd.read_text("utf-8")
+    assert "## Groups by `region`" in text
+    assert "### region = us" in text and "#### Numeric columns" in text
+
+
+def test_report_correlation_heatmap(tmp_path):
+    p = tmp_path / "m.json"
+    p.write_text('[{"a":1,"b":2},{"a":2,"b":4},{"a":3,"b":5}]', encoding="utf-8")
+    rmd = tmp_path / "r.md"
+    png = tmp_path / "corr.png"
+
+    code, out = _call(["report", str(p), "--out", str(rmd), "--corr", "pearson"])
+    assert code == 2 and "--corr requires --corr-out" in out
+
+    code, _out = _call(
+        ["report", str(p), "--out", str(rmd), "--corr", "spearman", "--corr-out", str(png)]
+    )
+    assert code == 0 and png.exists()
+    text = rmd.read_text("utf-8")
+    assert "## Correlation (spearman)" in text and "| a | 1.000 | 1.000 |" in text
+
+
+def test_report_time_buckets(tmp_path):
+    p = tmp_path / "ev.jsonl"
+    p.write_text(
+        '{"ts": "2024-03-01T10:05:00Z", "v": 1}\n{"ts": "2024-03-01T10:50:00Z", "v": 3}\n'
+        '{"ts": "2024-03-01T12:00:00Z", "v": 8}\n',
+        encoding="utf-8",
+    )
+    rmd = tmp_path / "r.md"
+    png = tmp_path / "ts.png"
+
+    code, out = _call(["report", str(p), "--out", str(rmd), "--time-bucket", "1h"])
+    assert code == 2 and "--time-bucket requires --time-out" in out
+
+    argv = ["report", str(p), "--out", str(rmd), "--time-bucket", "1h", "--time-col", "ts"]
+    code, _out = _call([*argv, "--time-out", str(png)])
+    assert code == 0 and png.exists()
+    text = rmd.read_text("utf-8")
+    assert "## Time buckets by `ts` (1:00:00)" in text
+    assert "| 2024-03-01T10:00:00+00:00 | 2 | 2 |" in text
@@ -197,7 +197,7 @@ def test_validate_no_schema_provided(monkeypatch, tmp_path):
 def test_validate_known_error_from_reader(monkeypatch, tmp_path):
     from mfda.errors import FileFormatError
 
-    p = tmp_path / "file.csv"
+    p = tmp_path / "file.csv.gz"  # compressed files are read, not streamed
     p.write_text("id,name\n1,A\n", encoding="utf-8")
 
     class BoomReader:
@@ -244,3 +244,194 @@ def test_validate_unexpected_error_from_validation(monkeypatch, tmp_path):
     code, out, err = _call_both(["validate", str(p), "--schema", str(sfile)])
     assert code == 1
     assert "Unexpected error:" in err
+
+
+def test_validate_max_examples(tmp_path):
+    p = tmp_path / "t.csv"
+    p.write_text("id,name\n1,\n2,\n3,\n4,\n", encoding="utf-8")
+    sfile = tmp_path / "schema.json"
+    sfile.write_text(json.dumps({"name": {"required": True}}), encoding="utf-8")
+
+    code, out = _call(["validate", str(p), "--schema", str(sfile), "--max-examples", "2"])
+    assert code == 0
+    assert "code=missing_required column=name count=4 examples=[0, 1]" in out
+
+
+def test_validate_fail_fast_exit_code(tmp_path):
+    p = tmp_path / "t.jsonl"
+    p.write_text('{"id": 1}\n{"id": null}\n{"id": 3}\n', encoding="utf-8")
+    sfile = tmp_path / "schema.json"
+    sfile.write_text(json.dumps({"id": {"required": True}}), encoding="utf-8")
+
+    code, out = _call(["validate", str(p), "--schema", str(sfile), "--fail-fast"])
+    assert code == 3
+    assert "count=1 examples=[1]" in out and "rejected: stopped after" in out
+
+    code, out = _call(["validate", str(p), "--schema", str(sfile), "--max-issues", "2"])
+    assert code == 0 and "rejected" not in out
+
+
+def test_validate_bloom_unique_mode(tmp_path):
+    p = tmp_path / "t.csv"
+    p.write_text("id\n1\n2\n1\n3\n", encoding="utf-8")
+    sfile = tmp_path / "schema.json"
+    sfile.write_text(json.dumps({"id": {"unique": True}}), encoding="utf-8")
+
+    code, out = _call(["validate", str(p), "--schema", str(sfile), "--unique-mode", "bloom"])
+    assert code == 0 and "code=duplicate column=id count=1 examples=[2]" in out
+
+    argv = ["validate", str(p), "--schema", str(sfile), "--unique-mode", "bloom", "--fail-fast"]
+    code, _, err = _call_both(argv)
+    assert code == 2 and "two passes" in err
+
+
+def test_infer_schema_round_trips_through_validate(tmp_path):
+    p = tmp_path / "t.csv"
+    p.write_text("id,kind\n1,a\n2,b\n3,a\n4,b\n", encoding="utf-8")
+    sfile = tmp_path / "schema.json"
+
+    code, out = _call(["infer-schema", str(p), "-o", str(sfile), "--sample", "10"])
+    assert code == 0 and "Wrote schema for 2 columns" in out and "sample: 4 of 4 rows" in out
+    schema = json.loads(sfile.read_text(encoding="utf-8"))
+    assert schema["kind"]["allowed_values"] == ["a", "b"] and schema["id"]["unique"] is True
+
+    code, out = _call(["validate", str(p), "--schema", str(sfile)])
+    assert code == 0 and "code=" not in out
+
+
+def test_inferred_csv_ranges_are_checked(tmp_path):
+    p = tmp_path / "t.csv"
+    p.write_text("id,score\n1,0.5\n2,1.5\n3,2.5\n", encoding="utf-8")
+    sfile = tmp_path / "schema.json"
+    _call(["infer-schema", str(p), "-o", str(sfile)])
+    assert json.loads(sfile.read_text(encoding="utf-8"))["score"]["max"] == 2.5
+
+    with open(p, "a", encoding="utf-8") as fp:
+        fp.write("4,9.5\n0,-1\n")
+    code, out = _call(["validate", str(p), "--schema", str(sfile)])
+    assert code == 0
+    assert "code=out_of_range column=id count=1 examples=[4]" in out
+    assert "code=out_of_range column=score count=1 examples=[3]" in out
+    assert "code=out_of_range column=score count=1 examples=[4]" in out
+
+
+def test_validate_multi_file_dataset_with_workers(tmp_path):
+    a, b = tmp_path / "a.csv", tmp_path / "b.csv"
+    a.write_text("id\n1\n2\n", encoding="utf-8")
+    b.write_text("id\n3\n1\n2\n", encoding="utf-8")
+    sfile = tmp_path / "schema.json"
+    sfile.write_text(json.dumps({"id": {"unique": True}}), encoding="utf-8")
+
+    argv = ["validate", str(a), str(b), "--schema", str(sfile), "--workers", "2"]
+    code, out = _call(argv)
+    assert code == 0
+    assert "rows: 5" in out and "code=duplicate column=id count=2 examples=[3, 4]" in out
+
+    code, _, err = _call_both([*argv, "--fail-fast"])
+    assert code == 2 and "--workers" in err
+
+
+def test_validate_references_rule(tmp_path):
+    parent = tmp_path / "customers.csv"
+    parent.write_text("id,name\n1,Ana\n2,Bob\n", encoding="utf-8")
+    child = tmp_path / "orders.csv"
+    child.write_text("order,customer_id\n10,1\n11,5\n12,2\n", encoding="utf-8")
+    sfile = tmp_path / "schema.json"
+    schema = {"customer_id": {"references": {"file": str(parent), "column": "id"}}}
+    sfile.write_text(json.dumps(schema), encoding="utf-8")
+
+    argv = ["validate", str(child), "--schema", str(sfile), "--index-dir", str(tmp_path / "idx")]
+    code, out = _call(argv)
+    assert code == 0
+    assert "code=missing_reference column=customer_id count=1 examples=[1]" in out
+    assert len(list((tmp_path / "idx").iterdir())) == 1
+
+
+def test_validate_references_file_is_relative_to_the_schema(tmp_path, monkeypatch):
+    rules = tmp_path / "rules"
+    rules.mkdir()
+    (rules / "customers.csv").write_text("id\n1\n2\n", encoding="utf-8")
+    child = tmp_path / "orders.csv"
+    child.write_text("customer_id\n1\n5\n", encoding="utf-8")
+    sfile = rules / "schema.json"
+    schema = {"customer_id": {"references": {"file": "customers.csv", "column": "id"}}}
+    sfile.write_text(json.dumps(schema), encoding="utf-8")
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+
+    argv = ["validate", str(child), "--schema", str(sfile), "--index-dir", str(tmp_path / "idx")]
+    code, out = _call(argv)
+    assert code == 0
+    assert "code=missing_reference column=customer_id count=1 examples=[1]" in out
+
+
+def test_validate_outlier_rule_marks_lower_bounds(tmp_path):
+    p = tmp_path / "t.csv"
+    p.write_text("x\n" + "1\n" * 20 + "90\n95\n99\n", encoding="utf-8")
+    sfile = tmp_path / "schema.json"
+    schema = {"x": {"outlier": {"method": "iqr", "max_candidates": 1}}}
+    sfile.write_text(json.dumps(schema), encoding="utf-8")
+
+    code, out = _call(["validate", str(p), "--schema", str(sfile)])
+    assert code == 0 and "code=outlier column=x count=~1 examples=[22]" in out
+
+    # outliers are only known once the scan ends, but still count against the budget
+    code, out = _call(["validate", str(p), "--schema", str(sfile), "--fail-fast"])
+    assert code == 3 and "rejected: 1 violations (issue budget 1)" in out
+
+
+def test_validate_checkpointed_run_with_resume(tmp_path):
+    p = tmp_path / "t.csv"
+    p.write_text("id\n1\n2\n1\n", encoding="utf-8")
+    sfile = tmp_path / "schema.json"
+    sfile.write_text(json.dumps({"id": {"unique": True}}), encoding="utf-8")
+    state = tmp_path / "state"
+
+    argv = ["validate", str(p), "--schema", str(sfile), "--state-dir", str(state), "--resume"]
+    code, out = _call(argv)
+    assert code == 0 and "state: new run" in out
+    assert "code=duplicate column=id count=1 examples=[2]" in out
+    assert list(state.iterdir()) == []
+
+    code, _, err = _call_both(["validate", str(p), "--schema", str(sfile), "--resume"])
+    assert code == 2 and "--state-dir" in err
+
+
+def test_validate_dedup_without_schema(tmp_path):
+    p = tmp_path / "t.csv"
+    p.write_text("a,b\n1,x\n2,y\n1,x\n1,x\n", encoding="utf-8")
+
+    code, out = _call(["validate", str(p), "--dedup"])
+    assert code == 0
+    assert "code=duplicate_row column=None count=2 examples=[2, 3] groups=1" in out
+
+
+def test_validate_missing_keys_count_as_null_on_every_path(tmp_path):
+    p = tmp_path / "t.jsonl"
+    p.write_text('{"a": 1, "b": 2}\n{"a": 2}\n{"a": 3, "b": null}\n', encoding="utf-8")
+    sfile = tmp_path / "schema.json"
+    sfile.write_text(json.dumps({"b": {"nullable": False}}), encoding="utf-8")
+    base = ["validate", str(p), "--schema", str(sfile)]
+
+    counts = set()
+    for extra in ([], ["--dedup"], ["--max-issues", "5"], ["--state-dir", str(tmp_path / "s")]):
+        _, out = _call(base + extra)
+        counts.update(re.findall(r"code=null_value column=b count=(\d+)", out))
+    assert counts == {"2"}
+
+
+def test_validate_streams_plain_csv(monkeypatch, tmp_path):
+    p = tmp_path / "file.csv"
+    p.write_text("id,name\n1,A\n1,A\n", encoding="utf-8")
+
+    class NoRead:
+        @staticmethod
+        def read(path, **kwargs):
+            raise AssertionError("streamable input should not be read whole")
+
+    monkeypatch.setattr(CLI, "choose_reader", lambda _fmt: NoRead)
+
+    code, out = _call(["validate", str(p), "--dedup"])
+    assert code == 0
+    assert "duplicate_row" in out
@@ -218,3 +218,41 @@ def test_viz_xlsx_sheet_name(monkeypatch, tmp_path):
     code, out = _call(["viz", "wb.xlsx", "--sheet", "Data", "--bar", "A", "--out", str(out_file)])
     assert code == 0 and seen.get("sheet") == "Data"
     assert re.search(r"(?i)wrote bar chart", out)
+
+
+def test_viz_many_charts_to_directory(tmp_path):
+    out_dir = tmp_path / "charts"
+    argv = ["viz", "tests/fixtures/tiny_customers.csv", "--out-dir", str(out_dir)]
+    code, out = _call([*argv, "--hist", "age", "--bar", "name,age", "--workers", "2"])
+    assert code == 0 and "Wrote 3 charts" in out
+    assert sorted(p.name for p in out_dir.iterdir()) == [
+        "age_bar.png",
+        "age_hist.png",
+        "name_bar.png",
+    ]
+
+    code, out = _call([*argv, "--all", "--binning", "minmax", "--workers", "1"])
+    assert code == 0 and re.search(r"Wrote \d+ charts", out)
+
+    code, out = _call(
+        ["viz", "tests/fixtures/tiny_customers.csv", "--hist", "age,id", "--out", "x.png"]
+    )
+    assert code == 2 and "--out-dir" in out
+
+
+def test_viz_adaptive_histogram_streams_the_file(monkeypatch, tmp_path):
+    from mfda.errors import FileFormatError
+
+    class BoomReader:
+        @staticmethod
+        def read(path, **kwargs):
+            raise FileFormatError("the file should be streamed, not loaded")
+
+    monkeypatch.setattr(CLI, "choose_reader", lambda _fmt: BoomReader)
+    out_file = tmp_path / "age.png"
+    argv = ["viz", "tests/fixtures/tiny_customers.csv", "--hist", "age", "--out", str(out_file)]
+    code, _out = _call([*argv, "--binning", "adaptive"])
+    assert code == 0 and out_file.exists()
+
+    code, _out, err = _call_both(argv)  # minmax reads the file twice: loaded once instead
+    assert code == 2 and "should be streamed" in err
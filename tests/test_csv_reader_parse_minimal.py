@@ -37,3 +37,15 @@ def test_missing_values_normalized_to_NULL(tmp_path):
     assert len(records) == 1
     # second column should be the module's NULL sentinel
     assert records[0]["b"] is CSV.NULL
+
+
+def test_iter_batches_offsets_resume(tmp_path):
+    p = tmp_path / "b.csv"
+    p.write_text('a,b\n1,x\n2,"multi\nline"\n3,\n', encoding="utf-8")
+    batches = list(CSV.iter_batches(p, batch_rows=2))
+    assert [len(b) for b, _ in batches] == [2, 1]
+    assert batches[0][0][1] == {"a": "2", "b": "multi\nline"}
+
+    header, _ = CSV.read_header(p)
+    rest = list(CSV.iter_batches(p, offset=batches[0][1], header=header))
+    assert rest[0][0] == [{"a": "3", "b": CSV.NULL}]
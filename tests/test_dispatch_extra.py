@@ -1,4 +1,4 @@
-from mfda.dispatch import choose_reader, detect_format
+from mfda.dispatch import choose_reader, detect_format, stream_batches
 
 
 def test_detect_format_uppercase_extension():
@@ -15,3 +15,14 @@ def test_detect_format_unknown_returns_none():
 
 def test_choose_reader_empty_returns_none():
     assert choose_reader("") is None
+
+
+def test_stream_batches_only_for_streamable_files(tmp_path):
+    p = tmp_path / "t.csv"
+    p.write_text("a\n1\n2\n3\n", encoding="utf-8")
+    batches = stream_batches(p, "csv", batch_rows=2)
+    assert next(batches) == [{"a": "1"}, {"a": "2"}]
+    batches.close()
+
+    assert stream_batches(tmp_path / "t.csv.gz", "csv") is None
+    assert stream_batches(tmp_path / "t.xlsx", "xlsx") is None
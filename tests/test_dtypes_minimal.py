@@ -0,0 +1,41 @@
+import importlib
+
+DT = importlib.import_module("mfda.dtypes")
+
+
+def test_classify_commits_from_probe():
+    assert DT.classify(["1", "2", None, "-3"]) == "int"
+    assert DT.classify(["1.5", "2", "3e2"]) == "float"
+    assert DT.classify(["true", "False", True]) == "bool"
+    assert DT.classify(["2024-01-02", "2024-01-03T04:05:06Z"]) == "datetime"
+    assert DT.classify(["02134", "10001"]) == "string"  # leading zeros stay identifiers
+    assert DT.classify(["1_000", "2"]) == "string"
+    assert DT.classify([None, None]) is None
+
+
+def test_coerce_counts_failures_and_widens():
+    values, failures, dtype = DT.coerce(["1", "x", None, "4"], "int")
+    assert (values, failures, dtype) == ([1, None, None, 4], 1, "int")
+
+    values, failures, dtype = DT.coerce(["1", "2.5", "n/a"], "int")
+    assert (values, failures, dtype) == ([1, 2.5, None], 1, "float")
+
+
+def test_datetime_format_detected_once_and_normalized_to_utc():
+    assert DT.detect_datetime_format(["31/01/2024 10:00:00", "01/02/2024 11:30:00"]) == (
+        "%d/%m/%Y %H:%M:%S"
+    )
+    assert DT.detect_datetime_format(["12/31/2024", "01/15/2024"]) == "%m/%d/%Y"
+    assert DT.detect_datetime_format(["hello"]) is None
+
+    # a "Z"/"z" UTC suffix parses on every supported Python, not only 3.11+
+    parse = DT.datetime_parser("iso")
+    assert parse("2024-01-03T04:05:06Z") == parse("2024-01-03T04:05:06z")
+    assert parse("2024-01-03T04:05:06z").isoformat() == "2024-01-03T04:05:06+00:00"
+    assert DT.classify(["2024-01-03T04:05:06z", "2024-01-04T00:00:00Z"]) == "datetime"
+
+    values, failures, dtype = DT.coerce(
+        ["2024-03-01T12:00:00+02:00", "2024-03-01 10:00", "nope"], "datetime"
+    )
+    assert (failures, dtype) == (1, "datetime")
+    assert values[0] == values[1] and values[0].utcoffset().total_seconds() == 0
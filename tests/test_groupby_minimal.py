@@ -0,0 +1,49 @@
+import importlib
+
+GB = importlib.import_module("mfda.groupby")
+
+
+def _records():
+    regions = ["eu", "us", "apac", None]
+    return [
+        {"region": regions[i % 4], "ms": i, "tier": "gold" if i % 3 else "free"} for i in range(40)
+    ]
+
+
+def test_groups_summarized_in_one_pass():
+    rep = GB.analyze_by(_records(), "region", top_k=1)
+
+    assert rep.by == "region" and rep.spilled_partitions == 0
+    assert [g.key for g in rep.groups] == ["apac", "eu", "us", None]
+    eu = rep.groups[1].report
+    assert eu.rows == 10 and eu.columns == 2  # grouping column left out
+    ms = next(s for s in eu.numeric if s.column == "ms")
+    assert (ms.min, ms.max, ms.count) == (0, 36, 10)
+
+
+def test_spill_gives_same_groups(tmp_path):
+    in_memory = GB.analyze_by(_records(), "region", top_k=2)
+    spilled = GB.analyze_by(_records(), "region", top_k=2, max_groups=1, spill_dir=str(tmp_path))
+
+    assert spilled.spilled_partitions > 0
+    assert [(g.key, g.report) for g in spilled.groups] == [
+        (g.key, g.report) for g in in_memory.groups
+    ]
+    assert list(tmp_path.iterdir()) == []  # spill files cleaned up
+
+
+def test_memory_budget_spills_groups(tmp_path):
+    records = [{"region": i % 5, "id": f"u{i}"} for i in range(1_000)]
+    opts = {"top_k_mode": "approx", "top_k_capacity": 50, "batch_rows": 100}
+    in_memory = GB.analyze_by(records, "region", **opts)
+    spilled = GB.analyze_by(records, "region", max_bytes=1, spill_dir=str(tmp_path), **opts)
+
+    assert in_memory.spilled_partitions == 0 and spilled.spilled_partitions > 0
+
+    def counts(rep):  # approx top-k depends on how a group's rows were batched
+        return [
+            (g.key, g.report.rows, [(s.count, s.distinct) for s in g.report.categorical])
+            for g in rep.groups
+        ]
+
+    assert counts(spilled) == counts(in_memory)
@@ -0,0 +1,38 @@
+import importlib
+
+import numpy as np
+import pytest
+
+HIST = importlib.import_module("mfda.histogram")
+
+
+def _records():
+    values = [float(i % 97) for i in range(1000)] + [5000.0]
+    return [{"x": v} for v in values] + [{"x": "12.5"}, {"x": "n/a"}, {"x": None}, {}]
+
+
+def test_minmax_bins_match_numpy_and_skip_non_numeric():
+    records = [{"x": "n/a"}, *_records()]  # first value is not numeric
+    hist = HIST.compute_histogram(records, "x", bins=8, batch_rows=64)
+    values = [float(i % 97) for i in range(1000)] + [5000.0, 12.5]
+    counts, edges = np.histogram(values, bins=8)
+    assert hist.total == 1002 and hist.counts.tolist() == counts.tolist()
+    assert np.allclose(hist.edges, edges)
+
+    with pytest.raises(ValueError, match="adaptive"):
+        HIST.compute_histogram(iter(records), "x")
+    with pytest.raises(ValueError, match="No numeric data"):
+        HIST.compute_histogram([{"x": "a"}, {"x": None}], "x")
+
+
+def test_quantile_binning_clips_outliers_into_outer_bins():
+    hist = HIST.compute_histogram(_records(), "x", bins=10, binning="quantile")
+    assert hist.edges[-1] < 100 and hist.clipped >= 1
+    assert hist.counts.sum() == hist.total == 1002
+
+
+def test_adaptive_binning_is_one_pass_and_exact():
+    hist = HIST.compute_histogram(iter(_records()), "x", bins=10, binning="adaptive", batch_rows=50)
+    assert hist.total == 1002 and 5 <= len(hist.counts) <= 10
+    values = [float(i % 97) for i in range(1000)] + [5000.0, 12.5]
+    assert hist.counts.tolist() == np.histogram(values, bins=hist.edges)[0].tolist()
@@ -0,0 +1,75 @@
+import importlib
+
+INC = importlib.import_module("mfda.incremental")
+
+
+def _num(report, name):
+    return next(s for s in report.numeric if s.column == name)
+
+
+def test_jsonl_resumes_from_offset(tmp_path):
+    log = tmp_path / "events.jsonl"
+    state = tmp_path / "events.state"
+    log.write_text('{"ms": 1}\n{"ms": 2}\n', encoding="utf-8")
+
+    first = INC.analyze_incremental(log, state, fmt="jsonl")
+    assert not first.resumed and first.new_rows == 2
+
+    with open(log, "a", encoding="utf-8") as fp:
+        fp.write('{"ms": 3}\n{"ms": null}\n{"ms": 9')  # last line still being written
+    second = INC.analyze_incremental(log, state, fmt="jsonl")
+    assert second.resumed and second.start_offset == first.end_offset
+    assert second.new_rows == 2
+    s = _num(second.report, "ms")
+    assert (second.report.rows, s.count, s.nulls, s.max, s.mean) == (4, 3, 1, 3, 2.0)
+
+    with open(log, "a", encoding="utf-8") as fp:
+        fp.write("0}\n")
+    third = INC.analyze_incremental(log, state, fmt="jsonl")
+    assert third.new_rows == 1 and _num(third.report, "ms").max == 90
+
+
+def test_rewritten_prefix_triggers_full_rescan(tmp_path):
+    log = tmp_path / "events.jsonl"
+    state = tmp_path / "events.state"
+    log.write_text('{"ms": 1}\n{"ms": 2}\n', encoding="utf-8")
+    INC.analyze_incremental(log, state, fmt="jsonl")
+
+    log.write_text('{"ms": 5}\n{"ms": 6}\n{"ms": 7}\n', encoding="utf-8")
+    again = INC.analyze_incremental(log, state, fmt="jsonl")
+    assert not again.resumed
+    assert again.report.rows == 3 and _num(again.report, "ms").min == 5
+
+
+def test_csv_resume_keeps_header(tmp_path):
+    data = tmp_path / "t.csv"
+    state = tmp_path / "t.state"
+    data.write_text("id,name\n1,Ana\n", encoding="utf-8")
+    INC.analyze_incremental(data, state, fmt="csv")
+
+    with open(data, "a", encoding="utf-8") as fp:
+        fp.write("2,Bob\n3,\n")
+    res = INC.analyze_incremental(data, state, fmt="csv", top_k=1)
+    assert res.resumed and res.new_rows == 2
+    name = next(s for s in res.report.categorical if s.column == "name")
+    assert (res.report.rows, name.count, name.nulls) == (3, 2, 1)
+
+
+def test_workers_share_one_pool_across_batches(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    analysis = importlib.import_module("mfda.analysis")
+    pools = []
+
+    class CountingPool(ThreadPoolExecutor):
+        def __init__(self, max_workers):
+            pools.append(max_workers)
+            super().__init__(max_workers)
+
+    monkeypatch.setattr(analysis, "ProcessPoolExecutor", CountingPool)
+    log = tmp_path / "events.jsonl"
+    log.write_text("".join(f'{{"ms": {i}}}\n' for i in range(40)), encoding="utf-8")
+    res = INC.analyze_incremental(log, tmp_path / "a.state", fmt="jsonl", workers=2, batch_rows=5)
+    assert pools == [2]
+    one = INC.analyze_incremental(log, tmp_path / "b.state", fmt="jsonl", batch_rows=5)
+    assert res.report == one.report
@@ -43,3 +43,15 @@ def test_missing_keys_become_NULL():
 def test_limit_applies_to_rows_only():
     t = JSONR.read(Path("tests/fixtures/tiny_users.json"), limit=2)
     assert t.shape == (2, 2)
+
+
+def test_iter_batches_waits_for_complete_lines(tmp_path):
+    p = tmp_path / "e.jsonl"
+    p.write_text('{"a": 1}\n\n{"a": 2}\n{"a": 3', encoding="utf-8")
+    ((records, end),) = JSONR.iter_batches(p, wait_for_newline=True)
+    assert records == [{"a": 1}, {"a": 2}]
+    assert end == len('{"a": 1}\n\n{"a": 2}\n')
+
+    with open(p, "a", encoding="utf-8") as fp:
+        fp.write("}")  # writer finishes the line; no newline at EOF is fine without waiting
+    assert [r for b, _ in JSONR.iter_batches(p, offset=end) for r in b] == [{"a": 3}]
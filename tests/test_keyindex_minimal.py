@@ -0,0 +1,50 @@
+import importlib
+
+import pytest
+
+KI = importlib.import_module("mfda.keyindex")
+VAL = importlib.import_module("mfda.validation")
+
+
+def test_build_index_merges_sorted_runs(tmp_path):
+    records = [{"id": i % 37} for i in range(500)] + [{"id": None}, {}]
+    out = tmp_path / "ids.keys"
+    assert KI.build_index(records, "id", out, run_keys=10) == 37
+
+    index = KI.KeyIndex(out)
+    assert len(index) == 37
+    assert all(KI.text_digest(i) in index for i in range(37))
+    assert KI.text_digest("36") in index and KI.text_digest(37) not in index
+    index.close()
+    assert [p.name for p in tmp_path.iterdir()] == ["ids.keys"]
+
+
+def test_open_index_is_cached_by_fingerprint(tmp_path):
+    parent = tmp_path / "customers.csv"
+    parent.write_text("id,name\n1,Ana\n2,Bob\n", encoding="utf-8")
+    cache = tmp_path / "cache"
+
+    first = KI.open_index(parent, "id", index_dir=cache)
+    again = KI.open_index(parent, "id", index_dir=cache)
+    assert not first.reused and again.reused and again.path == first.path
+
+    parent.write_text("id,name\n1,Ana\n2,Bob\n3,Chi\n", encoding="utf-8")
+    changed = KI.open_index(parent, "id", index_dir=cache)
+    assert not changed.reused and len(changed) == 3
+
+
+def test_references_rule_streams_child_against_parent_index(tmp_path):
+    parent = tmp_path / "customers.jsonl"
+    parent.write_text('{"id": 1}\n{"id": 2}\n{"id": 3}\n', encoding="utf-8")
+    schema = {"customer_id": {"references": {"file": str(parent), "column": "id"}}}
+    orders = [{"customer_id": "1"}, {"customer_id": "9"}, {"customer_id": None}, {}]
+    orders += [{"customer_id": "9"}, {"customer_id": 3}]
+
+    rep = VAL.validate(orders, schema, index_dir=str(tmp_path / "cache"))
+    assert [(i.code, i.count, i.examples) for i in rep.issues] == [("missing_reference", 2, [1, 4])]
+    sharded = VAL.validate(orders, schema, workers=2, index_dir=str(tmp_path / "cache"))
+    assert sharded == rep
+
+    bad = {"customer_id": {"references": {"file": str(tmp_path / "nope.csv"), "column": "id"}}}
+    with pytest.raises(VAL.SchemaError, match="cannot index"):
+        VAL.compile_plan(bad, index_dir=str(tmp_path / "cache"))
@@ -0,0 +1,69 @@
+import importlib
+
+import pytest
+
+SMP = importlib.import_module("mfda.sampling")
+AN = importlib.import_module("mfda.analysis")
+
+
+def test_reservoir_is_uniform_and_counts_population():
+    sample, seen = SMP.reservoir_sample(range(10_000), 100, seed=1)
+    assert seen == 10_000 and len(sample) == 100 and len(set(sample)) == 100
+    assert 3_000 < sum(sample) / len(sample) < 7_000
+
+    small, seen = SMP.reservoir_sample(range(5), 100)
+    assert (sorted(small), seen) == ([0, 1, 2, 3, 4], 5)
+    assert SMP.reservoir_sample(range(1000), 10, seed=3) == SMP.reservoir_sample(
+        range(1000), 10, seed=3
+    )
+
+
+def test_sample_records_validates_size():
+    rows = [{"a": i} for i in range(100)]
+    smp = SMP.sample_records(rows, frac=0.5, seed=2)
+    assert smp.population_rows == 100 and smp.exact_population and 30 < len(smp.records) < 70
+    with pytest.raises(SMP.ConfigurationError):
+        SMP.sample_records(rows, n=0)
+    with pytest.raises(SMP.ConfigurationError):
+        SMP.sample_records(rows, n=5, frac=0.5)
+
+
+def test_seek_sample_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / "big.csv"
+    csv_path.write_text(
+        "id,tag\n" + "".join(f"{i},t{i % 3}\n" for i in range(2000)), encoding="utf-8"
+    )
+    smp = SMP.sample_path(csv_path, "csv", read_all=list, n=50, seed=4, min_seek_bytes=0)
+    assert smp.method == "seek" and not smp.exact_population
+    assert len(smp.records) == 50 and len({r["id"] for r in smp.records}) == 50
+    assert set(smp.records[0]) == {"id", "tag"}
+    assert 1500 < smp.population_rows < 2500
+
+    jl = tmp_path / "big.jsonl"
+    jl.write_text("".join(f'{{"n": {i}}}\n' for i in range(1000)), encoding="utf-8")
+    smp = SMP.sample_path(jl, "jsonl", read_all=list, frac=0.1, seed=5, min_seek_bytes=0)
+    assert 80 <= len(smp.records) <= 110
+    assert all(0 <= r["n"] < 1000 for r in smp.records)
+
+
+def test_small_file_is_streamed_with_exact_population(tmp_path):
+    jl = tmp_path / "s.jsonl"
+    jl.write_text("".join(f'{{"n": {i}}}\n' for i in range(30)), encoding="utf-8")
+    smp = SMP.sample_path(jl, "jsonl", read_all=list, n=10)
+    assert (smp.method, smp.population_rows, len(smp.records)) == ("reservoir", 30, 10)
+
+
+def test_estimate_intervals_cover_values():
+    rows = [{"x": float(i % 10), "c": "a" if i % 4 else None} for i in range(400)]
+    rep = AN.analyze(rows)
+    est = {(e.column, e.statistic): e for e in SMP.estimate_intervals(rep)}
+
+    mean = est[("x", "mean")]
+    assert mean.low < 4.5 < mean.high and mean.high - mean.low < 1
+    nulls = est[("c", "null_rate")]
+    assert nulls.value == 0.25 and nulls.low < 0.25 < nulls.high
+    assert est[("c", "share[a]")].value == 1.0
+
+    # sampling the whole population leaves no uncertainty in the mean
+    full = SMP.estimate_intervals(rep, population_rows=400)
+    assert next(e for e in full if e.statistic == "mean").low == pytest.approx(4.5)
@@ -0,0 +1,109 @@
+import importlib
+from collections import Counter
+
+SK = importlib.import_module("mfda.sketches")
+
+
+def test_top_k_exact_matches_full_sort():
+    freq = Counter(["b", "a", "a", "c", "b", "d"])
+    expected = sorted(freq.items(), key=lambda kv: (-kv[1], str(kv[0])))[:3]
+    assert SK.top_k_exact(freq, 3) == expected == [("a", 2), ("b", 2), ("c", 1)]
+
+
+def test_space_saving_error_bound():
+    # interleave a few heavy hitters with a long tail of one-off values
+    values = []
+    for i in range(3000):
+        values.append(f"cold{(i * 7919) % 5000}")
+        if i % 3 == 0:
+            values.append(f"hot{i % 5}")
+    truth = Counter(values)
+
+    ss = SK.SpaceSaving(capacity=50)
+    ss.update(values)
+    assert len(ss._counters) <= 50
+    top = ss.top(5)
+    assert {v for v, _, _ in top} == {f"hot{i}" for i in range(5)}
+    for v, count, error in top:
+        assert count - error <= truth[v] <= count
+        assert error <= len(values) / 50
+
+
+def test_approx_top_k_and_distinct():
+    values = ["x"] * 50 + ["y"] * 30 + [str(i) for i in range(500)]
+    top, bound, distinct = SK.approx_top_k(values, 2, capacity=64)
+    assert [v for v, _ in top] == ["x", "y"]
+    for (_, est), true in zip(top, (50, 30), strict=True):
+        assert true <= est <= true + bound
+    assert abs(distinct - 502) / 502 < 0.05
+
+
+def test_count_min_never_underestimates():
+    cms = SK.CountMinSketch(width=64, depth=3)
+    for i in range(1000):
+        cms.add(i % 100)
+    assert all(cms.estimate(i) >= 10 for i in range(100))
+
+
+def test_kll_exact_when_small_and_mergeable():
+    sk = SK.KLLSketch(k=50)
+    sk.update([30.0, 10.0, 20.0, 40.0])
+    assert sk.quantiles([0.0, 0.5, 1.0]) == [10.0, 20.0, 40.0]
+
+    values = [float(i) for i in range(10_000)]
+    a, b = SK.KLLSketch(k=100), SK.KLLSketch(k=100, seed=1)
+    a.update(values[::2])
+    b.update(values[1::2])
+    a.merge(b)
+    assert a.n == 10_000
+    p50, p99 = a.quantiles([0.5, 0.99])
+    assert abs(p50 - 5000) < 500
+    assert abs(p99 - 9900) < 500
+    assert SK.KLLSketch().quantiles([0.5]) == [None]
+
+
+def test_kll_sorted_batches_keep_rank_error():
+    sk = SK.KLLSketch(k=100)
+    sk.update_sorted([1.0, 2.0, 3.0])
+    assert sk.quantiles([0.5]) == [2.0]
+    for start in range(0, 100_000, 25_000):
+        sk.update_sorted([float(i) for i in range(start, start + 25_000)])
+    assert sk.n == 100_003
+    p50, p99 = sk.quantiles([0.5, 0.99])
+    assert abs(p50 - 50_000) < 2_000 and abs(p99 - 99_000) < 2_000
+
+
+def test_heavy_hitters_take_counted_batches():
+    hh = SK.HeavyHitters(capacity=8)
+    hh.update_counts([("a", 5), ("b", 2)])
+    hh.update(["b", "c"])
+    assert hh.top(2) == ([("a", 5), ("b", 3)], 0)
+    assert hh.distinct() == 3
+
+
+def test_heavy_hitters_allocate_sketches_on_first_eviction():
+    hh = SK.HeavyHitters(capacity=4)
+    hh.update(["a", "b", "a", "c"])
+    assert hh.cms is None and hh.approx_bytes() < 1_000
+    assert hh.top(2) == ([("a", 2), ("b", 1)], 0) and hh.distinct() == 3
+
+    hh.update(["d", "e", "a"])
+    assert hh.cms is not None and hh.cms.estimate("b") >= 1 and hh.cms.n == 7
+    other = SK.HeavyHitters(capacity=4)
+    other.update(["a", "f"])
+    hh.merge(other)
+    assert hh.top(1)[0] == [("a", 4)] and hh.cms.n == 9
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bf = SK.BloomFilter(1000, 0.01)
+    assert bf.m < 10 * 1000 and bf.k == 7
+    assert sum(bf.add(i) for i in range(1000)) < 30  # "maybe seen" on first insert is rare
+    assert all(i in bf for i in range(1000))
+    false_positives = sum(i in bf for i in range(1000, 11_000))
+    assert false_positives < 300
+
+    other = SK.BloomFilter(1000, 0.01)
+    other.add("x")
+    bf.merge(other)
+    assert "x" in bf and 5 in bf
@@ -0,0 +1,40 @@
+import importlib
+
+import pytest
+
+TB = importlib.import_module("mfda.timebucket")
+
+
+def _rows(hours):
+    return [{"ts": f"2024-03-01T{h:02d}:15:00Z", "v": h} for h in hours]
+
+
+def test_parse_bucket():
+    assert TB.parse_bucket("15m") == 900
+    assert TB.parse_bucket("1H") == 3600
+    assert TB.parse_bucket("2d") == 172_800
+    with pytest.raises(ValueError):
+        TB.parse_bucket("1y")
+
+
+def test_rows_are_summarized_per_bucket():
+    rows = _rows([0, 0, 1, 3]) + [{"ts": None, "v": 9}]
+    rep = TB.analyze_time_buckets(rows, "ts", 3600, quantiles=[0.5])
+    assert [b.start.hour for b in rep.buckets] == [0, 1, 3]
+    assert [b.report.rows for b in rep.buckets] == [2, 1, 1]
+    first = rep.buckets[0].report
+    assert [s.column for s in first.numeric] == ["v"]  # timestamp column left out
+    assert first.numeric[0].quantiles == {0.5: 0}
+    assert (rep.late_rows, rep.untimed_rows) == (0, 1)
+
+
+def test_out_of_order_within_budget_and_late_rows():
+    rows = _rows([2, 1, 2, 0, 5, 6, 1])
+    rep = TB.analyze_time_buckets(rows, "ts", 3600, max_open_buckets=8, batch_rows=2)
+    assert [b.report.rows for b in rep.buckets] == [1, 2, 2, 1, 1]
+    assert rep.late_rows == 0
+
+    # with two open buckets, hour 0 is closed by the time the last hour-1 row arrives
+    tight = TB.analyze_time_buckets(rows, "ts", 3600, max_open_buckets=2, batch_rows=1)
+    assert tight.late_rows == 1
+    assert sum(b.report.rows for b in tight.buckets) == len(rows) - 1
@@ -1,5 +1,7 @@
 import importlib
 
+import pytest
+
 VAL = importlib.import_module("mfda.validation")
 
 
@@ -62,3 +64,242 @@ def test_integration_with_csv_reader(tmp_path):
     # row 2 has missing name, no duplicate ids here
     assert _count_issues(rep, "missing_required", "name") == 1
     assert _count_issues(rep, "duplicate", "id") == 0
+
+
+def test_plan_is_one_pass_and_batch_independent():
+    records = [
+        {"id": 1, "age": 5},
+        {"id": 1, "age": 200},
+        {"age": -1},
+        {"id": 2, "age": 300, "x": 0},
+        {"id": 2},
+    ]
+    schema = {
+        "id": {"required": True, "unique": True},
+        "age": {"required": True, "min": 0, "max": 120},
+    }
+    plan = VAL.compile_plan(schema)
+    assert [type(r).__name__ for r in plan.rules] == [
+        "RequiredRule",
+        "UniqueRule",
+        "RequiredRule",
+        "RangeRule",
+    ]
+
+    rep = VAL.validate(records, schema, batch_rows=2)
+    assert (rep.row_count, rep.column_count) == (5, 3)
+    assert [(i.code, i.column, i.count, i.examples) for i in rep.issues] == [
+        ("missing_required", "id", 1, [2]),
+        ("duplicate", "id", 2, [1, 4]),
+        ("missing_required", "age", 1, [4]),
+        ("out_of_range", "age", 1, [2]),
+        ("out_of_range", "age", 2, [1, 3]),
+    ]
+    assert VAL.validate(iter(records), schema) == rep
+
+
+def test_issue_collectors_are_bounded():
+    records = [{"v": None} for _ in range(1000)]
+    rep = VAL.validate(records, {"v": {"required": True}}, max_examples=3)
+    assert (rep.issues[0].count, rep.issues[0].examples) == (1000, [0, 1, 2])
+
+    sampled = VAL.IssueCollector(4, "reservoir", seed=1)
+    sampled.extend(range(10_000))
+    issue = sampled.issue("x", None)
+    assert issue.count == 10_000 and len(issue.examples) == 4
+    assert issue.examples != [0, 1, 2, 3] and issue.examples == sorted(issue.examples)
+
+
+def test_max_issues_stops_reading_early():
+    consumed = []
+
+    def rows():
+        for i in range(10_000):
+            consumed.append(i)
+            yield {"v": None if i % 10 == 0 else i}
+
+    rep = VAL.validate(rows(), {"v": {"required": True}}, max_issues=3, batch_rows=10)
+    assert rep.stopped_early and rep.row_count == 30 and len(consumed) == 30
+    assert rep.issues[0].count == 3
+
+    full = VAL.validate([{"v": 1}], {"v": {"required": True}}, max_issues=1)
+    assert not full.stopped_early
+
+
+def test_composite_unique_spills_to_disk_with_exact_counts(tmp_path):
+    records = [{"order": i % 40, "line": i % 7, "sku": "x"} for i in range(600)]
+    records += [{"order": None, "line": 1}, {"order": 1, "line": 1}]
+    schema = {"order": {"unique": ["order", "line"]}}
+
+    in_memory = VAL.validate(records, schema)
+    (issue,) = in_memory.issues
+    assert (issue.column, issue.count) == ("order,line", 600 - 280 + 1)
+    assert issue.examples == [280, 281, 282, 283, 284]
+
+    spilled = VAL.validate(records, schema, unique_max_keys=4, spill_dir=str(tmp_path))
+    assert spilled.issues == in_memory.issues
+    assert list(tmp_path.iterdir()) == []
+
+    with pytest.raises(VAL.SchemaError, match="unique"):
+        VAL.compile_plan({"id": {"unique": []}})
+
+
+def test_bloom_unique_mode_matches_exact():
+    records = [{"id": i % 900, "part": i % 2} for i in range(1000)]
+    schema = {"id": {"unique": True}, "part": {"unique": ["id", "part"]}}
+    exact = VAL.validate(records, schema)
+    bloom = VAL.validate(records, schema, unique_mode="bloom", batch_rows=64)
+    assert bloom == exact
+    assert [i.count for i in bloom.issues] == [100, 100]
+
+    plan = VAL.compile_plan(schema, unique_mode="bloom", unique_expected_keys=1000)
+    plan.update([{"id": i} for i in range(500)])
+    assert len(plan.rules[0].candidates) < 50 and plan.report().issues == []
+
+    with pytest.raises(ValueError, match="twice"):
+        VAL.validate(iter(records), schema, unique_mode="bloom")
+
+
+def test_type_allowed_values_regex_and_nullable_rules():
+    records = [
+        {"id": "1", "tier": "free", "zip": "12345", "flag": True},
+        {"id": "042", "tier": "gold", "zip": "1234", "flag": 1},
+        {"id": 3.0, "tier": None, "zip": None, "flag": "false"},
+        {"id": None, "tier": ["pro"], "flag": "yes"},
+    ]
+    schema = {
+        "id": {"type": "integer"},
+        "tier": {"allowed_values": ["free", "pro"]},
+        "zip": {"nullable": False, "regex": "[0-9]{5}"},
+        "flag": {"type": "boolean"},
+    }
+    rep = VAL.validate(records, schema)
+    assert [(i.code, i.column, i.examples) for i in rep.issues] == [
+        ("type_mismatch", "id", [1]),
+        ("not_allowed", "tier", [1, 3]),
+        ("null_value", "zip", [2, 3]),
+        ("pattern_mismatch", "zip", [1]),
+        ("type_mismatch", "flag", [1, 3]),
+    ]
+
+    codes = VAL.validate([{"n": "7"}, {"n": 7}], {"n": {"allowed_values": [7]}}).issues
+    assert codes == []
+    dates = [{"t": "03/04/2024"}, {"t": "31/12/2024"}, {"t": "2024-13-01"}, {"t": None}]
+    (issue,) = VAL.validate(dates, {"t": {"type": "datetime"}}).issues
+    assert issue.examples == [2]
+
+
+def test_malformed_value_rules_raise_schema_error():
+    for spec in ({"type": "decimal"}, {"regex": "("}, {"allowed_values": "abc"}):
+        with pytest.raises(VAL.SchemaError):
+            VAL.compile_plan({"c": spec})
+
+
+def test_infer_schema_profiles_types_keys_ranges_and_enums():
+    records = [
+        {
+            "id": i,
+            "tier": "free" if i % 3 else "pro",
+            "score": i / 2,
+            "seen": f"2024-01-{1 + i % 28:02d}",
+            "note": None if i % 4 == 0 else "ok",
+        }
+        for i in range(200)
+    ]
+    records[5]["extra"] = "x"
+    schema = VAL.infer_schema(records, sample=None)
+    assert schema["id"] == {
+        "required": True,
+        "type": "integer",
+        "unique": True,
+        "min": 0,
+        "max": 199,
+    }
+    assert schema["tier"] == {"required": True, "type": "string", "allowed_values": ["free", "pro"]}
+    assert schema["score"]["type"] == "number" and "unique" not in schema["score"]
+    assert schema["seen"] == {"required": True, "type": "datetime"}
+    assert schema["note"] == {"type": "string", "allowed_values": ["ok"]}
+    assert schema["extra"] == {"type": "string"}
+    assert VAL.validate(records, schema).issues == []
+
+    sampled = VAL.infer_schema(iter(records), sample=50, seed=3)
+    assert sampled["id"]["type"] == "integer" and 0 <= sampled["id"]["min"] <= sampled["id"]["max"]
+
+
+def test_outlier_rules_zscore_and_iqr():
+    records = [{"x": 10 + i % 5, "s": str(10 + i % 5)} for i in range(200)]
+    records[37] = {"x": 500, "s": "-400"}
+    records[150] = {"x": "n/a", "s": None}
+    schema = {"x": {"outlier": "zscore"}, "s": {"outlier": {"method": "iqr", "threshold": 3}}}
+    rep = VAL.validate(records, schema, batch_rows=16)
+    assert [(i.code, i.column, i.count, i.examples, i.exact) for i in rep.issues] == [
+        ("outlier", "x", 1, [37], True),
+        ("outlier", "s", 1, [37], True),
+    ]
+    assert VAL.validate_many([records[:100], records[100:]], schema, batch_rows=16) == rep
+
+    two_pass = {"x": {"outlier": {"method": "zscore", "mode": "two-pass"}}}
+    assert VAL.validate(records, two_pass).issues == rep.issues[:1]
+    with pytest.raises(ValueError, match="twice"):
+        VAL.validate(iter(records), two_pass)
+
+    # more outliers than candidates: the count is a lower bound
+    many = [{"x": 0.0}] * 100 + [{"x": 1000.0 + i} for i in range(5)]
+    bounded = VAL.validate(many, {"x": {"outlier": {"method": "iqr", "max_candidates": 2}}})
+    assert bounded.issues[0].count == 2 and not bounded.issues[0].exact
+
+    for spec in ("mad", {"method": "iqr", "threshold": 0}, {"mode": "three-pass"}, 3):
+        with pytest.raises(VAL.SchemaError):
+            VAL.compile_plan({"x": {"outlier": spec}})
+
+
+def test_unique_rows_reports_duplicate_groups_in_memory_spilled_and_sharded(tmp_path):
+    records = [{"a": i % 30, "b": "x" if i % 60 < 30 else "y"} for i in range(200)]
+    records[5] = {"b": "y", "a": 5, "c": None}  # same row as 35, columns reordered
+    schema = {"unique_rows": True}
+
+    rep = VAL.validate(records, schema)
+    (issue,) = rep.issues
+    assert (issue.code, issue.column, issue.count, issue.groups) == ("duplicate_row", None, 140, 60)
+    assert issue.examples == [35, 60, 61, 62, 63]
+
+    spilled = VAL.validate(records, schema, unique_max_keys=3, spill_dir=str(tmp_path))
+    assert spilled == rep and list(tmp_path.iterdir()) == []
+    shards = [records[:45], records[45:130], records[130:]]
+    assert VAL.validate_many(shards, schema) == rep
+    assert VAL.validate_many(shards, schema, unique_max_keys=7) == rep
+    assert VAL.validate(records, {"unique_rows": False}).issues == []
+
+    by_key = VAL.validate(records, {"a": {"unique": True}}, unique_max_keys=4)
+    assert (by_key.issues[0].count, by_key.issues[0].groups) == (170, 30)
+    assert VAL.validate(records, {"a": {"unique": True}}, unique_mode="bloom") == by_key
+
+
+def _dup_records():
+    return [{"id": i % 150, "v": None if i % 11 == 0 else i % 130} for i in range(400)]
+
+
+def test_sharded_validation_matches_single_pass(tmp_path):
+    records = _dup_records()
+    schema = {"id": {"unique": True}, "v": {"required": True, "min": 0, "max": 100}}
+    single = VAL.validate(records, schema)
+
+    shards = [records[:90], records[90:91], records[91:300], records[300:]]
+    assert VAL.validate_many(shards, schema) == single
+    spilled = VAL.validate_many(shards, schema, unique_max_keys=8, spill_dir=str(tmp_path))
+    assert spilled == single and list(tmp_path.iterdir()) == []
+    assert VAL.validate(records, schema, workers=2, unique_max_keys=8) == single
+
+    reservoir = VAL.validate_many(shards, schema, example_mode="reservoir")
+    assert [i.count for i in reservoir.issues] == [i.count for i in single.issues]
+    assert all(max(i.examples) < len(records) for i in reservoir.issues)
+
+
+def test_sharded_validation_reads_callable_shards():
+    records = _dup_records()
+    schema = {"id": {"unique": True}}
+    rep = VAL.validate_many([lambda: iter(records[:200]), lambda: iter(records[200:])], schema)
+    assert rep == VAL.validate(records, schema)
+
+    with pytest.raises(ValueError, match="workers"):
+        VAL.validate(records, schema, workers=2, max_issues=1)
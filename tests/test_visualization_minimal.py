@@ -23,3 +23,66 @@ def test_save_bar_counts_creates_file(tmp_path):
     VIZ.save_bar_counts(records, column="color", out_path=out, top_k=3)
     assert out.exists()
     assert os.stat(out).st_size > 0
+
+
+def test_save_bar_counts_streams_one_shot_records(tmp_path):
+    rows = ({"color": None if i % 3 else f"c{i % 4}"} for i in range(3000))
+    out = tmp_path / "approx.png"
+    VIZ.save_bar_counts(rows, column="color", out_path=out, mode="approx", capacity=8)
+    assert out.exists()
+
+    with pytest.raises(ValueError, match="No categorical data"):
+        VIZ.save_bar_counts(iter([{"color": None}]), column="color", out_path=out)
+
+
+def test_save_heatmap_creates_file(tmp_path):
+    from mfda.analysis import correlation
+
+    records = [{"a": 1, "b": 2.0}, {"a": 2, "b": 3.5}, {"a": 3, "b": 3.0}]
+    out = tmp_path / "corr.png"
+    VIZ.save_heatmap(correlation(records), out_path=out)
+    assert out.exists()
+    assert os.stat(out).st_size > 0
+
+
+def test_save_time_series_creates_file(tmp_path):
+    from mfda.timebucket import analyze_time_buckets
+
+    records = [{"ts": f"2024-03-01T0{h}:00:00Z", "v": h} for h in (0, 1, 1, 3)]
+    out = tmp_path / "ts.png"
+    VIZ.save_time_series(analyze_time_buckets(records, "ts", 3600), out_path=out)
+    assert out.exists()
+    assert os.stat(out).st_size > 0
+
+
+def test_save_histogram_streams_bins_past_leading_non_numeric(tmp_path):
+    records = [{"age": "unknown"}] + [{"age": i % 90} for i in range(5000)]
+    out = tmp_path / "age_hist.png"
+    VIZ.save_histogram(iter(records), column="age", out_path=out, binning="adaptive")
+    assert out.exists()
+    assert os.stat(out).st_size > 0
+
+
+def test_chart_data_aggregates_all_charts_in_one_scan(tmp_path):
+    records = [
+        {"age": i % 50, "color": "red" if i % 3 else "blue", "note": None} for i in range(300)
+    ]
+    scanned = []
+
+    def once():
+        for r in records:
+            scanned.append(1)
+            yield r
+
+    charts, empty = VIZ.chart_data(once(), None, bins=6, top_k=2, batch_rows=64)
+    assert len(scanned) == len(records)
+    assert [type(c).__name__ for c in charts] == ["Histogram", "TopCounts"]
+    assert charts[0].total == 300 and charts[1].top == [("red", 200), ("blue", 100)]
+    assert empty == [("bar", "note")]
+
+    exact, _ = VIZ.chart_data(records, [("hist", "age")], bins=5, binning="minmax")
+    assert exact[0].counts.tolist() == VIZ.compute_histogram(records, "age", bins=5).counts.tolist()
+
+    paths = VIZ.render_charts(charts, tmp_path / "charts", workers=2)
+    assert [p.name for p in paths] == ["age_hist.png", "color_bar.png"]
+    assert all(os.stat(p).st_size > 0 for p in paths)